@@ -222,8 +222,12 @@ def equal(a, b, tol=None, rtol=None, atol=None):
     if np.shape(a) != np.shape(b):
         return False
 
+    if np.array_equal(a, b):
+        # Unchanged arrays are the common case and much cheaper to check
+        return True
+
     if rtol is None and atol is None:
-        return np.array_equal(a, b)
+        return False
 
     if rtol is None:
         rtol = 0
@@ -792,14 +796,61 @@ class Calculator(GetPropertiesMixin):
         if not os.path.isdir(self._directory):
             os.makedirs(self._directory)
 
+    def calculate_batch(self, images, properties=['energy']):
+        """Calculate properties of several configurations.
+
+        Returns a list with a dictionary of the requested properties for
+        each of the images.  This implementation calculates one image
+        after the other; calculators that can evaluate many configurations
+        at once override it."""
+        results = []
+        for atoms in images:
+            values = {}
+            for name in properties:
+                if name == 'energy':
+                    # some calculators override get_potential_energy()
+                    values[name] = self.get_potential_energy(atoms)
+                else:
+                    values[name] = self.get_property(name, atoms)
+            results.append(values)
+        return results
+
     def calculate_numerical_forces(self, atoms, d=0.001):
         """Calculate numerical forces using finite difference.
 
-        All atoms will be displaced by +d and -d in all directions."""
-
-        from ase.calculators.test import numeric_force
-        return np.array([[numeric_force(atoms, a, i, d)
-                          for i in range(3)] for a in range(len(atoms))])
+        All atoms will be displaced by +d and -d in all directions.
+        The energies come from atoms.calc, one configuration at a time.
+        Calculators that override :meth:`calculate_batch` instead
+        evaluate the displaced configurations with their own
+        :meth:`calculate_batch`, a few atoms at a time, reusing the
+        neighbor lists of *atoms* for the displaced configurations."""
+
+        if type(self).calculate_batch is Calculator.calculate_batch:
+            from ase.calculators.test import numeric_force
+            return np.array([[numeric_force(atoms, a, i, d)
+                              for i in range(3)] for a in range(len(atoms))])
+
+        from ase.neighborlist import share_neighbor_lists
+        natoms = len(atoms)
+        # limit the number of atoms in each batch to about 100000:
+        block = max(1, 100000 // (6 * natoms))
+        energies = []
+        for start in range(0, natoms, block):
+            images = []
+            for a in range(start, min(start + block, natoms)):
+                for i in range(3):
+                    for step in [d, -d]:
+                        image = atoms.copy()
+                        p = image.get_positions()
+                        p[a, i] += step
+                        image.set_positions(p, apply_constraint=False)
+                        # reuse the neighbor lists of the reference:
+                        share_neighbor_lists(atoms, image)
+                        images.append(image)
+            energies += [results['energy'] for results in
+                         self.calculate_batch(images, ['energy'])]
+        energies = np.array(energies)
+        return (energies[1::2] - energies[::2]).reshape((-1, 3)) / (2 * d)
 
     def calculate_numerical_stress(self, atoms, d=1e-6, voigt=True):
         """Calculate numerical stress using finite difference."""
@@ -880,6 +931,68 @@ class Calculator(GetPropertiesMixin):
         return Properties(self.results)
 
 
+def calculate_pairs_batch(calc, images, properties, get_pairs):
+    """Evaluate a pair-array calculator on several configurations at once.
+
+    The full neighbor lists ``i, j, D, d = get_pairs(atoms)`` of all the
+    images are joined into one system, with the atom indices of each
+    image shifted past those of the previous images, and evaluated by a
+    single call to ``calc.calculate_pairs(numbers, i, j, D, d)``.  This
+    must return per-atom energies, forces and virials (per-atom stress
+    times volume as 3x3 matrices, or None if the stress is not
+    implemented).
+
+    Returns a list of dictionaries of the requested properties like
+    :meth:`Calculator.calculate_batch`.  The calculator is reset, since
+    it does not hold the results of any single configuration."""
+    for name in properties:
+        if name not in calc.implemented_properties:
+            raise PropertyNotImplementedError('{} property not implemented'
+                                              .format(name))
+
+    if len(images) == 0:
+        return []
+
+    numbers = []
+    pairs = []
+    offset = 0
+    for atoms in images:
+        i, j, D, d = get_pairs(atoms)
+        pairs.append((i + offset, j + offset, D, d))
+        numbers.append(atoms.numbers)
+        offset += len(atoms)
+
+    i, j, D, d = [np.concatenate(arrays) for arrays in zip(*pairs)]
+    energies, forces, virials = calc.calculate_pairs(np.concatenate(numbers),
+                                                     i, j, D, d)
+    calc.reset()
+
+    results = []
+    start = 0
+    for atoms in images:
+        end = start + len(atoms)
+        energy = energies[start:end].sum()
+        allresults = {'energy': energy,
+                      'free_energy': energy,
+                      'energies': energies[start:end],
+                      'forces': forces[start:end]}
+        if virials is not None and atoms.number_of_lattice_vectors == 3:
+            voigt = [0, 4, 8, 5, 2, 1]
+            stresses = (virials[start:end].reshape(-1, 9)[:, voigt]
+                        / atoms.get_volume())
+            allresults['stresses'] = stresses
+            allresults['stress'] = stresses.sum(axis=0)
+
+        for name in properties:
+            if name not in allresults:
+                raise PropertyNotImplementedError('{} not present in this '
+                                                  'calculation'.format(name))
+        results.append({name: allresults[name] for name in properties})
+        start = end
+
+    return results
+
+
 class FileIOCalculator(Calculator):
     """Base class for calculators that write/read input/output files."""
 
@@ -10,8 +10,10 @@
 import os
 import numpy as np
 
-from ase.neighborlist import NeighborList
-from ase.calculators.calculator import Calculator, all_changes
+from ase.neighborlist import NeighborList, get_shared_neighbor_list
+from ase.calculators.calculator import (Calculator, all_changes,
+                                        calculate_pairs_batch)
+from ase.data import atomic_numbers, chemical_symbols
 from scipy.interpolate import InterpolatedUnivariateSpline as spline
 from ase.units import Bohr, Hartree
 
@@ -152,6 +154,15 @@ Keyword                    Description
                            ``fs``. This will be determined from the file suffix
                            or must be set if using equations or file object
 
+``vectorized``             evaluate all neighbor pairs at once as flat arrays,
+                           grouped by element pair, instead of looping over
+                           atoms and elements. Defaults to False.
+
+``tabulate``               number of points of uniform lookup tables replacing
+                           the spline functions when ``vectorized`` is True.
+                           The tables are evaluated with linear interpolation.
+                           Defaults to None (use the splines directly).
+
 =========================  ====================================================
 
 
@@ -196,9 +207,10 @@ Special features
 Notes/Issues
 =============
 
-* Although currently not fast, this calculator can be good for trying
+* Although not fast by default, this calculator can be good for trying
   small calculations or for creating new potentials by matching baseline
-  data such as from DFT results. The format for these potentials is
+  data such as from DFT results.  Use ``vectorized=True`` (and optionally
+  ``tabulate``) for larger systems. The format for these potentials is
   compatible with LAMMPS_ and so can be used either directly by LAMMPS or
   with the ASE LAMMPS calculator interface.
 
@@ -232,6 +244,8 @@ End EAM Interface Documentation
     default_parameters = dict(
         skin=1.0,
         potential=None,
+        vectorized=False,
+        tabulate=None,
         header=[b'EAM/ADP potential file\n',
                 b'Generated from eam.py\n',
                 b'blank\n'])
@@ -254,7 +268,8 @@ End EAM Interface Documentation
                       # derivatives
                       'd_embedded_energy', 'd_electron_density', 'd_phi',
                       'd', 'q', 'd_d', 'd_q',  # adp terms
-                      'skin', 'Z', 'nr', 'nrho', 'mass')
+                      'skin', 'Z', 'nr', 'nrho', 'mass',
+                      'vectorized', 'tabulate')
 
         # set any additional keyword arguments
         for arg, val in self.parameters.items():
@@ -617,7 +632,7 @@ End EAM Interface Documentation
 
         f.close()
 
-    def update(self, atoms):
+    def check_elements(self, atoms):
         # check all the elements are available in the potential
         self.Nelements = len(self.elements)
         elements = np.unique(atoms.get_chemical_symbols())
@@ -628,6 +643,9 @@ End EAM Interface Documentation
             raise RuntimeError('These elements are not in the potential: %s' %
                                elements[unavailable])
 
+    def update(self, atoms):
+        self.check_elements(atoms)
+
         # cutoffs need to be a vector for NeighborList
         cutoffs = self.cutoff * np.ones(len(atoms))
 
@@ -637,6 +655,10 @@ End EAM Interface Documentation
                                for el in atoms.get_chemical_symbols()])
         self.pbc = atoms.get_pbc()
 
+        if self.parameters.vectorized:
+            # pairs are computed directly by calculate_vectorized()
+            return
+
         # since we need the contribution of all neighbors to the
         # local electron density we cannot just calculate and use
         # one way neighbors
@@ -663,6 +685,13 @@ End EAM Interface Documentation
 
         Calculator.calculate(self, atoms, properties, system_changes)
 
+        if self.parameters.vectorized:
+            self.update(self.atoms)
+            if atoms is None:
+                atoms = self.atoms
+            self.calculate_vectorized(atoms, properties)
+            return
+
         # we shouldn't really recalc if charges or magmos change
         if len(system_changes) > 0:  # something wrong with this way
             self.update(self.atoms)
@@ -826,6 +855,182 @@ End EAM Interface Documentation
 
                     self.results['forces'][i] += adp_forces
 
+    def get_functions(self):
+        """Return the potential functions grouped for pair arrays.
+
+        The functions are wrapped in :class:`FunctionGroup` objects, or
+        :class:`TabulatedFunctionGroup` objects if the ``tabulate``
+        parameter is set, so that they can be evaluated for all pairs
+        at once using an element (pair) index as key."""
+        key = (self.parameters.tabulate, id(self.embedded_energy),
+               id(self.electron_density), id(self.phi))
+        if getattr(self, '_functions_key', None) == key:
+            return self._functions
+
+        npoints = self.parameters.tabulate
+        r = rho = None
+        if npoints:
+            r = np.linspace(0.0, self.cutoff, npoints)
+            if hasattr(self, 'nrho') and hasattr(self, 'drho'):
+                rho = np.linspace(0.0, (self.nrho - 1) * self.drho, npoints)
+
+        def group(functions, x):
+            if x is None:
+                return FunctionGroup(functions)
+            return TabulatedFunctionGroup(functions, x)
+
+        names = [('embedded_energy', rho), ('d_embedded_energy', rho),
+                 ('electron_density', r), ('d_electron_density', r),
+                 ('phi', r), ('d_phi', r)]
+        if self.form == 'adp':
+            names += [('d', r), ('d_d', r), ('q', r), ('d_q', r)]
+
+        self._functions = {name: group(getattr(self, name), x)
+                           for name, x in names}
+        self._functions_key = key
+        return self._functions
+
+    def calculate_vectorized(self, atoms, properties):
+        """Calculate energy and forces from flat arrays of neighbor pairs.
+
+        A full neighbor list ``i, j, d, D`` is built once and every
+        potential function is evaluated over all pairs of a given
+        element combination in a single call.  Per-atom sums are done
+        with ``np.bincount``.  The neighbor list is shared with other
+        users of *atoms*."""
+        i, j, D, d = self.get_pairs(atoms)
+        energies, forces, virials = self.calculate_pairs(atoms.numbers,
+                                                         i, j, D, d)
+
+        self.positions = atoms.positions.copy()
+        self.cell = atoms.get_cell().copy()
+
+        components = {name: values.sum()
+                      for name, values in self.atomic_components.items()}
+        energy = sum(components.values())
+        self.energy_free = energy
+        self.energy_zero = energy
+
+        self.results['energy_components'] = components
+        self.results['energy'] = energy
+        self.results['forces'] = forces
+
+    def calculate_batch(self, images, properties=['energy']):
+        """Calculate properties of several configurations at once.
+
+        The pairs of all images are evaluated together in one call to
+        :meth:`calculate_pairs`, using the vectorized implementation
+        whether or not ``vectorized=True`` was given."""
+        for atoms in images:
+            self.check_elements(atoms)
+        return calculate_pairs_batch(self, images, properties, self.get_pairs)
+
+    def get_pairs(self, atoms):
+        """Return full list of pairs i, j, D, d within the cutoff."""
+        nl = get_shared_neighbor_list(atoms, self.cutoff,
+                                      skin=self.parameters.skin)
+        return nl.get_pairs(self.cutoff)
+
+    def calculate_pairs(self, numbers, i, j, D, d):
+        """Evaluate the potential for a full pair list.
+
+        Returns per-atom energies and forces, and None for the
+        virials.  The per-atom contributions to the energy are kept
+        in :attr:`atomic_components`."""
+        natoms = len(numbers)
+        nel = self.Nelements
+        fns = self.get_functions()
+
+        # convert the atomic numbers to an index of the position
+        # in the eam format
+        table = np.zeros(len(chemical_symbols), int)
+        for n, el in enumerate(self.elements):
+            table[atomic_numbers[el]] = n
+        self.index = table[numbers]
+        ti = self.index[i]
+        tj = self.index[j]
+        pair_key = ti * nel + tj
+
+        if self.form == 'fs':
+            # density at atom i from atom j is rho_(tj, ti)
+            density_key = tj * nel + ti
+            back_density_key = pair_key
+        else:
+            density_key = tj
+            back_density_key = ti
+
+        pair_energies = np.bincount(i, fns['phi'](pair_key, d),
+                                    minlength=natoms) / 2.
+        rho = fns['electron_density'](density_key, d)
+        self.total_density = np.bincount(i, rho, minlength=natoms)
+        embedding_energies = fns['embedded_energy'](self.index,
+                                                    self.total_density)
+
+        components = dict(pair=pair_energies, embedding=embedding_energies)
+
+        if self.form == 'adp':
+            u = fns['d'](pair_key, d)
+            w = fns['q'](pair_key, d)
+            uD = u[:, np.newaxis] * D
+            wDD = w[:, np.newaxis, np.newaxis] * (D[:, :, np.newaxis] *
+                                                  D[:, np.newaxis, :])
+            self.mu = np.zeros([natoms, 3])
+            self.lam = np.zeros([natoms, 3, 3])
+            for alpha in range(3):
+                self.mu[:, alpha] = np.bincount(i, uD[:, alpha],
+                                                minlength=natoms)
+                for beta in range(3):
+                    self.lam[:, alpha, beta] = np.bincount(
+                        i, wDD[:, alpha, beta], minlength=natoms)
+
+            trace = self.lam.trace(axis1=1, axis2=2)
+            components.update(adp_mu=np.sum(self.mu ** 2, axis=1) / 2.,
+                              adp_lam=np.sum(self.lam ** 2, axis=(1, 2)) / 2.,
+                              adp_trace=-trace ** 2 / 6.)
+
+        self.atomic_components = components
+        energies = sum(components.values())
+
+        d_embedded_energy = fns['d_embedded_energy'](self.index,
+                                                     self.total_density)
+        scale = (fns['d_phi'](pair_key, d) +
+                 d_embedded_energy[i] *
+                 fns['d_electron_density'](density_key, d) +
+                 d_embedded_energy[j] *
+                 fns['d_electron_density'](back_density_key, d))
+        pair_forces = (scale / d)[:, np.newaxis] * D
+
+        if self.form == 'adp':
+            pair_forces += self.adp_pair_forces(i, j, d, D, pair_key, u, w)
+
+        forces = np.zeros((natoms, 3))
+        for c in range(3):
+            forces[:, c] = np.bincount(i, pair_forces[:, c], minlength=natoms)
+
+        return energies, forces, None
+
+    def adp_pair_forces(self, i, j, r, rvec, pair_key, u, w):
+        """Angular ADP forces for all pairs at once.
+
+        Same terms as :meth:`angular_forces`, evaluated over the
+        pair arrays instead of per atom."""
+        fns = self.get_functions()
+        du = fns['d_d'](pair_key, r)
+        dw = fns['d_q'](pair_key, r)
+
+        dmu = self.mu[i] - self.mu[j]
+        slam = self.lam[i] + self.lam[j]
+        strace = slam.trace(axis1=1, axis2=2)
+
+        term1 = dmu * u[:, np.newaxis]
+        term2 = (np.sum(dmu * rvec, axis=1) * du / r)[:, np.newaxis] * rvec
+        term3 = 2 * np.einsum('nag,na->ng', slam, rvec) * w[:, np.newaxis]
+        term4 = ((np.einsum('nab,na,nb->n', slam, rvec, rvec) * dw / r)
+                 [:, np.newaxis] * rvec)
+        term5 = (strace * (dw * r + 2 * w) / 3.)[:, np.newaxis] * rvec
+
+        return term1 + term2 + term3 + term4 - term5
+
     def angular_forces(self, mu_i, mu, lam_i, lam, r, rvec, form1, form2):
         # calculate the extra components for the adp forces
         # rvec are the relative positions to atom i
@@ -951,3 +1156,46 @@ End EAM Interface Documentation
                 label = name + ' ' + self.elements[i] + '-' + self.elements[j]
                 plt.plot(curvex, curvey[i, j](curvex), label=label)
         plt.legend()
+
+
+class FunctionGroup:
+    """Array of functions evaluated on grouped arguments.
+
+    ``functions`` is a 1D or 2D object array of callables such as
+    ``EAM.phi``.  Calling the group with integer ``keys`` (indices into
+    the flattened array) and arguments ``x`` evaluates each function
+    once for all the arguments with the corresponding key."""
+
+    def __init__(self, functions):
+        self.functions = np.asarray(functions, object).ravel()
+
+    def __call__(self, keys, x):
+        keys = np.asarray(keys)
+        result = np.zeros(len(x))
+        for key in np.unique(keys):
+            mask = keys == key
+            result[mask] = self.functions[key](x[mask])
+        return result
+
+
+class TabulatedFunctionGroup(FunctionGroup):
+    """Functions pre-tabulated on a uniform grid.
+
+    All functions of the group are sampled on the uniform grid ``x``
+    and stacked into one table so that any mix of keys can be evaluated
+    by linear interpolation without calling the original functions.
+    Values outside the grid are linearly extrapolated."""
+
+    def __init__(self, functions, x):
+        FunctionGroup.__init__(self, functions)
+        self.x0 = x[0]
+        self.dx = x[1] - x[0]
+        self.table = np.array([f(x) for f in self.functions])
+
+    def __call__(self, keys, x):
+        npoints = self.table.shape[1]
+        t = (np.asarray(x) - self.x0) / self.dx
+        k = np.clip(np.floor(t).astype(int), 0, npoints - 2)
+        t -= k
+        values = self.table[keys, k]
+        return values + t * (self.table[keys, k + 1] - values)
@@ -4,11 +4,13 @@ from math import sqrt, exp, log
 
 import numpy as np
 
+from ase import Atoms
 from ase.data import chemical_symbols, atomic_numbers
 from ase.units import Bohr
-from ase.neighborlist import NeighborList
+from ase.neighborlist import NeighborList, get_shared_neighbor_list
 from ase.calculators.calculator import (Calculator, all_changes,
-                                        PropertyNotImplementedError)
+                                        PropertyNotImplementedError,
+                                        calculate_pairs_batch)
 
 
 parameters = {
@@ -49,13 +51,20 @@ class EMT(Calculator):
     table.  True gives the behaviour of the Asap code and
     older EMT implementations, although the results are not
     bitwise identical.
+
+    If ``vectorized`` is True (default: False), the energy, forces and
+    stress are evaluated with NumPy operations over whole arrays of
+    neighbor pairs instead of looping over atoms and neighbors in
+    Python.  This gives the same results to within rounding errors but
+    is much faster for large systems.
     """
     implemented_properties = ['energy', 'energies', 'forces',
                               'stress', 'magmom', 'magmoms']
 
     nolabel = True
 
-    default_parameters = {'asap_cutoff': False}
+    default_parameters = {'asap_cutoff': False,
+                          'vectorized': False}
 
     def __init__(self, **kwargs):
         Calculator.__init__(self, **kwargs)
@@ -135,6 +144,12 @@ class EMT(Calculator):
         numbers = self.atoms.numbers
         cell = self.atoms.cell
 
+        if self.parameters.vectorized:
+            if atoms is None:
+                atoms = self.atoms
+            self.calculate_vectorized(atoms, properties)
+            return
+
         self.nl.update(self.atoms)
 
         self.energy = 0.0
@@ -205,6 +220,125 @@ class EMT(Calculator):
             else:
                 raise PropertyNotImplementedError
 
+    def calculate_vectorized(self, atoms, properties):
+        """Evaluate EMT using arrays of all neighbor pairs at once.
+
+        Pairs are taken from a full (both ways) neighbor list, so every
+        bond is visited once from each side and per-atom sums become
+        simple ``np.bincount`` reductions over the pair arrays.  The
+        neighbor list is shared with other users of *atoms*."""
+        i, j, D, d = self.get_pairs(atoms)
+        energies, forces, virials = self.calculate_pairs(self.atoms.numbers,
+                                                         i, j, D, d)
+
+        self.energy = energies.sum()
+        self.energies = energies
+        self.forces = forces
+
+        self.results['energy'] = self.energy
+        self.results['energies'] = self.energies
+        self.results['free_energy'] = self.energy
+        self.results['forces'] = self.forces
+
+        if 'stress' in properties:
+            if self.atoms.number_of_lattice_vectors == 3:
+                self.stress = virials.sum(axis=0) / self.atoms.get_volume()
+                self.results['stress'] = self.stress.flat[[0, 4, 8, 5, 2, 1]]
+            else:
+                raise PropertyNotImplementedError
+
+    def calculate_batch(self, images, properties=['energy']):
+        """Calculate properties of several configurations at once.
+
+        The pairs of all images are evaluated together in one call to
+        :meth:`calculate_pairs`.  With ``asap_cutoff=True`` the cutoff
+        depends on the elements present, so images with different
+        elements are calculated one by one."""
+        if self.parameters.asap_cutoff:
+            elements = set(frozenset(atoms.numbers) for atoms in images)
+            if len(elements) > 1:
+                return Calculator.calculate_batch(self, images, properties)
+
+        numbers = [atoms.numbers for atoms in images]
+        if numbers:
+            self.initialize(Atoms(numbers=np.unique(np.concatenate(numbers))))
+        return calculate_pairs_batch(self, images, properties, self.get_pairs)
+
+    def get_pairs(self, atoms):
+        """Return full list of pairs i, j, D, d within the cutoff."""
+        nl = get_shared_neighbor_list(atoms, self.rc_list, skin=0.3)
+        return nl.get_pairs(self.rc_list)
+
+    def calculate_pairs(self, numbers, i, j, D, d):
+        """Evaluate EMT for a full pair list.
+
+        Returns per-atom energies, forces and virials.  The parameters
+        of all elements in *numbers* must have been set up by
+        :meth:`initialize`."""
+        natoms = len(numbers)
+
+        # Per-atom parameter arrays:
+        par = {key: np.array([self.par[Z][key] for Z in numbers])
+               for key in ['E0', 's0', 'V0', 'eta2', 'kappa', 'lambda',
+                           'n0', 'gamma1', 'gamma2']}
+
+        ksi = par['n0'][j] / par['n0'][i]
+        x = np.exp(self.acut * (d - self.rc))
+        theta = 1.0 / (1.0 + x)
+
+        # Contribution to the neutral sphere density of atom i from atom j:
+        s = (np.exp(-par['eta2'][j] * (d - beta * par['s0'][j])) *
+             ksi / par['gamma1'][i] * theta)
+        sigma1 = np.bincount(i, weights=s, minlength=natoms)
+
+        # Pair (atomic sphere correction) energy:
+        y = (0.5 * par['V0'][i] *
+             np.exp(-par['kappa'][j] * (d / beta - par['s0'][j])) *
+             ksi / par['gamma2'][i] * theta)
+        energies = -0.5 * (np.bincount(i, weights=y, minlength=natoms) +
+                           np.bincount(j, weights=y, minlength=natoms))
+
+        # Embedding energy:
+        deds = np.zeros(natoms)
+        ok = sigma1 > 0.0
+        E0 = par['E0']
+        energies[~ok] -= E0[~ok]
+        sig = sigma1[ok]
+        eta2 = par['eta2'][ok]
+        lam = par['lambda'][ok]
+        kappa = par['kappa'][ok]
+        ds = -np.log(sig / 12) / (beta * eta2)
+        xl = lam * ds
+        yl = np.exp(-xl)
+        z = 6 * par['V0'][ok] * np.exp(-kappa * ds)
+        deds[ok] = ((xl * yl * E0[ok] * lam + kappa * z) /
+                    (sig * beta * eta2))
+        energies[ok] += E0[ok] * ((1 + xl) * yl - 1) + z
+
+        # Pair forces:
+        dtheta = self.acut * theta * x
+        f = ((y * (par['kappa'][j] / beta + dtheta) -
+              s * deds[i] * (par['eta2'][j] + dtheta)) / d)[:, np.newaxis] * D
+
+        forces = np.zeros((natoms, 3))
+        for c in range(3):
+            forces[:, c] = (np.bincount(i, weights=f[:, c], minlength=natoms) -
+                            np.bincount(j, weights=f[:, c], minlength=natoms))
+
+        # Symmetrized pair virials, shared equally by the two atoms:
+        fD = f[:, :, np.newaxis] * D[:, np.newaxis, :]
+        fD = 0.25 * (fD + fD.transpose((0, 2, 1)))
+        virials = np.zeros((natoms, 3, 3))
+        for c in range(3):
+            for c2 in range(3):
+                virials[:, c, c2] = (
+                    np.bincount(i, weights=fD[:, c, c2], minlength=natoms) +
+                    np.bincount(j, weights=fD[:, c, c2], minlength=natoms))
+
+        self.sigma1 = sigma1
+        self.deds = deds
+        return energies, forces, virials
+
     def interact1(self, a1, a2, d, r, p1, p2, ksi):
         x = exp(self.acut * (r - self.rc))
         theta = 1.0 / (1.0 + x)
@@ -1,7 +1,9 @@
 import numpy as np
 
-from ase.neighborlist import NeighborList
-from ase.calculators.calculator import Calculator, all_changes
+from ase.neighborlist import (NeighborList, NewPrimitiveNeighborList,
+                              get_shared_neighbor_list)
+from ase.calculators.calculator import (Calculator, all_changes,
+                                        calculate_pairs_batch)
 from ase.constraints import full_3x3_to_voigt_6_stress
 
 
@@ -59,10 +61,11 @@ class LennardJones(Calculator):
     Implementation note:
 
     For computational efficiency, we minimise the number of
-    pairwise evaluations, so we iterate once over all the atoms,
-    and use NeighbourList with bothways=False. In terms of the
-    equations, we therefore effectively restrict the sum over `i != j`
-    to `j > i`, and need to manually re-add the "missing" `j < i` contributions.
+    pairwise evaluations, so we use a NeighbourList with bothways=False
+    and evaluate all pairs at once as flat arrays ``i, j, d_ij``.
+    In terms of the equations, we therefore effectively restrict the sum
+    over `i != j` to `j > i`, and re-add the "missing" `j < i`
+    contributions with ``np.bincount`` over the second index.
 
     Another consideration is the cutoff. We have to ensure that the potential
     goes to zero smoothly as an atom moves across the cutoff threshold,
@@ -78,11 +81,21 @@ class LennardJones(Calculator):
     However, this means that the energy effectively depends
     on the cutoff, which might lead to unexpected results!
 
+    If this is a problem, a smooth cutoff function can be used
+    instead (``smooth=True``), which multiplies the pair energy with
+    a function that goes smoothly from 1 at ``ro`` to 0 at ``rc``:
+
+    ``u'_ij = u_ij * fc(r_ij)``
+
+    so that both the energy and the forces are continuous at the
+    cutoff.
+
     """
 
     implemented_properties = ['energy', 'energies', 'forces', 'free_energy']
     implemented_properties += ['stress', 'stresses']  # bulk properties
-    default_parameters = {'epsilon': 1.0, 'sigma': 1.0, 'rc': None}
+    default_parameters = {'epsilon': 1.0, 'sigma': 1.0, 'rc': None,
+                          'ro': None, 'smooth': False}
     nolabel = True
 
     def __init__(self, **kwargs):
@@ -97,6 +110,14 @@ class LennardJones(Calculator):
           Cut-off for the NeighborList is set to 3 * sigma if None.
           The energy is upshifted to be continuous at rc.
           Default None
+        ro: float, None
+          Onset of the smooth cutoff function, only used if smooth=True.
+          Set to 0.66 * rc if None.
+          Default None
+        smooth: bool
+          Use a smooth cutoff function between ro and rc instead of
+          shifting the energy.
+          Default False
         """
 
         Calculator.__init__(self, **kwargs)
@@ -104,6 +125,9 @@ class LennardJones(Calculator):
         if self.parameters.rc is None:
             self.parameters.rc = 3 * self.parameters.sigma
 
+        if self.parameters.ro is None:
+            self.parameters.ro = 0.66 * self.parameters.rc
+
         self.nl = None
 
     def calculate(
@@ -115,57 +139,29 @@ class LennardJones(Calculator):
         Calculator.calculate(self, atoms, properties, system_changes)
 
         natoms = len(self.atoms)
-
-        sigma = self.parameters.sigma
-        epsilon = self.parameters.epsilon
         rc = self.parameters.rc
 
         if self.nl is None or 'numbers' in system_changes:
-            self.nl = NeighborList([rc / 2] * natoms, self_interaction=False)
+            self.nl = NeighborList([rc / 2] * natoms, self_interaction=False,
+                                   primitive=NewPrimitiveNeighborList)
 
         self.nl.update(self.atoms)
 
+        # flat half neighbor list
+        i = self.nl.nl.pair_first
+        j = self.nl.nl.pair_second
+        offsets = self.nl.nl.offset_vec
+
         positions = self.atoms.positions
         cell = self.atoms.cell
 
-        # potential value at rc
-        e0 = 4 * epsilon * ((sigma / rc) ** 12 - (sigma / rc) ** 6)
-
-        energies = np.zeros(natoms)
-        forces = np.zeros((natoms, 3))
-        stresses = np.zeros((natoms, 3, 3))
-
-        for ii in range(natoms):
-            neighbors, offsets = self.nl.get_neighbors(ii)
-            cells = np.dot(offsets, cell)
-
-            # pointing *towards* neighbours
-            distance_vectors = positions[neighbors] + cells - positions[ii]
-
-            r2 = (distance_vectors ** 2).sum(1)
-            c6 = (sigma ** 2 / r2) ** 3
-            c6[r2 > rc ** 2] = 0.0
-            c12 = c6 ** 2
-
-            pairwise_energies = 4 * epsilon * (c12 - c6) - e0 * (c6 != 0.0)
-            energies[ii] += 0.5 * pairwise_energies.sum()  # atomic energies
-
-            pairwise_forces = (-24 * epsilon * (2 * c12 - c6) / r2)[
-                :, np.newaxis
-            ] * distance_vectors
+        # pointing *towards* neighbours
+        distance_vectors = positions[j] + np.dot(offsets, cell) - positions[i]
+        distances = np.sqrt((distance_vectors ** 2).sum(1))
 
-            forces[ii] += pairwise_forces.sum(axis=0)
-            stresses[ii] += 0.5 * np.dot(
-                pairwise_forces.T, distance_vectors
-            )  # equivalent to outer product
-
-            # add j < i contributions
-            for jj, atom_j in enumerate(neighbors):
-                energies[atom_j] += 0.5 * pairwise_energies[jj]
-                forces[atom_j] += -pairwise_forces[jj]  # f_ji = - f_ij
-                stresses[atom_j] += 0.5 * np.outer(
-                    pairwise_forces[jj], distance_vectors[jj]
-                )
+        energies, forces, stresses = self.calculate_pairs(
+            self.atoms.numbers, i, j, distance_vectors, distances,
+            bothways=False)
 
         # no lattice, no stress
         if self.atoms.number_of_lattice_vectors == 3:
@@ -182,3 +178,113 @@ class LennardJones(Calculator):
         self.results['free_energy'] = energy
 
         self.results['forces'] = forces
+
+    def calculate_batch(self, images, properties=['energy']):
+        """Calculate properties of several configurations at once.
+
+        The pairs of all images are taken from full neighbor lists
+        and evaluated together in one call to :meth:`calculate_pairs`."""
+        return calculate_pairs_batch(self, images, properties, self.get_pairs)
+
+    def get_pairs(self, atoms):
+        """Return full list of pairs i, j, D, d within the cutoff."""
+        rc = self.parameters.rc
+        nl = get_shared_neighbor_list(atoms, rc, skin=0.3)
+        return nl.get_pairs(rc)
+
+    def calculate_pairs(self, numbers, i, j, distance_vectors, distances,
+                        bothways=True):
+        """Evaluate a list of pairs.
+
+        Returns per-atom energies, forces and stresses (not divided by
+        the volume).  With *bothways* every pair is in the list twice,
+        as (i, j) and as (j, i), otherwise only once."""
+        natoms = len(numbers)
+        sigma = self.parameters.sigma
+        epsilon = self.parameters.epsilon
+        rc = self.parameters.rc
+        ro = self.parameters.ro
+        smooth = self.parameters.smooth
+
+        r2 = distances ** 2
+        c6 = (sigma ** 2 / r2) ** 3
+        c6[r2 > rc ** 2] = 0.0
+        c12 = c6 ** 2
+
+        pairwise_energies = 4 * epsilon * (c12 - c6)
+        pairwise_forces = -24 * epsilon * (2 * c12 - c6) / r2  # du_ij
+
+        if smooth:
+            cutoff_fn = cutoff_function(r2, rc ** 2, ro ** 2)
+            d_cutoff_fn = d_cutoff_function(r2, rc ** 2, ro ** 2)
+            # order matters: the forces need the unmodified pair energies
+            pairwise_forces = (cutoff_fn * pairwise_forces +
+                               2 * d_cutoff_fn * pairwise_energies)
+            pairwise_energies *= cutoff_fn
+        else:
+            # potential value at rc
+            e0 = 4 * epsilon * ((sigma / rc) ** 12 - (sigma / rc) ** 6)
+            pairwise_energies -= e0 * (c6 != 0.0)
+
+        if bothways:
+            # each pair is counted from both sides
+            pairwise_energies *= 0.5
+            pairwise_forces *= 0.5
+
+        pairwise_forces = pairwise_forces[:, np.newaxis] * distance_vectors
+        # equivalent to outer products
+        pairwise_stresses = 0.5 * (pairwise_forces[:, :, np.newaxis] *
+                                   distance_vectors[:, np.newaxis, :])
+
+        # each pair contributes to both atoms (f_ji = - f_ij)
+        energies = 0.5 * (np.bincount(i, pairwise_energies, natoms) +
+                          np.bincount(j, pairwise_energies, natoms))
+
+        forces = np.zeros((natoms, 3))
+        stresses = np.zeros((natoms, 3, 3))
+        for c in range(3):
+            forces[:, c] = (np.bincount(i, pairwise_forces[:, c], natoms) -
+                            np.bincount(j, pairwise_forces[:, c], natoms))
+            for c2 in range(3):
+                stresses[:, c, c2] = (
+                    np.bincount(i, pairwise_stresses[:, c, c2], natoms) +
+                    np.bincount(j, pairwise_stresses[:, c, c2], natoms))
+
+        return energies, forces, stresses
+
+
+def cutoff_function(r, rc, ro):
+    """Smooth cutoff function.
+
+    Goes from 1 to 0 between ro and rc, ensuring
+    that u(r) = lj(r) * cutoff_function(r) is C^1.
+
+    Defined as 1 below ro, 0 above rc.
+
+    Note that r, rc, ro are all expected to be squared,
+    i.e. `r = r_ij^2`, etc.
+    """
+
+    return np.where(
+        r < ro,
+        1.0,
+        np.where(r < rc,
+                 (rc - r) ** 2 * (rc + 2 * r - 3 * ro) / (rc - ro) ** 3,
+                 0.0),
+    )
+
+
+def d_cutoff_function(r, rc, ro):
+    """Derivative of smooth cutoff function wrt r.
+
+    Note that r = r_ij^2, so for the derivative wrt to r_ij,
+    we need to multiply `2*r_ij`. This gives rise to the factor 2
+    in the forces, the `r_ij` is cancelled out by the remaining derivative
+    `d r_ij / d d_ij`, i.e. going from scalar distance to distance vector.
+    """
+
+    return np.where(
+        r < ro,
+        0.0,
+        np.where(r < rc, 6 * (rc - r) * (ro - r) / (rc - ro) ** 3, 0.0),
+    )
@@ -1,21 +1,48 @@
 import numpy as np
 
-from math import exp, sqrt
-
-from ase.calculators.calculator import Calculator
+from ase.calculators.calculator import (Calculator, all_changes,
+                                        calculate_pairs_batch,
+                                        PropertyNotImplementedError)
+from ase.calculators.lj import cutoff_function, d_cutoff_function
+from ase.constraints import full_3x3_to_voigt_6_stress
+from ase.neighborlist import get_shared_neighbor_list
 
 
 class MorsePotential(Calculator):
     """Morse potential.
 
     Default values chosen to be similar as Lennard-Jones.
+
+    The pair energy is::
+
+        u_ij = epsilon * exp(rho0 * (1 - r_ij / r0)) *
+               (exp(rho0 * (1 - r_ij / r0)) - 2)
+
+    Without a cutoff all pairs of atoms interact and the unit cell is
+    ignored, so there is no stress for periodic systems.  If a cutoff
+    ``rc`` is given, pairs are taken from a neighbor list that is kept
+    between calls and only rebuilt once an atom has moved more than half
+    the ``skin``; periodic images are then included.
+    Like for :class:`~ase.calculators.lj.LennardJones`, the energy is
+    shifted to zero at the cutoff unless a smooth cutoff function is
+    used (``smooth=True``).
+
+    Pairs are evaluated as flat arrays in chunks of at most
+    ``chunk_size`` pairs, and the energy and stress are partitioned
+    symmetrically into per-atom ``energies`` and ``stresses``.
     """
 
-    implemented_properties = ['energy', 'forces']
+    implemented_properties = ['energy', 'energies', 'forces', 'free_energy']
+    implemented_properties += ['stress', 'stresses']  # bulk properties
     default_parameters = {'epsilon': 1.0,
                           'rho0': 6.0,
-                          'r0': 1.0}
+                          'r0': 1.0,
+                          'rc': None,
+                          'ro': None,
+                          'smooth': False,
+                          'skin': 0.3}
     nolabel = True
+    chunk_size = 2**16  # number of pairs evaluated at once
 
     def __init__(self, **kwargs):
         """
@@ -28,28 +55,181 @@ class MorsePotential(Calculator):
         rho0: float
           Exponential prefactor. The force constant in the potential minimum
           is k = 2 * epsilon * (rho0 / r0)**2, default 6.0
+        rc: float, None
+          Cut-off for the neighbor list.  If None, all pairs of atoms
+          interact and periodic boundary conditions are ignored.
+          Default None
+        ro: float, None
+          Onset of the smooth cutoff function, only used if smooth=True.
+          Set to 0.66 * rc if None.
+          Default None
+        smooth: bool
+          Use a smooth cutoff function between ro and rc instead of
+          shifting the energy.
+          Default False
+        skin: float
+          Skin of the neighbor list, default 0.3
         """
         Calculator.__init__(self, **kwargs)
 
-    def calculate(self, atoms=None, properties=['energy'],
-                  system_changes=['positions', 'numbers', 'cell',
-                                  'pbc', 'charges', 'magmoms']):
+    def calculate(self, atoms=None, properties=None,
+                  system_changes=all_changes):
+        if properties is None:
+            properties = self.implemented_properties
+
         Calculator.calculate(self, atoms, properties, system_changes)
+
+        atoms = self.atoms
+        natoms = len(atoms)
+
+        # no lattice, no stress (and no stress without periodic images)
+        stress = (('stress' in properties or 'stresses' in properties) and
+                  atoms.number_of_lattice_vectors == 3 and
+                  (self.parameters.rc is not None or not atoms.pbc.any()))
+
+        energies = np.zeros(natoms)
+        forces = np.zeros((natoms, 3))
+        stresses = np.zeros((natoms, 3, 3)) if stress else None
+        for i, j, D, d in self.iterate_pairs(atoms):
+            e, f, s = self.calculate_pairs(atoms.numbers, i, j, D, d,
+                                           stress=stress)
+            energies += e
+            forces += f
+            if stress:
+                stresses += s
+
+        if stress:
+            stresses = full_3x3_to_voigt_6_stress(stresses)
+            self.results['stress'] = (
+                stresses.sum(axis=0) / self.atoms.get_volume()
+            )
+            self.results['stresses'] = stresses / self.atoms.get_volume()
+
+        energy = energies.sum()
+        self.results['energy'] = energy
+        self.results['energies'] = energies
+        self.results['free_energy'] = energy
+        self.results['forces'] = forces
+
+    def calculate_batch(self, images, properties=['energy']):
+        """Calculate properties of several configurations at once.
+
+        The pairs of all images are evaluated together in one
+        call to :meth:`calculate_pairs`."""
+        if self.parameters.rc is None and any(atoms.pbc.any()
+                                              for atoms in images):
+            for name in ['stress', 'stresses']:
+                if name in properties:
+                    raise PropertyNotImplementedError(
+                        '{} not available for periodic systems '
+                        'without cutoff'.format(name))
+        return calculate_pairs_batch(self, images, properties, self.get_pairs)
+
+    def get_pairs(self, atoms):
+        """Return full list of interacting pairs i, j, D, d of atoms."""
+        rc = self.parameters.rc
+        # full list: every pair appears as (i, j) and (j, i)
+        if rc is None:
+            i, j = np.triu_indices(len(atoms), 1)
+            i, j = np.concatenate((i, j)), np.concatenate((j, i))
+            positions = atoms.positions
+            D = positions[j] - positions[i]
+            d = np.sqrt((D**2).sum(1))
+            return i, j, D, d
+
+        nl = get_shared_neighbor_list(atoms, rc, skin=self.parameters.skin)
+        return nl.get_pairs(rc)
+
+    def iterate_pairs(self, atoms):
+        """Yield the full pair list i, j, D, d in chunks.
+
+        Without a cutoff, the pairs of a block of atoms with all other
+        atoms are generated one block at a time, so that the N**2 pairs
+        never have to be stored at once."""
+        natoms = len(atoms)
+        if self.parameters.rc is not None:
+            pairs = self.get_pairs(atoms)
+            for start in range(0, len(pairs[0]), self.chunk_size):
+                yield tuple(x[start:start + self.chunk_size] for x in pairs)
+            return
+
+        positions = atoms.positions
+        block = max(1, self.chunk_size // max(1, natoms))
+        for start in range(0, natoms, block):
+            i = np.arange(start, min(start + block, natoms))
+            i, j = np.repeat(i, natoms), np.tile(np.arange(natoms), len(i))
+            mask = i != j
+            i, j = i[mask], j[mask]
+            D = positions[j] - positions[i]
+            d = np.sqrt((D**2).sum(1))
+            yield i, j, D, d
+
+    def calculate_pairs(self, numbers, i, j, D, d, stress=True):
+        """Evaluate a full pair list.
+
+        Returns per-atom energies, forces and stresses (not divided
+        by the volume, None if stress is False).  Large pair lists are
+        evaluated in chunks of ``chunk_size`` pairs."""
+        natoms = len(numbers)
+        energies = np.zeros(natoms)
+        forces = np.zeros((natoms, 3))
+        stresses = np.zeros((natoms, 3, 3)) if stress else None
+        for start in range(0, len(i), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            e, f, s = self._calculate_pair_chunk(natoms, i[chunk], D[chunk],
+                                                 d[chunk], stress)
+            energies += e
+            forces += f
+            if stress:
+                stresses += s
+        return energies, forces, stresses
+
+    def _calculate_pair_chunk(self, natoms, i, D, d, stress):
         epsilon = self.parameters.epsilon
         rho0 = self.parameters.rho0
         r0 = self.parameters.r0
-        positions = self.atoms.get_positions()
-        energy = 0.0
-        forces = np.zeros((len(self.atoms), 3))
-        preF = 2 * epsilon * rho0 / r0
-        for i1, p1 in enumerate(positions):
-            for i2, p2 in enumerate(positions[:i1]):
-                diff = p2 - p1
-                r = sqrt(np.dot(diff, diff))
-                expf = exp(rho0 * (1.0 - r / r0))
-                energy += epsilon * expf * (expf - 2)
-                F = preF * expf * (expf - 1) * diff / r
-                forces[i1] -= F
-                forces[i2] += F
-        self.results['energy'] = energy
-        self.results['forces'] = forces
+        rc = self.parameters.rc
+
+        expf = np.exp(rho0 * (1.0 - d / r0))
+        pairwise_energies = epsilon * expf * (expf - 2)
+        # (d u_ij / d r_ij) / r_ij
+        pairwise_forces = -2 * epsilon * rho0 / r0 * expf * (expf - 1) / d
+
+        if rc is not None:
+            if self.parameters.smooth:
+                ro = self.parameters.ro
+                if ro is None:
+                    ro = 0.66 * rc
+                r2 = d**2
+                cutoff_fn = cutoff_function(r2, rc**2, ro**2)
+                d_cutoff_fn = d_cutoff_function(r2, rc**2, ro**2)
+                # order matters: the forces need the unmodified pair energies
+                pairwise_forces = (cutoff_fn * pairwise_forces +
+                                   2 * d_cutoff_fn * pairwise_energies)
+                pairwise_energies *= cutoff_fn
+            else:
+                # potential value at rc
+                expc = np.exp(rho0 * (1.0 - rc / r0))
+                pairwise_energies -= epsilon * expc * (expc - 2)
+
+        pairwise_forces = pairwise_forces[:, np.newaxis] * D
+
+        energies = 0.5 * np.bincount(i, pairwise_energies, natoms)
+
+        forces = np.zeros((natoms, 3))
+        for c in range(3):
+            forces[:, c] = np.bincount(i, pairwise_forces[:, c], natoms)
+
+        if not stress:
+            return energies, forces, None
+
+        # equivalent to outer products
+        pairwise_stresses = 0.5 * (pairwise_forces[:, :, np.newaxis] *
+                                   D[:, np.newaxis, :])
+        stresses = np.zeros((natoms, 3, 3))
+        for c in range(3):
+            for c2 in range(3):
+                stresses[:, c, c2] = np.bincount(
+                    i, pairwise_stresses[:, c, c2], natoms)
+
+        return energies, forces, stresses
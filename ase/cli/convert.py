@@ -1,6 +1,9 @@
 import os
+import sys
+import time
 
-from ase.io import read, write
+from ase.io import iread, write
+from ase.io.formats import filetype, get_ioformat
 
 
 class CLICommand:
@@ -8,13 +11,17 @@ class CLICommand:
 
     Use "-" for stdin/stdout.
     See "ase info --formats" for known formats.
+
+    Images are read, filtered and written one at a time if the output
+    format supports appending (traj, extxyz, db, json, ...), so memory use
+    does not grow with the number of images.
     """
 
     @staticmethod
     def add_arguments(parser):
         add = parser.add_argument
         add('-v', '--verbose', action='store_true',
-            help='Print names of converted files')
+            help='Print names of converted files and show progress')
         add('input', nargs='+', metavar='input-file')
         add('-i', '--input-format', metavar='FORMAT',
             help='Specify input FORMAT')
@@ -56,6 +63,10 @@ class CLICommand:
             default={}, metavar="KEY=VALUE",
             help='Additional keyword arguments to pass to '
             '`ase.io.write()`.')
+        add('-w', '--workers', type=int, metavar='N',
+            help='Parse input files in a pool of N processes.  Only for '
+            'formats where the images can be counted without parsing '
+            'them (extxyz, traj, db, json, vasp-xdatcar).')
 
     @staticmethod
     def run(args, parser):
@@ -76,38 +87,121 @@ class CLICommand:
             args.write_args = eval("dict({0})"
                                    .format(', '.join(args.write_args)))
 
-        configs = []
-        for filename in args.input:
-            atoms = read(filename, args.image_number,
-                         format=args.input_format, **args.read_args)
-            if isinstance(atoms, list):
-                configs.extend(atoms)
-            else:
-                configs.append(atoms)
-
-        new_configs = []
-        for atoms in configs:
-            if args.arrays:
-                atoms.arrays = dict((k, atoms.arrays[k]) for k in args.arrays)
-            if args.info:
-                atoms.info = dict((k, atoms.info[k]) for k in args.info)
-            if args.exec_code:
-                # avoid exec() for Py 2+3 compat.
-                eval(compile(args.exec_code, '<string>', 'exec'))
-            if args.exec_file:
-                eval(compile(open(args.exec_file).read(), args.exec_file,
-                             'exec'))
-            if "_output" not in atoms.info or atoms.info["_output"]:
-                new_configs.append(atoms)
-        configs = new_configs
-
         if not args.force and os.path.isfile(args.output):
             parser.error('File already exists: {}'.format(args.output))
 
+        configs = filter_images(read_images(args), args)
+        if args.verbose:
+            configs = progress(configs)
+
         if args.split_output:
             for i, atoms in enumerate(configs):
                 write(args.output.format(i), atoms,
                       format=args.output_format, **args.write_args)
+        elif any(is_same_file(filename, args.output)
+                 for filename in args.input):
+            # Don't overwrite the input while it is being read.  Write to a
+            # temporary file in the same directory and rename at the end:
+            format = args.output_format or filetype(args.output, read=False)
+            dirname, basename = os.path.split(args.output)
+            tmpname = os.path.join(dirname,
+                                   '.{}.{}'.format(os.getpid(), basename))
+            try:
+                write_images(tmpname, configs, format, **args.write_args)
+                os.replace(tmpname, args.output)
+            finally:
+                if os.path.exists(tmpname):
+                    os.remove(tmpname)
         else:
-            write(args.output, configs, format=args.output_format,
-                  **args.write_args)
+            write_images(args.output, configs, args.output_format,
+                         **args.write_args)
+
+
+def is_same_file(filename1, filename2):
+    return (filename1 != '-' and filename2 != '-' and
+            os.path.exists(filename1) and os.path.exists(filename2) and
+            os.path.samefile(filename1, filename2))
+
+
+def read_images(args):
+    for filename in args.input:
+        if filename == '-':
+            filename = sys.stdin
+        yield from iread(filename, args.image_number,
+                         format=args.input_format, workers=args.workers,
+                         **args.read_args)
+
+
+def filter_images(configs, args):
+    code = None
+    if args.exec_code:
+        code = compile(args.exec_code, '<string>', 'exec')
+    filecode = None
+    if args.exec_file:
+        with open(args.exec_file) as fd:
+            filecode = compile(fd.read(), args.exec_file, 'exec')
+
+    for atoms in configs:
+        if args.arrays:
+            atoms.arrays = dict((k, atoms.arrays[k]) for k in args.arrays)
+        if args.info:
+            atoms.info = dict((k, atoms.info[k]) for k in args.info)
+        if code is not None:
+            eval(code)
+        if filecode is not None:
+            eval(filecode)
+        if "_output" not in atoms.info or atoms.info["_output"]:
+            yield atoms
+
+
+def write_images(filename, images, format=None, batch_size=100, **kwargs):
+    """Write images to file while they are read.
+
+    Images are written in batches of batch_size with write(...,
+    append=True) if the format allows it.  Trajectories are written by a
+    single TrajectoryWriter.  For other formats all images are
+    collected first."""
+    if format is None:
+        format = 'json' if filename == '-' else filetype(filename, read=False)
+    io = get_ioformat(format)
+
+    if format == 'traj' and filename != '-':
+        from ase.io.trajectory import Trajectory
+        with Trajectory(filename, 'w', **kwargs) as traj:
+            for atoms in images:
+                traj.write(atoms)
+        return
+
+    if not io.can_append or filename == '-' and format == 'json':
+        write(filename, list(images), format=format, **kwargs)
+        return
+
+    append = False
+    batch = []
+    for atoms in images:
+        batch.append(atoms)
+        if len(batch) == batch_size:
+            write(filename, batch, format=format, append=append, **kwargs)
+            append = True
+            batch = []
+    if batch or not append:
+        write(filename, batch, format=format, append=append, **kwargs)
+
+
+def progress(images, interval=1.0, fd=None):
+    """Yield images while reporting number of images per second."""
+    fd = fd or sys.stderr
+    t0 = time.time()
+    tprint = t0
+    n = 0
+    for atoms in images:
+        yield atoms
+        n += 1
+        t = time.time()
+        if t - tprint > interval:
+            print('\r{} images, {:.1f} images/s'.format(n, n / (t - t0)),
+                  end='', file=fd, flush=True)
+            tprint = t
+    t = max(time.time() - t0, 1e-9)
+    print('\r{} images in {:.1f} s, {:.1f} images/s'.format(n, t, n / t),
+          file=fd)
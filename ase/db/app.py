@@ -83,6 +83,18 @@ def update(sid: int, what: str, x: str):
                            s=session)
 
 
+@app.route('/count/<int:sid>/')
+def count(sid: int):
+    """Wait for the rows of the current query to be counted."""
+    session = Session.get(sid)
+    if session.counter is None:
+        return str(session.nrows)
+    try:
+        return str(session.counter.result(timeout=60))
+    except Exception:
+        return '', 204, []
+
+
 @app.route('/<project_name>/row/<uid>')
 def row(project_name: str, uid: str):
     """Show details for one database row."""
@@ -5,6 +5,7 @@ import operator
 import os
 import re
 import warnings
+from itertools import islice, repeat
 from time import time
 from typing import List, Any
 
@@ -49,6 +50,32 @@ def now():
     return (time() - T2000) / YEAR
 
 
+def chunks(iterable, size):
+    """Yield lists of up to size items from iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def zip_same_length(first, *others):
+    """Like zip(), but raise ValueError for iterables of different length.
+
+    The other iterables may be itertools.repeat objects."""
+    end = object()
+    iterators = [iter(other) for other in others]
+    for value in first:
+        values = [next(iterator, end) for iterator in iterators]
+        if any(x is end for x in values):
+            raise ValueError('Iterables are shorter than the first one')
+        yield (value, *values)
+    for other, iterator in zip(others, iterators):
+        if not isinstance(other, repeat) and next(iterator, end) is not end:
+            raise ValueError('Iterables are longer than the first one')
+
+
 seconds = {'s': 1,
            'm': 60,
            'h': 3600,
@@ -87,6 +114,57 @@ reserved_keys = set(all_properties +
 
 numeric_keys = set(['id', 'energy', 'magmom', 'charge', 'natoms'])
 
+aggregate_functions = ['count', 'sum', 'mean', 'std', 'min', 'max']
+
+
+def parse_statistic(stat):
+    """Split 'min(energy)' into ('min', 'energy') and 'count' into
+    ('count', None)."""
+    if stat == 'count':
+        return stat, None
+    match = re.match(r'\s*(\w+)\(\s*([_a-zA-Z][_0-9a-zA-Z]*)\s*\)\s*$',
+                     stat)
+    if match is None or match.group(1) not in aggregate_functions:
+        raise ValueError('Bad statistic: {!r}.  Use one of {} like this: '
+                         '"min(energy)"'.format(stat, aggregate_functions))
+    return match.group(1), match.group(2)
+
+
+def merge_partial_statistics(partial1, partial2):
+    """Combine [count, sum, M2, min, max] of two groups.
+
+    M2 is the sum of squared deviations from the mean of the group.
+    Adding up deviations instead of squares keeps the standard deviation
+    accurate for values with a large offset (Chan et al., 1979)."""
+    n1, sum1, m21, min1, max1 = partial1
+    n2, sum2, m22, min2, max2 = partial2
+    if n1 == 0:
+        return partial2
+    if n2 == 0:
+        return partial1
+    n = n1 + n2
+    delta = sum2 / n2 - sum1 / n1
+    return [n, sum1 + sum2, m21 + m22 + delta**2 * n1 * n2 / n,
+            min(min1, min2), max(max1, max2)]
+
+
+def finalize_statistic(function, partial):
+    n, total, m2, minimum, maximum = partial
+    if function == 'count':
+        return n
+    if n == 0:
+        return None
+    if function == 'sum':
+        return total
+    if function == 'min':
+        return minimum
+    if function == 'max':
+        return maximum
+    mean = total / n
+    if function == 'mean':
+        return mean
+    return (m2 / n)**0.5
+
 
 def check(key_value_pairs):
     for key, value in key_value_pairs.items():
@@ -131,7 +209,8 @@ def str_represents(value, t=int):
 
 
 def connect(name, type='extract_from_name', create_indices=True,
-            use_lock_file=True, append=True, serial=False):
+            use_lock_file=True, append=True, serial=False,
+            persistent=False):
     """Create connection to database.
 
     name: str
@@ -145,6 +224,9 @@ def connect(name, type='extract_from_name', create_indices=True,
         You can turn this off if you know what you are doing ...
     append: bool
         Use append=False to start a new database.
+    persistent: bool
+        SQLite only: Keep the connection open and use write-ahead logging
+        so that many processes can read while one of them writes.
     """
 
     if isinstance(name, PurePath):
@@ -181,7 +263,7 @@ def connect(name, type='extract_from_name', create_indices=True,
     if type == 'db':
         from ase.db.sqlite import SQLite3Database
         return SQLite3Database(name, create_indices, use_lock_file,
-                               serial=serial)
+                               serial=serial, persistent=persistent)
     if type == 'postgresql':
         from ase.db.postgresql import PostgreSQLDatabase
         return PostgreSQLDatabase(name)
@@ -347,6 +429,50 @@ class Database:
         check(key_value_pairs)
         return 1
 
+    @parallel_function
+    @lock
+    def write_many(self, images, key_value_pairs={}, data={},
+                   commit_size=1000):
+        """Write many atoms objects to database.
+
+        images: iterable of Atoms or AtomsRow objects
+            Atoms to write.  None gives an empty row.
+        key_value_pairs: dict or iterable of dict
+            Key-value pairs for all rows or one dictionary per row.
+        data: dict or iterable of dict
+            Extra stuff for all rows or one dictionary per row.
+        commit_size: int
+            Number of rows to write in one transaction.
+
+        This is much faster than calling :meth:`write` for each row,
+        as rows are inserted in large transactions.  The rows are
+        committed *commit_size* at a time, also inside a ``with db:``
+        block.  An empty SQLite database is filled in a single
+        transaction and gets its indices after all rows are written.
+
+        Returns list of integer ids of the new rows.
+        """
+
+        if isinstance(key_value_pairs, dict):
+            key_value_pairs = repeat(key_value_pairs)
+        if isinstance(data, dict):
+            data = repeat(data)
+
+        lengths = {len(x) for x in [images, key_value_pairs, data]
+                   if hasattr(x, '__len__')}
+        if len(lengths) > 1:
+            raise ValueError('images, key_value_pairs and data must have '
+                             'the same length')
+
+        rows = ((Atoms() if atoms is None else atoms, dict(kvp), dct)
+                for atoms, kvp, dct
+                in zip_same_length(images, key_value_pairs, data))
+        return self._write_many(rows, commit_size)
+
+    def _write_many(self, rows, commit_size):
+        return [self._write(atoms, key_value_pairs, data)
+                for atoms, key_value_pairs, data in rows]
+
     @parallel_function
     @lock
     def reserve(self, **key_value_pairs):
@@ -466,6 +592,15 @@ class Database:
             Specify which columns from the SQL table to include.
             For example, if only the row id and the energy is needed,
             queries can be speeded up by setting columns=['id', 'energy'].
+            The id is always included and the other attributes of the
+            rows are missing.  Besides the columns holding the arrays and
+            properties of the atoms, there are 'key_value_pairs' and the
+            precalculated 'natoms', 'fmax', 'smax', 'volume', 'mass' and
+            'charge' columns as well as the names of external tables.
+            Ignored by the JSON backend.
+
+        Arrays of rows from SQL databases are converted from their
+        binary form only when they are accessed.
         """
 
         if sort:
@@ -499,6 +634,96 @@ class Database:
     def __len__(self):
         return self.count()
 
+    @parallel_function
+    def aggregate(self, selection=None, group_by=[], stats=[], **kwargs):
+        """Compute statistics for groups of rows.
+
+        selection: int, str or list
+            See the select() method.
+        group_by: str or list of str
+            Put rows with the same values of these columns or keys in the
+            same group.  Use 'formula' to group by chemical formula.
+            Default is one group containing all selected rows.
+        stats: str or list of str
+            Statistics of numeric columns or key-value pairs to calculate
+            for each group: 'count(key)', 'sum(key)', 'mean(key)',
+            'std(key)' (population standard deviation), 'min(key)'
+            and 'max(key)'.  Rows without a value for the key are skipped.
+
+        Returns a list of dicts (one for each group, sorted by the
+        group_by values).  Each dict contains the group_by values, the
+        number of rows ('count') and the statistics.  SQL databases
+        calculate the statistics without reading the rows:
+
+        >>> for group in db.aggregate(group_by='formula',
+        ...                           stats=['min(energy)', 'mean(energy)']):
+        ...     print(group['formula'], group['count'], group['min(energy)'])
+        """
+        if isinstance(group_by, str):
+            group_by = [group_by]
+        if isinstance(stats, str):
+            stats = [stats]
+        functions = [parse_statistic(stat) for stat in stats]
+        values = sorted({key for function, key in functions if key})
+
+        keys, cmps = parse_selection(selection, **kwargs)
+        groups = {}
+        for group, n, partials in self._aggregate(keys, cmps,
+                                                  list(group_by), values):
+            if group in groups:
+                n0, partials0 = groups[group]
+                n += n0
+                partials = [merge_partial_statistics(partial0, partial)
+                            for partial0, partial in zip(partials0, partials)]
+            groups[group] = n, partials
+
+        if not group_by and not groups:
+            groups[()] = 0, [[0, 0.0, 0.0, None, None] for key in values]
+
+        def sortkey(group):
+            return [(value is None, isinstance(value, str),
+                     value if value is not None else 0)
+                    for value in group]
+
+        results = []
+        for group in sorted(groups, key=sortkey):
+            n, partials = groups[group]
+            dct = dict(zip(group_by, group))
+            dct['count'] = n
+            for stat, (function, key) in zip(stats, functions):
+                if key:
+                    dct[stat] = finalize_statistic(
+                        function, partials[values.index(key)])
+            results.append(dct)
+        return results
+
+    def _aggregate(self, keys, cmps, group_by, values):
+        """Partial statistics for groups of selected rows.
+
+        Yields a tuple of group_by values, the number of rows and
+        [count, sum, M2, min, max] for each of the keys in values (see
+        :func:`merge_partial_statistics`).  The same group may be yielded
+        more than once.
+
+        This implementation goes through all the rows."""
+        groups = {}
+        for row in self._select(keys, cmps, include_data=False):
+            group = tuple(row.formula if key == 'formula' else row.get(key)
+                          for key in group_by)
+            if group not in groups:
+                groups[group] = [0, [[0, 0.0, 0.0, None, None]
+                                     for key in values]]
+            dct = groups[group]
+            dct[0] += 1
+            for key, partial in zip(values, dct[1]):
+                value = row.get(key)
+                if not isinstance(value, numbers.Real):
+                    continue
+                partial[:] = merge_partial_statistics(
+                    partial, [1, value, 0.0, value, value])
+        for group, (n, partials) in groups.items():
+            yield group, n, partials
+
     @parallel_function
     @lock
     def update(self, id, atoms=None, delete_keys=[], data=None,
@@ -17,8 +17,24 @@ class JSONDatabase(Database):
         pass
 
     def _write(self, atoms, key_value_pairs, data, id):
-        Database._write(self, atoms, key_value_pairs, data)
+        bigdct, ids, nextid = self._read_json_if_exists()
+        id, nextid = self._add_row(bigdct, ids, nextid, atoms,
+                                   key_value_pairs, data, id)
+        self._write_json(bigdct, ids, nextid)
+        return id
+
+    def _write_many(self, rows, commit_size):
+        # The whole file is rewritten anyway, so do it only once:
+        bigdct, ids, nextid = self._read_json_if_exists()
+        newids = []
+        for atoms, key_value_pairs, data in rows:
+            id, nextid = self._add_row(bigdct, ids, nextid, atoms,
+                                       key_value_pairs, data, None)
+            newids.append(id)
+        self._write_json(bigdct, ids, nextid)
+        return newids
 
+    def _read_json_if_exists(self):
         bigdct = {}
         ids = []
         nextid = 1
@@ -30,6 +46,11 @@ class JSONDatabase(Database):
             except (SyntaxError, ValueError):
                 pass
 
+        return bigdct, ids, nextid
+
+    def _add_row(self, bigdct, ids, nextid, atoms, key_value_pairs, data, id):
+        Database._write(self, atoms, key_value_pairs, data)
+
         mtime = now()
 
         if isinstance(atoms, AtomsRow):
@@ -40,8 +61,8 @@ class JSONDatabase(Database):
             row.user = os.getenv('USER')
 
         dct = {}
-        for key in row.__dict__:
-            if key[0] == '_' or key in row._keys or key == 'id':
+        for key in row:
+            if key in row._keys or key == 'id':
                 continue
             dct[key] = row[key]
 
@@ -65,8 +86,7 @@ class JSONDatabase(Database):
             assert id in bigdct
 
         bigdct[id] = dct
-        self._write_json(bigdct, ids, nextid)
-        return id
+        return id, nextid
 
     def _read_json(self):
         if isinstance(self.filename, str):
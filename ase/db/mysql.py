@@ -132,6 +132,8 @@ class MySQLDatabase(SQLite3Database):
     """
     type = 'mysql'
     default = 'DEFAULT'
+    blob_type = 'LONGBLOB'
+    window_functions = True  # MySQL 8.0 or later
 
     def __init__(self, url=None, create_indices=True,
                  use_lock_file=False, serial=False):
@@ -227,9 +229,9 @@ class MySQLDatabase(SQLite3Database):
 
     def create_select_statement(self, keys, cmps,
                                 sort=None, order=None, sort_table=None,
-                                what='systems.*'):
+                                what='systems.*', plan=None):
         sql, value = super(MySQLDatabase, self).create_select_statement(
-            keys, cmps, sort, order, sort_table, what)
+            keys, cmps, sort, order, sort_table, what, plan)
 
         for subst in MySQLCursor.sql_replace:
             sql = sql.replace(subst[0], subst[1])
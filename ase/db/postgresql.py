@@ -98,6 +98,8 @@ def insert_ase_and_ndarray_objects(obj):
 class PostgreSQLDatabase(SQLite3Database):
     type = 'postgresql'
     default = 'DEFAULT'
+    blob_type = 'BYTEA'
+    window_functions = True
 
     def encode(self, obj, binary=False):
         return ase_encode(remove_nan_and_inf(obj))
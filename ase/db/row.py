@@ -65,6 +65,18 @@ def atoms2dict(atoms):
     return dct
 
 
+class Lazy:
+    """Value of a row that is decoded when it is first accessed.
+
+    Calls function(*args) to get the value."""
+    def __init__(self, function, *args):
+        self.function = function
+        self.args = args
+
+    def __call__(self):
+        return self.function(*self.args)
+
+
 class AtomsRow:
     def __init__(self, dct):
         if isinstance(dct, dict):
@@ -77,7 +89,8 @@ class AtomsRow:
                         dct['calculator_parameters'])
         else:
             dct = atoms2dict(dct)
-        assert 'numbers' in dct
+        self._lazy = {key: dct.pop(key) for key, value in list(dct.items())
+                      if isinstance(value, Lazy)}
         self._constraints = dct.pop('constraints', [])
         self._constrained_forces = None
         self._data = dct.pop('data', {})
@@ -85,16 +98,32 @@ class AtomsRow:
         self._keys = list(kvp.keys())
         self.__dict__.update(kvp)
         self.__dict__.update(dct)
-        if 'cell' not in dct:
+        if 'cell' not in self:
             self.cell = np.zeros((3, 3))
-        if 'pbc' not in dct:
+        if 'pbc' not in self:
             self.pbc = np.zeros(3, bool)
 
+    def __getattr__(self, key):
+        # Only called for attributes not found the normal way
+        lazy = self.__dict__.get('_lazy')
+        if lazy and key in lazy:
+            value = lazy.pop(key)()
+            setattr(self, key, value)
+            return value
+        raise AttributeError(key)
+
+    def __getstate__(self):
+        # Decode everything before pickling
+        for key in list(self._lazy):
+            getattr(self, key)
+        return self.__dict__
+
     def __contains__(self, key):
-        return key in self.__dict__
+        return key in self.__dict__ or key in self._lazy
 
     def __iter__(self):
-        return (key for key in self.__dict__ if key[0] != '_')
+        keys = [key for key in self.__dict__ if key[0] != '_']
+        return iter(keys + list(self._lazy))
 
     def get(self, key, default=None):
         """Return value of key if present or default if not."""
@@ -110,10 +139,8 @@ class AtomsRow:
 
         Return dict mapping chemical symbol strings to number of atoms.
         """
-        count = {}
-        for symbol in self.symbols:
-            count[symbol] = count.get(symbol, 0) + 1
-        return count
+        numbers, counts = np.unique(self.numbers, return_counts=True)
+        return {chemical_symbols[Z]: int(n) for Z, n in zip(numbers, counts)}
 
     def __getitem__(self, key):
         return getattr(self, key)
@@ -152,15 +179,23 @@ class AtomsRow:
             self._data = bytes_to_object(self._data)  # lazy decoding
         return FancyDict(self._data)
 
+    def _stored(self, key):
+        """Value of a column calculated when the row was written."""
+        return self.__dict__.get(key)
+
     @property
     def natoms(self):
         """Number of atoms."""
+        natoms = self._stored('natoms')
+        if natoms is not None:
+            return natoms
         return len(self.numbers)
 
     @property
     def formula(self):
         """Chemical formula string."""
-        return Formula('', _tree=[(self.symbols, 1)]).format('metal')
+        return Formula('', _tree=[(self.symbols, 1)],
+                       _count=self.count_atoms()).format('metal')
 
     @property
     def symbols(self):
@@ -170,6 +205,9 @@ class AtomsRow:
     @property
     def fmax(self):
         """Maximum atomic force."""
+        fmax = self._stored('fmax')
+        if fmax is not None:
+            return fmax
         forces = self.constrained_forces
         return (forces**2).sum(1).max()**0.5
 
@@ -192,11 +230,17 @@ class AtomsRow:
     @property
     def smax(self):
         """Maximum stress tensor component."""
+        smax = self._stored('smax')
+        if smax is not None:
+            return smax
         return (self.stress**2).max()**0.5
 
     @property
     def mass(self):
         """Total mass."""
+        mass = self._stored('mass')
+        if mass is not None:
+            return mass
         if 'masses' in self:
             return self.masses.sum()
         return atomic_masses[self.numbers].sum()
@@ -204,6 +248,9 @@ class AtomsRow:
     @property
     def volume(self):
         """Volume of unit cell."""
+        volume = self._stored('volume')
+        if volume is not None:
+            return volume
         if self.cell is None:
             return None
         vol = abs(np.linalg.det(self.cell))
@@ -214,6 +261,9 @@ class AtomsRow:
     @property
     def charge(self):
         """Total charge."""
+        charge = self._stored('charge')
+        if charge is not None:
+            return charge
         charges = self.get('inital_charges')
         if charges is None:
             return 0.0
@@ -17,18 +17,23 @@ Versions:
 import json
 import numbers
 import os
+import random
 import sqlite3
 import sys
+import threading
+import time
+import weakref
 
 import numpy as np
 from contextlib import contextmanager
 
 import ase.io.jsonio
-from ase.data import atomic_numbers
+from ase.data import atomic_numbers, chemical_symbols
 from ase.calculators.calculator import all_properties
-from ase.db.row import AtomsRow
+from ase.db.row import AtomsRow, Lazy
+from ase.formula import Formula
 from ase.db.core import (Database, ops, now, lock, invop, parse_selection,
-                         object_to_bytes, bytes_to_object)
+                         object_to_bytes, bytes_to_object, chunks)
 from ase.parallel import parallel_function
 
 VERSION = 9
@@ -98,19 +103,170 @@ init_statements = [
 
     "INSERT INTO information VALUES ('version', '{}')".format(VERSION)]
 
+# Indices containing all columns needed for finding the ids of rows with
+# a given key, element or key-value pair and for checking a condition for
+# a given id:
+covering_index_statements = [
+    'CREATE INDEX species_z_n_id_index ON species(Z, n, id)',
+    'CREATE INDEX key_id_index ON keys(key, id)',
+    'CREATE INDEX text_key_value_id_index ON text_key_values(key, value, id)',
+    'CREATE INDEX number_key_value_id_index '
+    'ON number_key_values(key, value, id)',
+    'CREATE INDEX species_id_index ON species(id, Z, n)',
+    'CREATE INDEX id_key_index ON keys(id, key)',
+    'CREATE INDEX text_id_index ON text_key_values(id, key, value)',
+    'CREATE INDEX number_id_index ON number_key_values(id, key, value)']
+
 index_statements = [
     'CREATE INDEX unique_id_index ON systems(unique_id)',
     'CREATE INDEX ctime_index ON systems(ctime)',
     'CREATE INDEX username_index ON systems(username)',
-    'CREATE INDEX calculator_index ON systems(calculator)',
-    'CREATE INDEX species_index ON species(Z)',
-    'CREATE INDEX key_index ON keys(key)',
-    'CREATE INDEX text_index ON text_key_values(key)',
-    'CREATE INDEX number_index ON number_key_values(key)']
+    'CREATE INDEX calculator_index ON systems(calculator)'
+] + covering_index_statements
 
 all_tables = ['systems', 'species', 'keys',
               'text_key_values', 'number_key_values']
 
+# Columns of the systems table holding arrays (index, name, dtype, shape):
+array_columns = [(5, 'numbers', np.int32, None),
+                 (6, 'positions', float, (-1, 3)),
+                 (7, 'cell', float, (3, 3)),
+                 (9, 'initial_magmoms', float, None),
+                 (10, 'initial_charges', float, None),
+                 (11, 'masses', float, None),
+                 (12, 'tags', np.int32, None),
+                 (13, 'momenta', float, (-1, 3)),
+                 (19, 'forces', float, (-1, 3)),
+                 (20, 'stress', float, None),
+                 (21, 'dipole', float, None),
+                 (22, 'magmoms', float, None),
+                 (24, 'charges', float, None)]
+
+
+# Columns of the systems table that can be used by aggregate():
+aggregate_columns = {key: key for key in
+                     ['id', 'ctime', 'mtime', 'energy', 'magmom', 'charge',
+                      'natoms', 'fmax', 'smax', 'volume', 'mass',
+                      'calculator', 'unique_id']}
+aggregate_columns['user'] = 'username'
+
+
+# Index for finding the entries of a row in an external table:
+external_index_statement = 'CREATE INDEX {0}_id_index ON {0}(id, key)'
+
+
+def vector_to_blob(vector):
+    """Convert 1-d array to (dtype string, little-endian bytes)."""
+    dtype = vector.dtype.newbyteorder('<')
+    return dtype.str, np.ascontiguousarray(vector, dtype).tobytes()
+
+
+def add_external_entries(results, items):
+    """Add (key, value, id) items of external table to dict of entries.
+
+    Binary values are vectors with their dtype stored as key."""
+    for key, value, id in items:
+        if isinstance(value, (bytes, memoryview)):
+            results[id] = np.frombuffer(bytes(value), key)
+        else:
+            results.setdefault(id, {})[key] = value
+
+
+def selectivity(statistics, table, key, op=None, value=None):
+    """Estimate fraction of rows matching a condition.
+
+    The condition is that the row has key (or element) in table and,
+    if op is given, that the value fulfills "value op value".  Uses the
+    statistics stored by SQLite3Database.analyse() and rough guesses if
+    there are none.  The statistics are not updated when rows are
+    written, so keys (or elements) missing from them also get a rough
+    guess."""
+    guess = {None: 0.5, '=': 0.1, '!=': 0.9}.get(op, 0.3)
+    if not statistics:
+        return guess
+    nrows = statistics['nrows']
+    entry = statistics[table].get(str(key))
+    if not nrows or entry is None:
+        return guess
+    if isinstance(entry, int):
+        # keys and species
+        return entry / nrows
+    fraction = entry[0] / nrows
+    ndistinct = max(entry[1], 1)
+    if op is None:
+        return fraction
+    if op == '=':
+        return fraction / ndistinct
+    if op == '!=':
+        return fraction * (1 - 1 / ndistinct)
+    if table == 'number_key_values':
+        lo, hi = entry[2:]
+        if hi is not None and lo is not None and hi > lo:
+            below = min(max((value - lo) / (hi - lo), 0.0), 1.0)
+            if op[0] == '<':
+                return fraction * below
+            return fraction * (1 - below)
+    return fraction / 2
+
+
+def describe(estimate, table, columns, args, statistics, how):
+    """Describe step of query plan."""
+    condition = ' AND '.join('{}{}{!r}'.format(column, op, arg)
+                             for (column, op), arg in zip(columns, args))
+    text = '{} {} WHERE {}'.format(how, table, condition)
+    if estimate is not None:
+        if statistics:
+            text += ' (~{:.0f} rows)'.format(estimate * statistics['nrows'])
+        else:
+            text += ' (~{:.0%} of rows, no statistics)'.format(estimate)
+    return text
+
+
+class TransactionState(threading.local):
+    """Connection of the current transaction (if any) of each thread."""
+    def __init__(self):
+        self.connection = None
+        self.change_count = 0
+        self.owner = []  # which nested WriteTransactions began it
+
+
+def close_connections(connections):
+    """Close connections of a persistent database owned by this process.
+
+    Connections inherited from a parent process are not ours."""
+    pid = os.getpid()
+    for key in [key for key in connections if key[0] == pid]:
+        connections.pop(key).close()
+
+
+class WriteTransaction:
+    """Replacement for the lock-file of a persistent SQLite database.
+
+    Starts an "IMMEDIATE" transaction so that there is only one writer at
+    a time.  In WAL mode, readers are not blocked by the writer.  Each
+    thread has its own transaction."""
+    def __init__(self, db):
+        # No reference cycle, so that the connections are closed as soon
+        # as the database object is no longer used:
+        self.db = weakref.proxy(db)
+
+    def __enter__(self):
+        db = self.db
+        state = db._transaction
+        if state.connection is not None:
+            # Already inside a transaction
+            state.owner.append(False)
+            return
+        con = db._connect()
+        db._execute_with_retry(con, 'BEGIN IMMEDIATE')
+        state.change_count = 0
+        state.connection = con
+        state.owner.append(True)
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if self.db._transaction.owner.pop():
+            self.db._end_transaction(exc_type is None)
+
 
 def float_if_not_none(x):
     """Convert numpy.float64 to float - old db-interfaces need that."""
@@ -123,10 +279,49 @@ class SQLite3Database(Database):
     initialized = False
     _allow_reading_old_format = False
     default = 'NULL'  # used for autoincrement id
-    connection = None
     version = None
     columnnames = [line.split()[0].lstrip()
                    for line in init_statements[0].splitlines()[1:]]
+    persistent = False
+    timeout = 20.0
+    blob_type = 'BLOB'  # data type of vectors in external tables
+    # Used by aggregate() for accurate standard deviations:
+    window_functions = sqlite3.sqlite_version_info >= (3, 25, 0)
+
+    def __init__(self, filename=None, create_indices=True,
+                 use_lock_file=False, serial=False, persistent=False,
+                 timeout=20.0):
+        """SQLite3 database.
+
+        persistent: bool
+            Keep one connection per process (and thread) open and use
+            write-ahead logging (WAL), so that any number of readers can
+            work while one process writes.  Writers wait for each other
+            using SQLite's own locking instead of a lock-file.  Does not
+            work for files on network file systems.  Open connections
+            can not be used in a forked process, so call close() before
+            starting worker processes with fork.
+        timeout: float
+            Number of seconds to wait for a busy database.
+        """
+        Database.__init__(self, filename, create_indices,
+                          use_lock_file and not persistent, serial)
+        self.persistent = persistent
+        self.timeout = timeout
+        self._connections = {}
+        self._transaction = TransactionState()
+        if persistent:
+            self.lock = WriteTransaction(self)
+            weakref.finalize(self, close_connections, self._connections)
+
+    @property
+    def connection(self):
+        """Connection of the current thread's transaction or None."""
+        return self._transaction.connection
+
+    @connection.setter
+    def connection(self, con):
+        self._transaction.connection = con
 
     def encode(self, obj, binary=False):
         if binary:
@@ -170,39 +365,104 @@ class SQLite3Database(Database):
         return array
 
     def _connect(self):
-        return sqlite3.connect(self.filename, timeout=20)
+        if not self.persistent:
+            return sqlite3.connect(self.filename, timeout=self.timeout)
+
+        # One connection per process and thread:
+        key = (os.getpid(), threading.get_ident())
+        con = self._connections.get(key)
+        if con is None:
+            con = sqlite3.connect(self.filename, timeout=self.timeout,
+                                  isolation_level='IMMEDIATE',
+                                  check_same_thread=False)
+            self._execute_with_retry(con, 'PRAGMA journal_mode=WAL')
+            con.execute('PRAGMA synchronous=NORMAL')
+            self._connections[key] = con
+        return con
+
+    def _execute_with_retry(self, con, statement):
+        """Execute statement, retrying while the database is busy.
+
+        SQLite waits up to *timeout* seconds for a lock, but some
+        conflicts are reported right away.  Those are retried after a
+        random delay until *timeout* seconds have passed."""
+        t0 = time.time()
+        delay = 0.01
+        while True:
+            try:
+                return con.execute(statement)
+            except sqlite3.OperationalError as ex:
+                if ('locked' not in str(ex) and 'busy' not in str(ex) or
+                    time.time() - t0 + delay > self.timeout):
+                    raise
+            time.sleep(delay * (0.5 + random.random()))
+            delay = min(2 * delay, 1.0)
+
+    def _end_transaction(self, commit):
+        if commit:
+            self.connection.commit()
+        else:
+            self.connection.rollback()
+        if not self.persistent:
+            self.connection.close()
+        self.connection = None
+
+    def close(self):
+        """Close the connections of a persistent database."""
+        close_connections(self._connections)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_connections'] = {}
+        del state['_transaction']
+        if self.persistent:
+            del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._transaction = TransactionState()
+        if self.persistent:
+            self.lock = WriteTransaction(self)
+            weakref.finalize(self, close_connections, self._connections)
 
     def __enter__(self):
         assert self.connection is None
-        self.change_count = 0
-        self.connection = self._connect()
+        if self.persistent:
+            self.lock.__enter__()
+        else:
+            self._transaction.change_count = 0
+            self.connection = self._connect()
         return self
 
     def __exit__(self, exc_type, exc_value, tb):
-        if exc_type is None:
-            self.connection.commit()
+        if self.persistent:
+            self.lock.__exit__(exc_type, exc_value, tb)
         else:
-            self.connection.rollback()
-        self.connection.close()
-        self.connection = None
+            self._end_transaction(exc_type is None)
 
     @contextmanager
     def managed_connection(self, commit_frequency=5000):
+        con = None
         try:
             con = self.connection or self._connect()
             self._initialize(con)
             yield con
-        except ValueError as exc:
-            if self.connection is None:
-                con.close()
-            raise exc
+        except BaseException as exc:
+            if self.connection is None and con is not None:
+                if self.persistent:
+                    con.rollback()
+                elif isinstance(exc, ValueError):
+                    con.close()
+            raise
         else:
             if self.connection is None:
                 con.commit()
-                con.close()
+                if not self.persistent:
+                    con.close()
             else:
-                self.change_count += 1
-                if self.change_count % commit_frequency == 0:
+                self._transaction.change_count += 1
+                if self._transaction.change_count % commit_frequency == 0:
                     con.commit()
 
     def _initialize(self, con):
@@ -254,14 +514,93 @@ class SQLite3Database(Database):
         self.initialized = True
 
     def _write(self, atoms, key_value_pairs, data, id):
+        row, key_value_pairs, ext_tables, mtime = self._prepare_row(
+            atoms, key_value_pairs, id)
+
+        with self.managed_connection() as con:
+            values = self._row_values(row, key_value_pairs, data, mtime)
+
+            cur = con.cursor()
+            if id is None:
+                q = self.default + ', ' + ', '.join('?' * len(values))
+                cur.execute('INSERT INTO systems VALUES ({})'.format(q),
+                            values)
+                id = self.get_last_id(cur)
+            else:
+                self._delete(cur, [id], ['keys', 'text_key_values',
+                                         'number_key_values', 'species'])
+                q = ', '.join(name + '=?' for name in self.columnnames[1:])
+                cur.execute('UPDATE systems SET {} WHERE id=?'.format(q),
+                            values + (id,))
+
+            self._insert_row_tables(cur, [(id, row, key_value_pairs,
+                                           ext_tables)])
+
+        return id
+
+    def _write_many(self, rows, commit_size):
+        if self.type != 'db':
+            # Row ids are handed out by the server:
+            return Database._write_many(self, rows, commit_size)
+
+        if self.connection is None:
+            with self:
+                return self._write_many(rows, commit_size)
+
+        with self.managed_connection() as con:
+            if not con.in_transaction:
+                self._execute_with_retry(con, 'BEGIN IMMEDIATE')
+            cur = con.cursor()
+            cur.execute('SELECT COUNT(*) FROM systems')
+            empty = cur.fetchone()[0] == 0
+            indices = []
+            if empty:
+                # An empty database is filled in one transaction and
+                # gets its indices afterwards.  If something goes wrong,
+                # it is left empty with all its indices:
+                cur.execute('SELECT name, sql FROM sqlite_master '
+                            'WHERE type="index" AND sql IS NOT NULL AND '
+                            'tbl_name IN ({})'
+                            .format(', '.join('?' * len(all_tables))),
+                            all_tables)
+                indices = cur.fetchall()
+                for name, sql in indices:
+                    cur.execute('DROP INDEX {}'.format(name))
+
+            ids = []
+            for batch in chunks(rows, commit_size):
+                prepared = [self._prepare_row(atoms, key_value_pairs, None) +
+                            (data,)
+                            for atoms, key_value_pairs, data in batch]
+                id0 = self.get_last_id(cur)
+                values = [(id0 + i,) + self._row_values(row, kvp, data, mtime)
+                          for i, (row, kvp, ext_tables, mtime, data)
+                          in enumerate(prepared, start=1)]
+                q = ', '.join('?' * len(values[0]))
+                cur.executemany('INSERT INTO systems VALUES ({})'.format(q),
+                                values)
+                self._insert_row_tables(
+                    cur, [(id0 + i, row, kvp, ext_tables)
+                          for i, (row, kvp, ext_tables, mtime, data)
+                          in enumerate(prepared, start=1)])
+                ids.extend(range(id0 + 1, id0 + len(prepared) + 1))
+                if not empty:
+                    # Also inside "with db:" and for persistent databases:
+                    con.commit()
+
+            for name, sql in indices:
+                cur.execute(sql)
+
+        return ids
+
+    def _prepare_row(self, atoms, key_value_pairs, id):
+        """Convert atoms to AtomsRow and find key-value pairs and
+        external tables to write."""
         ext_tables = key_value_pairs.pop("external_tables", {})
-        Database._write(self, atoms, key_value_pairs, data)
+        Database._write(self, atoms, key_value_pairs, None)
 
         mtime = now()
 
-        encode = self.encode
-        blob = self.blob
-
         if not isinstance(atoms, AtomsRow):
             row = AtomsRow(atoms)
             row.ctime = mtime
@@ -272,7 +611,7 @@ class SQLite3Database(Database):
             names = self._get_external_table_names()
             for name in names:
                 new_table = row.get(name, {})
-                if new_table:
+                if len(new_table) > 0:
                     ext_tables[name] = new_table
 
         if not id and not key_value_pairs and not ext_tables:
@@ -282,6 +621,13 @@ class SQLite3Database(Database):
             dtype = self._guess_type(v)
             self._create_table_if_not_exists(k, dtype)
 
+        return row, key_value_pairs, ext_tables, mtime
+
+    def _row_values(self, row, key_value_pairs, data, mtime):
+        """Values of the columns of the systems table except id."""
+        encode = self.encode
+        blob = self.blob
+
         constraints = row._constraints
         if constraints:
             if isinstance(constraints, list):
@@ -312,71 +658,63 @@ class SQLite3Database(Database):
         if not data:
             data = row._data
 
-        with self.managed_connection() as con:
-            if not isinstance(data, (str, bytes)):
-                data = encode(data, binary=self.version >= 9)
-
-            values += (row.get('energy'),
-                       row.get('free_energy'),
-                       blob(row.get('forces')),
-                       blob(row.get('stress')),
-                       blob(row.get('dipole')),
-                       blob(row.get('magmoms')),
-                       row.get('magmom'),
-                       blob(row.get('charges')),
-                       encode(key_value_pairs),
-                       data,
-                       len(row.numbers),
-                       float_if_not_none(row.get('fmax')),
-                       float_if_not_none(row.get('smax')),
-                       float_if_not_none(row.get('volume')),
-                       float(row.mass),
-                       float(row.charge))
-
-            cur = con.cursor()
-            if id is None:
-                q = self.default + ', ' + ', '.join('?' * len(values))
-                cur.execute('INSERT INTO systems VALUES ({})'.format(q),
-                            values)
-                id = self.get_last_id(cur)
-            else:
-                self._delete(cur, [id], ['keys', 'text_key_values',
-                                         'number_key_values', 'species'])
-                q = ', '.join(name + '=?' for name in self.columnnames[1:])
-                cur.execute('UPDATE systems SET {} WHERE id=?'.format(q),
-                            values + (id,))
+        if not isinstance(data, (str, bytes)):
+            data = encode(data, binary=self.version >= 9)
+
+        values += (row.get('energy'),
+                   row.get('free_energy'),
+                   blob(row.get('forces')),
+                   blob(row.get('stress')),
+                   blob(row.get('dipole')),
+                   blob(row.get('magmoms')),
+                   row.get('magmom'),
+                   blob(row.get('charges')),
+                   encode(key_value_pairs),
+                   data,
+                   len(row.numbers),
+                   float_if_not_none(row.get('fmax')),
+                   float_if_not_none(row.get('smax')),
+                   float_if_not_none(row.get('volume')),
+                   float(row.mass),
+                   float(row.charge))
+        return values
 
+    def _insert_row_tables(self, cur, rows):
+        """Fill species, key-value and external tables for
+        (id, row, key_value_pairs, ext_tables) tuples."""
+        species = []
+        text_key_values = []
+        number_key_values = []
+        keys = []
+        for id, row, key_value_pairs, ext_tables in rows:
             count = row.count_atoms()
-            if count:
-                species = [(atomic_numbers[symbol], n, id)
-                           for symbol, n in count.items()]
-                cur.executemany('INSERT INTO species VALUES (?, ?, ?)',
-                                species)
+            species += [(atomic_numbers[symbol], n, id)
+                        for symbol, n in count.items()]
 
-            text_key_values = []
-            number_key_values = []
             for key, value in key_value_pairs.items():
                 if isinstance(value, (numbers.Real, np.bool_)):
                     number_key_values.append([key, float(value), id])
                 else:
                     assert isinstance(value, str)
                     text_key_values.append([key, value, id])
+                keys.append((key, id))
 
-            cur.executemany('INSERT INTO text_key_values VALUES (?, ?, ?)',
-                            text_key_values)
-            cur.executemany('INSERT INTO number_key_values VALUES (?, ?, ?)',
-                            number_key_values)
-            cur.executemany('INSERT INTO keys VALUES (?, ?)',
-                            [(key, id) for key in key_value_pairs])
-
-            # Insert entries in the valid tables
-            for tabname in ext_tables.keys():
-                entries = ext_tables[tabname]
-                entries['id'] = id
-                self._insert_in_external_table(
-                    cur, name=tabname, entries=ext_tables[tabname])
+        cur.executemany('INSERT INTO species VALUES (?, ?, ?)', species)
+        cur.executemany('INSERT INTO text_key_values VALUES (?, ?, ?)',
+                        text_key_values)
+        cur.executemany('INSERT INTO number_key_values VALUES (?, ?, ?)',
+                        number_key_values)
+        cur.executemany('INSERT INTO keys VALUES (?, ?)', keys)
 
-        return id
+        # Insert entries in the valid tables (all rows of a table at once)
+        tables = {}
+        for id, row, key_value_pairs, ext_tables in rows:
+            for name, entries in ext_tables.items():
+                tables.setdefault(name, ([], []))
+                tables[name][0].append(id)
+                tables[name][1].append(entries)
+        for name, (ids, entries) in tables.items():
+            self._insert_in_external_table(cur, name, ids, entries)
 
     def _update(self, id, key_value_pairs, data=None):
         """Update key_value_pairs and data for a single row """
@@ -418,11 +756,8 @@ class SQLite3Database(Database):
                             [(key, id) for key in key_value_pairs])
 
             # Insert entries in the valid tables
-            for tabname in ext_tables.keys():
-                entries = ext_tables[tabname]
-                entries['id'] = id
-                self._insert_in_external_table(
-                    cur, name=tabname, entries=ext_tables[tabname])
+            for name, entries in ext_tables.items():
+                self._insert_in_external_table(cur, name, [id], [entries])
 
         return id
 
@@ -448,7 +783,7 @@ class SQLite3Database(Database):
 
         return self._convert_tuple_to_row(values)
 
-    def _convert_tuple_to_row(self, values):
+    def _convert_tuple_to_row(self, values, external_tables=None):
         deblob = self.deblob
         decode = self.decode
 
@@ -457,23 +792,15 @@ class SQLite3Database(Database):
                'unique_id': values[1],
                'ctime': values[2],
                'mtime': values[3],
-               'user': values[4],
-               'numbers': deblob(values[5], np.int32),
-               'positions': deblob(values[6], shape=(-1, 3)),
-               'cell': deblob(values[7], shape=(3, 3))}
+               'user': values[4]}
+
+        # Arrays are only converted when they are needed:
+        for i, name, dtype, shape in array_columns:
+            if values[i] is not None:
+                dct[name] = Lazy(deblob, values[i], dtype, shape)
 
         if values[8] is not None:
             dct['pbc'] = (values[8] & np.array([1, 2, 4])).astype(bool)
-        if values[9] is not None:
-            dct['initial_magmoms'] = deblob(values[9])
-        if values[10] is not None:
-            dct['initial_charges'] = deblob(values[10])
-        if values[11] is not None:
-            dct['masses'] = deblob(values[11])
-        if values[12] is not None:
-            dct['tags'] = deblob(values[12], np.int32)
-        if values[13] is not None:
-            dct['momenta'] = deblob(values[13], shape=(-1, 3))
         if values[14] is not None:
             dct['constraints'] = values[14]
         if values[15] is not None:
@@ -484,31 +811,28 @@ class SQLite3Database(Database):
             dct['energy'] = values[17]
         if values[18] is not None:
             dct['free_energy'] = values[18]
-        if values[19] is not None:
-            dct['forces'] = deblob(values[19], shape=(-1, 3))
-        if values[20] is not None:
-            dct['stress'] = deblob(values[20])
-        if values[21] is not None:
-            dct['dipole'] = deblob(values[21])
-        if values[22] is not None:
-            dct['magmoms'] = deblob(values[22])
         if values[23] is not None:
             dct['magmom'] = values[23]
-        if values[24] is not None:
-            dct['charges'] = deblob(values[24])
-        if values[25] != '{}':
+        if values[25] is not None and values[25] != '{}':
             dct['key_value_pairs'] = decode(values[25])
-        if len(values) >= 27 and values[26] != 'null':
+        if len(values) >= 27 and values[26] not in [None, 'null']:
             dct['data'] = decode(values[26], lazy=True)
+        for i in range(27, len(values)):
+            # natoms, fmax, smax, volume, mass and charge
+            if values[i] is not None:
+                dct[self.columnnames[i]] = values[i]
 
         # Now we need to update with info from the external tables
-        external_tab = self._get_external_table_names()
-        tables = {}
-        for tab in external_tab:
-            row = self._read_external_table(tab, dct["id"])
-            tables[tab] = row
+        # (external_tables can be a dict of already read entries)
+        if external_tables is None:
+            external_tables = self._get_external_table_names()
+        if not isinstance(external_tables, dict):
+            external_tables = {name: self._read_external_table(name,
+                                                               [dct['id']])
+                               for name in external_tables}
+        for name, entries in external_tables.items():
+            dct[name] = entries.get(dct['id'], {})
 
-        dct.update(tables)
         return AtomsRow(dct)
 
     def _old2new(self, values):
@@ -526,10 +850,26 @@ class SQLite3Database(Database):
 
     def create_select_statement(self, keys, cmps,
                                 sort=None, order=None, sort_table=None,
-                                what='systems.*'):
-        tables = ['systems']
+                                what='systems.*', plan=None):
+        """Create SQL statement and arguments for a selection.
+
+        Conditions on columns of the systems table are checked first.
+        Conditions on the keys, species and key-value tables are ordered
+        by their estimated number of matching rows (see
+        :meth:`analyse`).  The most selective one is joined with the
+        systems table and drives the query.  The others are checked with
+        "id IN (...)" subqueries, most selective first.
+
+        If plan is a list, the chosen order is described in it."""
+        statistics = self._get_statistics()
         where = []
         args = []
+        # Conditions on other tables: (estimate, table, columns, args).
+        # columns is a list of (column, operator) pairs:
+        conditions = []
+        # "id NOT IN (...)" conditions: (table, columns, args):
+        exclusions = []
+
         for key in keys:
             if key == 'forces':
                 where.append('systems.fmax IS NOT NULL')
@@ -538,14 +878,12 @@ class SQLite3Database(Database):
             elif key in ['energy', 'fmax', 'smax',
                          'constraints', 'calculator']:
                 where.append('systems.{} IS NOT NULL'.format(key))
+            elif '-' not in key:
+                conditions.append((selectivity(statistics, 'keys', key),
+                                   'keys', [('key', '=')], [key]))
             else:
-                if '-' not in key:
-                    q = 'systems.id in (select id from keys where key=?)'
-                else:
-                    key = key.replace('-', '')
-                    q = 'systems.id not in (select id from keys where key=?)'
-                where.append(q)
-                args.append(key)
+                key = key.replace('-', '')
+                exclusions.append(('keys', [('key', '=')], [key]))
 
         # Special handling of "H=0" and "H<2" type of selections:
         bad = {}
@@ -572,16 +910,15 @@ class SQLite3Database(Database):
                         'cardinality(array_positions(' +
                         'numbers::int[], ?)){}?'.format(op))
                     args += [key, value]
+                elif bad[key]:
+                    exclusions.append(('species',
+                                       [('Z', '='), ('n', invop[op])],
+                                       [key, value]))
                 else:
-                    if bad[key]:
-                        where.append(
-                            'systems.id not in (select id from species ' +
-                            'where Z=? and n{}?)'.format(invop[op]))
-                        args += [key, value]
-                    else:
-                        where.append('systems.id in (select id from species ' +
-                                     'where Z=? and n{}?)'.format(op))
-                        args += [key, value]
+                    conditions.append((selectivity(statistics, 'species',
+                                                   key),
+                                       'species', [('Z', '='), ('n', op)],
+                                       [key, value]))
 
             elif self.type == 'postgresql':
                 jsonop = '->'
@@ -594,15 +931,67 @@ class SQLite3Database(Database):
                              .format(jsonop, key, op))
                 args.append(str(value))
 
-            elif isinstance(value, str):
-                where.append('systems.id in (select id from text_key_values ' +
-                             'where key=? and value{}?)'.format(op))
-                args += [key, value]
             else:
-                where.append(
-                    'systems.id in (select id from number_key_values ' +
-                    'where key=? and value{}?)'.format(op))
-                args += [key, float(value)]
+                if isinstance(value, str):
+                    table = 'text_key_values'
+                else:
+                    table = 'number_key_values'
+                    value = float(value)
+                conditions.append((selectivity(statistics, table, key,
+                                               op, value),
+                                   table, [('key', '='), ('value', op)],
+                                   [key, value]))
+
+        # Most selective first (stable, so the order of the selection
+        # string is kept for equal estimates):
+        conditions.sort(key=lambda condition: condition[0])
+
+        tables = ['systems']
+        driver = []
+        if conditions:
+            estimate, table, columns, cargs = conditions.pop(0)
+            tables = ['{} AS driver_table CROSS JOIN systems'.format(table)]
+            driver = ['driver_table.{}{}?'.format(column, op)
+                      for column, op in columns]
+            driver.append('systems.id=driver_table.id')
+            args = cargs + args
+            if plan is not None:
+                plan.append(describe(estimate, table, columns, cargs,
+                                     statistics, 'JOIN'))
+
+        where = driver + where
+
+        # With the (id, ...) indices created by analyse(), the remaining
+        # conditions are checked for each row found so far.  Otherwise
+        # all matching ids are collected first:
+        if statistics.get('probe'):
+            template = ('{}EXISTS (SELECT 1 FROM {} AS probe_table WHERE '
+                        'probe_table.id=systems.id AND {})')
+            prefix = 'probe_table.'
+            how = ['EXISTS', 'NOT EXISTS']
+        else:
+            template = 'systems.id {}IN (SELECT id FROM {} WHERE {})'
+            prefix = ''
+            how = ['IN', 'NOT IN']
+
+        for estimate, table, columns, cargs in conditions:
+            where.append(template.format(
+                '', table, ' AND '.join('{}{}{}?'.format(prefix, column, op)
+                                        for column, op in columns)))
+            args += cargs
+            if plan is not None:
+                plan.append(describe(estimate, table, columns, cargs,
+                                     statistics, how[0]))
+
+        for table, columns, cargs in exclusions:
+            where.append(template.format(
+                'NOT ', table,
+                ' AND '.join('{}{}{}?'.format(prefix, column, op)
+                             for column, op in columns)))
+            args += cargs
+            if plan is not None:
+                plan.append(describe(None, table, columns, cargs,
+                                     statistics, how[1]))
 
         if sort:
             if sort_table != 'systems':
@@ -618,24 +1007,45 @@ class SQLite3Database(Database):
             sql += '\n  WHERE\n  ' + ' AND\n  '.join(where)
         if sort:
             # XXX use "?" instead of "{}"
-            sql += '\nORDER BY {0}.{1} IS NULL, {0}.{1} {2}'.format(
-                sort_table, sort, order)
+            # (rows with equal values in id order, like for JSON)
+            sql += ('\nORDER BY {0}.{1} IS NULL, {0}.{1} {2}, systems.id'
+                    .format(sort_table, sort, order))
+        elif driver and what != 'COUNT(*)':
+            # Keep the order of a scan of the systems table:
+            sql += '\nORDER BY systems.id'
 
         return sql, args
 
+    def _get_statistics(self):
+        """Statistics collected by :meth:`analyse` (empty if never run)."""
+        with self.managed_connection() as con:
+            cur = con.cursor()
+            cur.execute("SELECT value FROM information "
+                        "WHERE name='statistics'")
+            result = cur.fetchone()
+        if result is None:
+            return {}
+        return json.loads(result[0])
+
     def _select(self, keys, cmps, explain=False, verbosity=0,
                 limit=None, offset=0, sort=None, include_data=True,
                 columns='all'):
 
-        values = np.array([None for i in range(27)])
-        values[25] = '{}'
-        values[26] = 'null'
-
         if columns == 'all':
+            values = np.array([None for i in range(27)])
             columnindex = list(range(26))
+            external_tables = self._get_external_table_names()
         else:
-            columnindex = [c for c in range(0, 26)
-                           if self.columnnames[c] in columns]
+            # Only the requested columns (and the id) are read and
+            # converted:
+            values = np.array([None for name in self.columnnames])
+            columnindex = [c for c, name in enumerate(self.columnnames)
+                           if c == 0 or c != 26 and name in columns]
+            external_tables = [name
+                               for name in self._get_external_table_names()
+                               if name in columns]
+        values[25] = '{}'
+        values[26] = 'null'
         if include_data:
             columnindex.append(26)
 
@@ -650,17 +1060,14 @@ class SQLite3Database(Database):
                         'fmax', 'smax', 'volume', 'mass', 'charge', 'natoms']:
                 sort_table = 'systems'
             else:
-                for dct in self._select(keys + [sort], cmps=[], limit=1,
-                                        include_data=False,
-                                        columns=['key_value_pairs']):
-                    if isinstance(dct['key_value_pairs'][sort], str):
+                with self.managed_connection() as con:
+                    cur = con.cursor()
+                    cur.execute('SELECT id FROM text_key_values '
+                                'WHERE key=? LIMIT 1', [sort])
+                    if cur.fetchone() is not None:
                         sort_table = 'text_key_values'
                     else:
                         sort_table = 'number_key_values'
-                    break
-                else:
-                    # No rows.  Just pick a table:
-                    sort_table = 'number_key_values'
 
         else:
             order = None
@@ -670,8 +1077,9 @@ class SQLite3Database(Database):
                          for name in
                          np.array(self.columnnames)[np.array(columnindex)])
 
+        plan = [] if explain else None
         sql, args = self.create_select_statement(keys, cmps, sort, order,
-                                                 sort_table, what)
+                                                 sort_table, what, plan)
 
         if explain:
             sql = 'EXPLAIN QUERY PLAN ' + sql
@@ -689,13 +1097,22 @@ class SQLite3Database(Database):
             cur = con.cursor()
             cur.execute(sql, args)
             if explain:
+                for n, step in enumerate(plan):
+                    yield {'explain': (n, 0, 0, 'PLAN ' + step)}
                 for row in cur.fetchall():
                     yield {'explain': row}
             else:
                 n = 0
-                for shortvalues in cur.fetchall():
+                rows = cur.fetchall()
+                # Read the external tables for all rows at once:
+                ids = [shortvalues[0] for shortvalues in rows]
+                external_tables = {name: self._read_external_table(name,
+                                                                   ids)
+                                   for name in external_tables}
+                for shortvalues in rows:
                     values[columnindex] = shortvalues
-                    yield self._convert_tuple_to_row(tuple(values))
+                    yield self._convert_tuple_to_row(tuple(values),
+                                                     external_tables)
                     n += 1
 
                 if sort and sort_table != 'systems':
@@ -704,6 +1121,14 @@ class SQLite3Database(Database):
                         if n == limit:
                             return
                         limit -= n
+                    if n > 0:
+                        offset = 0
+                    elif offset:
+                        # Skip the rows with the sort key:
+                        sql, args = self.create_select_statement(
+                            keys + [sort], cmps, what='COUNT(*)')
+                        cur.execute(sql, args)
+                        offset = max(0, offset - cur.fetchone()[0])
                     for row in self._select(keys + ['-' + sort], cmps,
                                             limit=limit, offset=offset,
                                             include_data=include_data,
@@ -729,9 +1154,145 @@ class SQLite3Database(Database):
             cur.execute(sql, args)
             return cur.fetchone()[0]
 
+    def _aggregate(self, keys, cmps, group_by, values):
+        joins = []
+        args = []
+        columns = []
+        for n, key in enumerate(group_by):
+            if key == 'formula':
+                columns.append('systems.numbers')
+            elif key in aggregate_columns:
+                columns.append('systems.' + aggregate_columns[key])
+            else:
+                # Text or number:
+                for table in ['text_key_values', 'number_key_values']:
+                    alias = 'g{}{}_table'.format(n, table[0])
+                    joins.append('LEFT JOIN {0} AS {1} ON {1}.id=systems.id '
+                                 'AND {1}.key=?'.format(table, alias))
+                    args.append(key)
+                    columns.append(alias + '.value')
+        ngroup = len(columns)
+        groups = ['g{}'.format(n) for n in range(ngroup)]
+        partition = 'PARTITION BY ' + ', '.join(columns) if columns else ''
+
+        # The rows are selected in a subquery that also calculates the
+        # deviations from the mean of the group, so that the standard
+        # deviation does not suffer from cancellation:
+        inner = ['{} AS g{}'.format(column, n)
+                 for n, column in enumerate(columns)]
+        columns = groups[:]
+        for n, key in enumerate(values):
+            if key in aggregate_columns:
+                x = 'systems.' + aggregate_columns[key]
+            else:
+                x = 'v{}_table.value'.format(n)
+                joins.append('LEFT JOIN number_key_values AS v{0}_table '
+                             'ON v{0}_table.id=systems.id AND '
+                             'v{0}_table.key=?'.format(n))
+                args.append(key)
+            inner.append('{} AS x{}'.format(x, n))
+            if self.window_functions:
+                inner.append('{0} - AVG({0}) OVER ({1}) AS d{2}'
+                             .format(x, partition, n))
+                m2 = 'SUM(d{0}*d{0})'
+            else:
+                m2 = 'SUM(x{0}*x{0})'
+            columns += [c.format(n) for c in ['COUNT(x{})', 'SUM(x{})', m2,
+                                              'MIN(x{})', 'MAX(x{})']]
+
+        sql = 'SELECT {} FROM systems'.format(', '.join(inner or ['1']))
+        if joins:
+            sql += '\n  ' + '\n  '.join(joins)
+        if keys or cmps:
+            selection, selection_args = self.create_select_statement(
+                keys, cmps, what='systems.id')
+            sql += '\n  WHERE systems.id IN (\n{})'.format(selection)
+            args += selection_args
+        columns.insert(0, 'COUNT(*)')
+        sql = 'SELECT {} FROM (\n{}) AS selected'.format(
+            ', '.join(columns), sql)
+        if ngroup:
+            sql += '\nGROUP BY ' + ', '.join(groups)
+
+        formulas = {}
+        with self.managed_connection() as con:
+            cur = con.cursor()
+            cur.execute(sql, args)
+            for row in cur.fetchall():
+                n = row[0]
+                group = []
+                i = 1
+                for key in group_by:
+                    value = row[i]
+                    i += 1
+                    if key == 'formula':
+                        if value is not None:
+                            blob = bytes(value)
+                            if blob not in formulas:
+                                formulas[blob] = Formula.from_list(
+                                    [chemical_symbols[Z] for Z in
+                                     self.deblob(value, np.int32)]
+                                ).format('metal')
+                            value = formulas[blob]
+                    elif key not in aggregate_columns:
+                        if value is None:
+                            value = row[i]
+                        i += 1
+                    group.append(value)
+                partials = [list(row[j:j + 5])
+                            for j in range(i, len(row), 5)]
+                for partial in partials:
+                    if partial[0] == 0:
+                        partial[1:3] = 0.0, 0.0
+                    elif not self.window_functions:
+                        # Sum of squares -> sum of squared deviations:
+                        partial[2] = max(partial[2] -
+                                         partial[1]**2 / partial[0], 0.0)
+                yield tuple(group), n, partials
+
     def analyse(self):
+        """Update statistics used for planning selections.
+
+        Missing covering indices (see *covering_index_statements*) and
+        indices on the ids of external tables are created, the
+        database's own statistics are updated and the number of rows
+        with each key and element are stored together with the number
+        of distinct values and the range of numbers.
+
+        The statistics are not updated when rows are written, so this
+        should be run again after large changes to the database."""
         with self.managed_connection() as con:
-            con.execute('ANALYZE')
+            cur = con.cursor()
+            if self.create_indices:
+                statements = covering_index_statements + [
+                    external_index_statement.format(name)
+                    for name in self._get_external_table_names(con)]
+                for statement in statements:
+                    cur.execute(statement.replace('INDEX',
+                                                  'INDEX IF NOT EXISTS', 1))
+            cur.execute('ANALYZE')
+
+            cur.execute('SELECT COUNT(*) FROM systems')
+            statistics = {'nrows': cur.fetchone()[0],
+                          'probe': self.create_indices}
+            cur.execute('SELECT key, COUNT(*) FROM keys GROUP BY key')
+            statistics['keys'] = dict(cur.fetchall())
+            cur.execute('SELECT Z, COUNT(*) FROM species GROUP BY Z')
+            statistics['species'] = {str(Z): n for Z, n in cur.fetchall()}
+            cur.execute('SELECT key, COUNT(*), COUNT(DISTINCT value) '
+                        'FROM text_key_values GROUP BY key')
+            statistics['text_key_values'] = {
+                key: [n, ndistinct] for key, n, ndistinct in cur.fetchall()}
+            cur.execute('SELECT key, COUNT(*), COUNT(DISTINCT value), '
+                        'MIN(value), MAX(value) '
+                        'FROM number_key_values GROUP BY key')
+            statistics['number_key_values'] = {
+                key: [n, ndistinct, lo, hi]
+                for key, n, ndistinct, lo, hi in cur.fetchall()}
+
+            cur.execute("DELETE FROM information WHERE name='statistics'")
+            cur.execute('INSERT INTO information VALUES (?, ?)',
+                        ('statistics', json.dumps(statistics)))
 
     @parallel_function
     @lock
@@ -820,6 +1381,9 @@ class SQLite3Database(Database):
         with self.managed_connection() as con:
             cur = con.cursor()
             cur.execute(sql)
+            if self.create_indices and self.type != 'mysql':
+                # MySQL can not index TEXT columns
+                cur.execute(external_index_statement.format(name))
             # Insert an entry saying that there is a new external table
             # present and an entry with the datatype
             cur.execute(sql2, ("external_table_name", name))
@@ -849,42 +1413,66 @@ class SQLite3Database(Database):
             return float(value)
         return value
 
-    def _insert_in_external_table(self, cursor, name=None, entries=None):
-        """Insert into external table"""
-        if name is None or entries is None:
-            # There is nothing to do
+    def _insert_in_external_table(self, cursor, name, ids, entries):
+        """Insert entries (dicts or vectors) for many ids in a table.
+
+        Existing vectors and existing keys of a dict are overwritten."""
+        if not ids:
             return
 
-        id = entries.pop("id")
-        dtype = self._guess_type(entries)
         expected_dtype = self._get_value_type_of_table(cursor, name)
-        if dtype != expected_dtype:
-            raise ValueError("The provided data type for table {} "
-                             "is {}, while it is initialized to "
-                             "be of type {}"
-                             "".format(name, dtype, expected_dtype))
-
-        # First we check if entries already exists
-        cursor.execute("SELECT key FROM {} WHERE id=?".format(name), (id,))
+        if expected_dtype == self.blob_type:
+            values = []
+            for id, vector in zip(ids, entries):
+                if not isinstance(vector, np.ndarray):
+                    raise ValueError('Table {} contains vectors'.format(name))
+                values.append(vector_to_blob(vector) + (id,))
+            for chunk in chunks(ids, 500):
+                cursor.execute('DELETE FROM {} WHERE id IN ({})'
+                               .format(name, ', '.join('?' * len(chunk))),
+                               chunk)
+            cursor.executemany('INSERT INTO {} VALUES (?, ?, ?)'.format(name),
+                               values)
+            return
+
+        for dct in entries:
+            dtype = self._guess_type(dct)
+            if dtype != expected_dtype:
+                raise ValueError("The provided data type for table {} "
+                                 "is {}, while it is initialized to "
+                                 "be of type {}"
+                                 "".format(name, dtype, expected_dtype))
+
+        # First we check which entries already exist
+        existing = set()
+        for chunk in chunks(ids, 500):
+            cursor.execute('SELECT * FROM {} WHERE id IN ({})'
+                           .format(name, ', '.join('?' * len(chunk))), chunk)
+            existing.update((id, key) for key, value, id in cursor.fetchall())
+
         updates = []
-        for item in cursor.fetchall():
-            value = entries.pop(item[0], None)
-            if value is not None:
-                updates.append(
-                    (value, id, self._convert_to_recognized_types(item[0])))
+        inserts = []
+        for id, dct in zip(ids, entries):
+            for key, value in dct.items():
+                value = self._convert_to_recognized_types(value)
+                if (id, key) in existing:
+                    updates.append((value, id, key))
+                else:
+                    inserts.append((key, value, id))
 
         # Update entry if key and ID already exists
         sql = "UPDATE {} SET value=? WHERE id=? AND key=?".format(name)
         cursor.executemany(sql, updates)
 
         # Insert the ones that does not already exist
-        inserts = [(k, self._convert_to_recognized_types(v), id)
-                   for k, v in entries.items()]
         sql = "INSERT INTO {} VALUES (?, ?, ?)".format(name)
         cursor.executemany(sql, inserts)
 
     def _guess_type(self, entries):
         """Guess the type based on the first entry."""
+        if isinstance(entries, np.ndarray):
+            return self.blob_type
+
         values = [v for _, v in entries.items()]
 
         # Check if all datatypes are the same
@@ -903,22 +1491,109 @@ class SQLite3Database(Database):
             return "TEXT"
         raise ValueError("Unknown datatype!")
 
-    def _get_value_type_of_table(self, cursor, tab_name):
-        """Return the expected value name."""
-        sql = "SELECT value FROM information WHERE name=?"
-        cursor.execute(sql, (tab_name + "_dtype",))
-        return cursor.fetchone()[0]
+    @parallel_function
+    @lock
+    def write_external_table(self, name, ids, entries, keys=None):
+        """Write entries of an external table for many rows at once.
 
-    def _read_external_table(self, name, id):
-        """Read row from external table."""
+        name: str
+            Name of external table.  It is created if needed.
+        ids: list of int
+            Ids of the rows.
+        entries: list of dict or 2-d ndarray
+            One dict of key-value pairs for each id or, if keys are given,
+            an array with one row for each id and one column for each key.
+        keys: list of str
+            Keys for the columns of entries.
+
+        All values must be integers, floats or strings (same type for
+        all).  Existing values for the same id and key are overwritten."""
+        ids = [int(id) for id in ids]
+        if keys is not None:
+            entries = np.asarray(entries)
+            if entries.shape != (len(ids), len(keys)):
+                raise ValueError('Expected array of shape {}'
+                                 .format((len(ids), len(keys))))
+            entries = [dict(zip(keys, values))
+                       for values in entries.tolist()]
+        elif len(entries) != len(ids):
+            raise ValueError('Need one dict for each id')
+        if not ids:
+            return
+        self._create_table_if_not_exists(name, self._guess_type(entries[0]))
+        with self.managed_connection() as con:
+            self._insert_in_external_table(con.cursor(), name, ids, entries)
 
+    @parallel_function
+    @lock
+    def write_vectors(self, name, ids, vectors):
+        """Write one vector (a 1-d array) for each of many rows at once.
+
+        Each vector is stored as a single binary value in the external
+        table called name, which is created if needed.  Use this for
+        descriptors, fingerprints and other features.  An existing
+        vector of a row is replaced.  The vectors can be read with
+        :meth:`read_vectors` or as row[name]."""
+        ids = [int(id) for id in ids]
+        if isinstance(vectors, np.ndarray) and vectors.ndim == 2:
+            vectors = list(vectors)
+        else:
+            vectors = [np.asarray(vector) for vector in vectors]
+        if len(vectors) != len(ids):
+            raise ValueError('Need one vector for each id')
+        if any(vector.ndim != 1 for vector in vectors):
+            raise ValueError('Vectors must be 1-d arrays')
+        if not ids:
+            return
+        self._create_table_if_not_exists(name, self.blob_type)
+        with self.managed_connection() as con:
+            self._insert_in_external_table(con.cursor(), name, ids, vectors)
+
+    @parallel_function
+    def read_external_table(self, name, ids=None):
+        """Read entries of an external table for many rows at once.
+
+        Returns a dict mapping ids to dicts of key-value pairs (or to
+        vectors for tables written with :meth:`write_vectors`).  Rows with
+        no entries are left out.  Default is to read all rows."""
+        return self._read_external_table(name, ids)
+
+    def _read_external_table(self, name, ids=None):
+        if not self._external_table_exists(name):
+            raise KeyError('No external table called {}'.format(name))
+        results = {}
         with self.managed_connection() as con:
             cur = con.cursor()
-            cur.execute("SELECT * FROM {} WHERE id=?".format(name), (id,))
-            items = cur.fetchall()
-            dictionary = dict([(item[0], item[1]) for item in items])
+            if ids is None:
+                cur.execute('SELECT * FROM {}'.format(name))
+                add_external_entries(results, cur.fetchall())
+            else:
+                for chunk in chunks([int(id) for id in ids], 500):
+                    cur.execute('SELECT * FROM {} WHERE id IN ({})'
+                                .format(name, ', '.join('?' * len(chunk))),
+                                chunk)
+                    add_external_entries(results, cur.fetchall())
+        return results
+
+    @parallel_function
+    def read_vectors(self, name, ids):
+        """Read vectors for many rows as a 2-d array.
+
+        The vectors must have the same length.  See :meth:`write_vectors`.
+        """
+        vectors = self._read_external_table(name, ids)
+        missing = [id for id in ids if id not in vectors]
+        if missing:
+            raise KeyError('No {} vector for rows {}'.format(name, missing))
+        if not ids:
+            return np.zeros((0, 0))
+        return np.array([vectors[id] for id in ids])
 
-        return dictionary
+    def _get_value_type_of_table(self, cursor, tab_name):
+        """Return the expected value name."""
+        sql = "SELECT value FROM information WHERE name=?"
+        cursor.execute(sql, (tab_name + "_dtype",))
+        return cursor.fetchone()[0]
 
 
 if __name__ == '__main__':
@@ -17,6 +17,24 @@ function update_table(sid, what, x)
         data = request.responseText;
         table = document.getElementById('database1')
         table.innerHTML = data;
+        update_count();
+    }
+    request.send();
+}
+
+function update_count()
+{
+    // Rows are still being counted on the server
+    var nrows = document.getElementById('nrows');
+    if (nrows == null) {
+        return;
+    }
+    var request = new XMLHttpRequest();
+    request.open('GET', '/count/' + nrows.dataset.sid + '/', true);
+    request.onload = function() {
+        if (request.status == 200) {
+            nrows.innerHTML = request.responseText;
+        }
     }
     request.send();
 }
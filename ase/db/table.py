@@ -20,19 +20,10 @@ def get_sql_columns(columns):
         sql_columns[sql_columns.index('user')] = 'username'
     if 'formula' in columns:
         sql_columns[sql_columns.index('formula')] = 'numbers'
-    if 'fmax' in columns:
-        sql_columns[sql_columns.index('fmax')] = 'forces'
-    if 'smax' in columns:
-        sql_columns[sql_columns.index('smax')] = 'stress'
-    if 'volume' in columns:
-        sql_columns[sql_columns.index('volume')] = 'cell'
-    if 'mass' in columns:
-        sql_columns[sql_columns.index('mass')] = 'masses'
-    if 'charge' in columns:
-        sql_columns[sql_columns.index('charge')] = 'charges'
 
+    # fmax, smax, volume, mass and charge are stored in columns of their
+    # own, so forces, stress and so on need not be read.
     sql_columns.append('key_value_pairs')
-    sql_columns.append('constraints')
     if 'id' not in sql_columns:
         sql_columns.append('id')
 
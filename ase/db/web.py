@@ -1,13 +1,172 @@
 """Helper functions for Flask WSGI-app."""
+import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import List, Tuple, Dict, Any, Optional
 
 from flask import flash
 
-from ase.db.core import default_key_descriptions, Database
+from ase.db.core import (default_key_descriptions, Database,
+                         convert_str_to_int_float_or_str)
 from ase.db.table import Table, all_columns
 
 
+def modification_time(db: Database) -> float:
+    """Time of last change of database file.
+
+    Databases that are not files (PostgreSQL, MySQL) are assumed to
+    change every minute."""
+    filename = db.filename
+    if isinstance(filename, str) and os.path.isfile(filename):
+        return max(os.path.getmtime(name)
+                   for name in [filename, filename + '-wal']
+                   if os.path.isfile(name))
+    return time.time() // 60
+
+
+def keyset_column(sort: str) -> Optional[Tuple[str, bool]]:
+    """Column and direction (True for descending) for keyset pagination.
+
+    Returns None for columns that can not be used."""
+    descending = sort.startswith('-')
+    column = sort.lstrip('-') or 'id'
+    if column == 'age':
+        return 'ctime', not descending
+    if column in ['formula', 'pbc']:
+        return None
+    return column, descending
+
+
+class QueryResult:
+    """Cached tables and count for one query and sort order.
+
+    Tables are read with keyset pagination: rows after a known row
+    (a "bookmark") are selected with a condition on the sort column
+    (for example "energy>=-2.3") instead of skipping all rows before
+    the page with OFFSET.  Several request threads can use the same
+    result, so the tables and bookmarks are guarded by a lock.
+    """
+    max_tables = 50
+
+    def __init__(self, query: str, sort: str, mtime: float):
+        self.query = query
+        self.sort = sort
+        self.mtime = mtime
+        self.count: Optional[Future] = None
+        self.tables: 'OrderedDict[Tuple, Table]' = OrderedDict()
+        # Row number -> (value, number of rows with that value before):
+        self.bookmarks: Dict[int, Tuple[Any, int]] = {}
+        self.lock = threading.Lock()
+
+    def selection(self, offset: int) -> Tuple[Any, int, Any]:
+        """Selection and offset for reading rows from row number offset.
+
+        Also returns the value of the bookmark used (or None)."""
+        column = keyset_column(self.sort)
+        with self.lock:
+            start = max((n for n in self.bookmarks if n <= offset),
+                        default=0)
+            value, ties = self.bookmarks.get(start, (None, 0))
+        if start == 0 or column is None or not isinstance(self.query, str):
+            return self.query, offset, None
+        key, descending = column
+        selection = [expression.strip()
+                     for expression in self.query.split(',')
+                     if expression.strip()]
+        selection.append((key, '<=' if descending else '>=', value))
+        return selection, offset - start + ties, value
+
+    def add_bookmark(self, offset: int, skip: int, value0: Any,
+                     table: Table) -> None:
+        """Remember the last row of a table read from row number offset.
+
+        skip and value0 are the offset and bookmark value returned
+        by :meth:`selection`."""
+        column = keyset_column(self.sort)
+        if column is None or not table.rows:
+            return
+        values = [row.dct.get(column[0]) for row in table.rows]
+        value = values[-1]
+        if value is None:
+            return
+        if (isinstance(value, str) and
+            convert_str_to_int_float_or_str(value) != value):
+            return
+        ties = len(values)
+        for n, x in enumerate(reversed(values)):
+            if x != value:
+                ties = n
+                break
+        if ties == len(values):
+            # The whole table has the same value.  Count the rows
+            # before the table too:
+            if value0 is None or value != value0:
+                return
+            ties += skip
+        with self.lock:
+            self.bookmarks[offset + len(values)] = (value, ties)
+
+    def get_table(self, key: Tuple) -> Optional[Table]:
+        with self.lock:
+            table = self.tables.get(key)
+            if table is not None:
+                self.tables.move_to_end(key)
+            return table
+
+    def add_table(self, key: Tuple, table: Table) -> None:
+        with self.lock:
+            self.tables[key] = table
+            if len(self.tables) > self.max_tables:
+                self.tables.popitem(last=False)
+
+
+class QueryCache:
+    """Least-recently-used cache of :class:`QueryResult` objects.
+
+    Results for a database are thrown away when the database has been
+    modified.  Rows are counted in a background thread."""
+    def __init__(self, size: int = 100, workers: int = 2):
+        self.size = size
+        self.workers = workers
+        self.results: 'OrderedDict[Tuple, QueryResult]' = OrderedDict()
+        # The count does not depend on the sort order:
+        self.counts: 'OrderedDict[Tuple, Tuple[float, Future]]' = (
+            OrderedDict())
+        self.lock = threading.Lock()
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self, db: Database, query: Any, sort: str) -> QueryResult:
+        mtime = modification_time(db)
+        key = (id(db), str(query))
+        with self.lock:
+            result = self.results.get(key + (sort,))
+            if result is None or result.mtime != mtime:
+                result = QueryResult(query, sort, mtime)
+                self.results[key + (sort,)] = result
+                if len(self.results) > self.size:
+                    self.results.popitem(last=False)
+            else:
+                self.results.move_to_end(key + (sort,))
+
+            if result.count is None:
+                count_mtime, count = self.counts.get(key, (None, None))
+                if count is None or count_mtime != mtime:
+                    if self.executor is None:
+                        self.executor = ThreadPoolExecutor(self.workers)
+                    count = self.executor.submit(db.count, query)
+                    self.counts[key] = (mtime, count)
+                    if len(self.counts) > self.size:
+                        self.counts.popitem(last=False)
+                result.count = count
+        return result
+
+
+cache = QueryCache()
+
+
 class Session:
     next_id = 1
     sessions: Dict[int, 'Session'] = {}
@@ -24,6 +183,9 @@ class Session:
 
         self.columns: Optional[List[str]] = None
         self.nrows: Optional[int] = None
+        # Is nrows the final count or a lower bound?
+        self.nrows_exact = False
+        self.counter: Optional[Future] = None
         self.page = 0
         self.limit = 25
         self.sort = ''
@@ -120,22 +282,59 @@ class Session:
     def create_table(self,
                      db: Database,
                      uid_key: str,
-                     keys: List[str]) -> Table:
-        query = self.query
-        if self.nrows is None:
+                     keys: List[str],
+                     count_timeout: float = 0.2) -> Table:
+        """Create table for current page.
+
+        Tables are cached (see :class:`QueryCache`).  If the rows have not
+        been counted after count_timeout seconds, nrows is set to a
+        lower bound and the counting continues in the background."""
+        assert self.columns is not None
+        offset = self.page * self.limit
+        result = cache.get(db, self.query, self.sort)
+        key = (offset, self.limit, tuple(self.columns), uid_key)
+        table = result.get_table(key)
+        if table is None:
+            table = Table(db, uid_key)
+            selection, skip, value = result.selection(offset)
             try:
-                self.nrows = db.count(query)
+                table.select(selection, self.columns, self.sort,
+                             self.limit, offset=skip)
+                if value is not None and len(table.rows) < self.limit:
+                    # Rows without a value for the sort column come last
+                    # and can only be found with OFFSET:
+                    table = Table(db, uid_key)
+                    table.select(self.query, self.columns, self.sort,
+                                 self.limit, offset=offset)
+                    value = None
             except (ValueError, KeyError) as e:
                 error = ', '.join(['Bad query'] + list(e.args))
                 flash(error)
-                query = 'id=0'  # this will return no rows
-                self.nrows = 0
+                # this will return no rows
+                table.select('id=0', self.columns, self.sort, self.limit, 0)
+                self.page = 0
+                offset = 0
+            else:
+                result.add_bookmark(offset, skip, value, table)
+                result.add_table(key, table)
+            table.format()
+
+        self.counter = result.count
+        nrows = offset + len(table.rows)
+        if nrows < offset + self.limit and (table.rows or offset == 0):
+            # Last page:
+            self.nrows = nrows
+            self.nrows_exact = True
+        else:
+            wait([self.counter], timeout=count_timeout)
+            if self.counter.done() and self.counter.exception() is None:
+                self.nrows = self.counter.result()
+                self.nrows_exact = True
+            else:
+                # There is at least one more row:
+                self.nrows = nrows + 1
+                self.nrows_exact = False
 
-        table = Table(db, uid_key)
-        table.select(query, self.columns, self.sort,
-                     self.limit, offset=self.page * self.limit)
-        table.format()
-        assert self.columns is not None
         table.addcolumns = sorted(column for column in
                                   all_columns + keys
                                   if column not in self.columns)
@@ -209,9 +209,8 @@ class DataConnection:
         This is a hacky way of obtaining the id and it only works on a
         sqlite database.
         """
-        con = self.c._connect()
-        last_id = self.c.get_last_id(con.cursor())
-        con.close()
+        with self.c.managed_connection() as con:
+            last_id = self.c.get_last_id(con.cursor())
         return last_id + 1
 
     def get_largest_in_db(self, var):
@@ -9,6 +9,7 @@ from ase.io import write, read
 from ase.geometry.cell import cell_to_cellpar
 from ase.data import covalent_radii
 from ase.ga import get_neighbor_list
+from ase.neighborlist import iter_neighbor_list
 
 
 def closest_distances_generator(atom_numbers, ratio_of_covalent_radii):
@@ -260,7 +261,8 @@ def get_rdf(atoms, rmax, nbins, distance_matrix=None,
     distance_matrix : numpy.array
         An array of distances between atoms, typically
         obtained by atoms.get_all_distances().
-        Default None meaning that it will be calculated.
+        Default None meaning that the pairs within rmax are found
+        with a chunked neighbor list.
 
     elements : list or tuple
         List of two atomic numbers. If elements is not None the partial
@@ -280,9 +282,6 @@ def get_rdf(atoms, rmax, nbins, distance_matrix=None,
             assert h > 2 * rmax, 'The cell is not large enough in ' \
                  'direction %d: %.3f < 2*rmax=%.3f' % (i, h, 2 * rmax)
 
-    dm = distance_matrix
-    if dm is None:
-        dm = atoms.get_all_distances(mic=True)
     rdf = np.zeros(nbins + 1)
     dr = float(rmax / nbins)
 
@@ -290,24 +289,19 @@ def get_rdf(atoms, rmax, nbins, distance_matrix=None,
         # Coefficients to use for normalization
         phi = len(atoms) / vol
         norm = 2.0 * math.pi * dr * phi * len(atoms)
-
-        for i in range(len(atoms)):
-            for j in range(i + 1, len(atoms)):
-                rij = dm[i][j]
-                index = int(math.ceil(rij / dr))
-                if index <= nbins:
-                    rdf[index] += 1
     else:
         i_indices = np.where(atoms.numbers == elements[0])[0]
         phi = len(i_indices) / vol
         norm = 4.0 * math.pi * dr * phi * len(atoms)
 
-        for i in i_indices:
-            for j in np.where(atoms.numbers == elements[1])[0]:
-                rij = dm[i][j]
-                index = int(math.ceil(rij / dr))
-                if index <= nbins:
-                    rdf[index] += 1
+    for i, j, rij in _iter_rdf_pairs(atoms, rmax, distance_matrix):
+        if elements is None:
+            mask = i < j
+        else:
+            mask = ((atoms.numbers[i] == elements[0]) &
+                    (atoms.numbers[j] == elements[1]))
+        index = np.ceil(rij[mask] / dr).astype(int)
+        rdf += np.bincount(index[index <= nbins], minlength=nbins + 1)
 
     dists = []
     for i in range(1, nbins + 1):
@@ -321,6 +315,23 @@ def get_rdf(atoms, rmax, nbins, distance_matrix=None,
     return rdf[1:], np.array(dists)
 
 
+def _iter_rdf_pairs(atoms, rmax, distance_matrix=None):
+    """Yield chunks of pairs (i, j, rij) contributing to the rdf.
+
+    Without a distance matrix the pairs are streamed from a chunked
+    neighbor list, so that the memory does not grow as the square of
+    the number of atoms."""
+    if distance_matrix is not None:
+        dm = np.asarray(distance_matrix)
+        i, j = np.indices(dm.shape).reshape(2, -1)
+        yield i, j, dm.ravel()
+        return
+
+    # Pairs exactly at rmax go into the last bin:
+    cutoff = rmax * (1 + 1e-10)
+    yield from iter_neighbor_list('ijd', atoms, cutoff)
+
+
 def get_nndist(atoms, distance_matrix):
     """Returns an estimate of the nearest neighbor bond distance
     in the supplied atoms object given the supplied distance_matrix.
@@ -27,15 +27,21 @@ def read_db(filename, index, **kwargs):
             yield row.toatoms()
 
 
+def count_db(filename):
+    return ase.db.connect(filename, serial=True).count()
+
+
 def write_db(filename, images, append=False, **kwargs):
     con = ase.db.connect(filename, serial=True, append=append, **kwargs)
-    for atoms in images:
-        con.write(atoms)
+    con.write_many(images)
 
 
 read_json = read_db
+count_json = count_db
 write_json = write_db
 read_postgresql = read_db
+count_postgresql = count_db
 write_postgresql = write_db
 read_mysql = read_db
+count_mysql = count_db
 write_mysql = write_db
@@ -10,6 +10,8 @@ Contributed by James Kermode <james.kermode@gmail.com>
 
 
 from itertools import islice
+import io
+import os
 import re
 import warnings
 
@@ -19,6 +21,7 @@ import numpy as np
 import numbers
 
 from ase.atoms import Atoms
+from ase.data import atomic_numbers
 from ase.calculators.calculator import all_properties, Calculator
 from ase.calculators.singlepoint import SinglePointCalculator
 from ase.spacegroup.spacegroup import Spacegroup
@@ -316,6 +319,9 @@ def key_val_dict_to_str(dct, sep=' '):
     return string.strip()
 
 
+BOOLEANS = {'T': True, 'F': False, 'True': True, 'False': False}
+
+
 def parse_properties(prop_str):
     """
     Parse extended XYZ properties format string
@@ -368,6 +374,45 @@ def parse_properties(prop_str):
     return properties, properties_list, dtype, converters
 
 
+def _parse_atom_lines(lines, properties, names, dtype):
+    """Convert all atom lines at once.
+
+    Works when all lines have exactly one value per column described by
+    the properties from parse_properties().  Returns dict of arrays or
+    None if that is not the case."""
+    ncols = len(dtype.names)
+    rows = [line.split() for line in lines]
+    if any(len(row) != ncols for row in rows):
+        return None
+    words = [word for row in rows for word in row]
+
+    arrays = {}
+    c = 0
+    for name in names:
+        ase_name, cols = properties[name]
+        columns = [words[c + i::ncols] for i in range(cols)]
+        c += cols
+        fieldtype = dtype[name if cols == 1 else name + '0']
+        if fieldtype.kind == 'b':
+            columns = [[BOOLEANS.get(word) for word in column]
+                       for column in columns]
+            if any(None in column for column in columns):
+                return None
+        try:
+            value = np.array(columns, fieldtype)
+        except ValueError:
+            return None
+        arrays[ase_name] = value[0] if cols == 1 else value.T
+    return arrays
+
+
+def symbols2numbers(symbols):
+    """Convert (lower or upper case) chemical symbols to atomic numbers."""
+    lookup = {symbol: atomic_numbers[symbol.capitalize()]
+              for symbol in set(symbols)}
+    return np.array([lookup[symbol] for symbol in symbols], int)
+
+
 def _read_xyz_frame(lines, natoms, properties_parser=key_val_str_to_dict,
                     nvec=0):
     # comment line
@@ -404,22 +449,40 @@ def _read_xyz_frame(lines, natoms, properties_parser=key_val_str_to_dict,
     properties, names, dtype, convs = parse_properties(info['Properties'])
     del info['Properties']
 
-    data = []
+    atom_lines = []
     for ln in range(natoms):
         try:
-            line = next(lines)
+            atom_lines.append(next(lines))
         except StopIteration:
             raise XYZError('ase.io.extxyz: Frame has {} atoms, expected {}'
-                           .format(len(data), natoms))
-        vals = line.split()
-        row = tuple([conv(val) for conv, val in zip(convs, vals)])
-        data.append(row)
+                           .format(len(atom_lines), natoms))
+
+    # Fast path: convert whole columns at once
+    arrays = _parse_atom_lines(atom_lines, properties, names, dtype)
+    if arrays is None:
+        # Some lines have extra or missing columns or the values need
+        # the more forgiving Python converters:
+        data = []
+        for line in atom_lines:
+            vals = line.split()
+            row = tuple([conv(val) for conv, val in zip(convs, vals)])
+            data.append(row)
 
-    try:
-        data = np.array(data, dtype)
-    except TypeError:
-        raise XYZError('Badly formatted data '
-                       'or end of file reached before end of frame')
+        try:
+            data = np.array(data, dtype)
+        except TypeError:
+            raise XYZError('Badly formatted data '
+                           'or end of file reached before end of frame')
+
+        arrays = {}
+        for name in names:
+            ase_name, cols = properties[name]
+            if cols == 1:
+                value = data[name]
+            else:
+                value = np.vstack([data[name + str(c)]
+                                   for c in range(cols)]).T
+            arrays[ase_name] = value
 
     # Read VEC entries if present
     if nvec > 0:
@@ -449,25 +512,14 @@ def _read_xyz_frame(lines, natoms, properties_parser=key_val_str_to_dict,
             raise XYZError('Problem with number of cell vectors')
         pbc = tuple(pbc)
 
-    arrays = {}
-    for name in names:
-        ase_name, cols = properties[name]
-        if cols == 1:
-            value = data[name]
-        else:
-            value = np.vstack([data[name + str(c)]
-                               for c in range(cols)]).T
-        arrays[ase_name] = value
-
-    symbols = None
+    numbers = None
     if 'symbols' in arrays:
-        symbols = [s.capitalize() for s in arrays['symbols']]
+        numbers = symbols2numbers(arrays['symbols'])
         del arrays['symbols']
 
-    numbers = None
     duplicate_numbers = None
     if 'numbers' in arrays:
-        if symbols is None:
+        if numbers is None:
             numbers = arrays['numbers']
         else:
             duplicate_numbers = arrays['numbers']
@@ -483,8 +535,7 @@ def _read_xyz_frame(lines, natoms, properties_parser=key_val_str_to_dict,
         positions = arrays['positions']
         del arrays['positions']
 
-    atoms = Atoms(symbols=symbols,
-                  positions=positions,
+    atoms = Atoms(positions=positions,
                   numbers=numbers,
                   charges=charges,
                   cell=cell,
@@ -525,10 +576,10 @@ def _read_xyz_frame(lines, natoms, properties_parser=key_val_str_to_dict,
                                    stress[0, 2],
                                    stress[0, 1]])
                 results[key] = stress
-    for key in list(atoms.arrays.keys()):
+    for key, value in atoms.arrays.items():
         if (key in per_atom_properties and len(value.shape) >= 1
             and value.shape[0] == len(atoms)):
-            results[key] = atoms.arrays[key]
+            results[key] = value
     if results != {}:
         calculator = SinglePointCalculator(atoms, **results)
         atoms.calc = calculator
@@ -600,7 +651,203 @@ class ImageIterator:
 iread_xyz = ImageIterator(ixyzchunks)
 
 
-def read_xyz(fileobj, index=-1, properties_parser=key_val_str_to_dict):
+HEADER_OR_BLANK_LINE = re.compile(rb'^[ \t\r]*(\d*)[ \t\r]*$', re.M)
+VEC_LINE = re.compile(rb'^[ \t]*VEC', re.M)
+
+
+def _scan_chunk(args):
+    """Find lines that can start a frame in part of a file.
+
+    Returns the number of lines and lists of (line number, offset, number
+    of atoms) for lines with a single integer, of line numbers of blank
+    lines and of line numbers of VEC lines.  Line numbers are relative to
+    the start of the chunk."""
+    filename, start, end = args
+    with open(filename, 'rb') as fd:
+        fd.seek(start)
+        chunk = fd.read(end - start)
+
+    headers = []
+    blanks = []
+    pos = 0
+    line = 0
+    for match in HEADER_OR_BLANK_LINE.finditer(chunk):
+        line += chunk.count(b'\n', pos, match.start())
+        pos = match.start()
+        if match.group(1):
+            headers.append((line, start + pos, int(match.group(1))))
+        elif pos < len(chunk):
+            blanks.append(line)
+
+    vecs = []
+    pos = 0
+    line = 0
+    for match in VEC_LINE.finditer(chunk):
+        line += chunk.count(b'\n', pos, match.start())
+        pos = match.start()
+        vecs.append(line)
+
+    nlines = chunk.count(b'\n')
+    if chunk and not chunk.endswith(b'\n'):
+        nlines += 1
+    return nlines, headers, blanks, vecs
+
+
+def frame_index_filename(filename):
+    """Name of file storing the frame index of an extxyz file."""
+    return filename + '.idx'
+
+
+def build_frame_index(filename, workers=None, chunk_size=2**26, save=True):
+    """Find the byte offsets of all frames of an extxyz file.
+
+    The file is split into chunks of about chunk_size bytes, which are
+    scanned for frame headers by a pool of workers processes if workers
+    is given.  The frames are then found by following the numbers of
+    atoms from the first line.
+
+    If save is True, the index is written to the file returned by
+    :func:`frame_index_filename` so that :func:`read_xyz` can find
+    frames without reading the whole file.  It is used as long as the
+    size and modification time of the file do not change.
+
+    Returns arrays of offsets, numbers of atoms and numbers of VEC lines
+    of the frames."""
+    stat = os.stat(filename)
+    size = stat.st_size
+
+    # Split at line boundaries:
+    boundaries = [0]
+    with open(filename, 'rb') as fd:
+        for start in range(chunk_size, size, chunk_size):
+            if start <= boundaries[-1]:
+                continue
+            fd.seek(start - 1)
+            fd.readline()
+            boundaries.append(fd.tell())
+    if boundaries[-1] < size:
+        boundaries.append(size)
+    chunks = [(filename, start, end)
+              for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+    if workers is None:
+        results = map(_scan_chunk, chunks)
+        offsets, natoms, nvec = _find_frames(results)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers) as executor:
+            results = executor.map(_scan_chunk, chunks)
+            offsets, natoms, nvec = _find_frames(results)
+
+    if save:
+        _write_frame_index(filename, stat, offsets, natoms, nvec)
+    return offsets, natoms, nvec
+
+
+def _find_frames(results):
+    headers = {}
+    blanks = set()
+    vecs = set()
+    nlines = 0
+    for n, h, b, v in results:
+        for line, offset, natoms in h:
+            headers[nlines + line] = (offset, natoms)
+        blanks.update(nlines + line for line in b)
+        vecs.update(nlines + line for line in v)
+        nlines += n
+
+    frames = []
+    line = 0
+    while line < nlines and line not in blanks:
+        if line not in headers:
+            raise XYZError('ase.io.extxyz: Expected xyz header in line {}'
+                           .format(line + 1))
+        offset, natoms = headers[line]
+        line += natoms + 2
+        if line > nlines:
+            raise XYZError('Incomplete XYZ chunk')
+        nvec = 0
+        while line in vecs:
+            nvec += 1
+            line += 1
+            if nvec > 3:
+                raise XYZError('ase.io.extxyz: More than 3 VECX entries')
+        frames.append((offset, natoms, nvec))
+
+    frames = np.array(frames, dtype=np.int64).reshape((-1, 3))
+    return frames[:, 0].copy(), frames[:, 1].copy(), frames[:, 2].copy()
+
+
+def _write_frame_index(filename, stat, offsets, natoms, nvec):
+    indexname = frame_index_filename(filename)
+    tmpname = '{}.{}.tmp'.format(indexname, os.getpid())
+    try:
+        with open(tmpname, 'wb') as fd:
+            np.savez(fd, offsets=offsets, natoms=natoms, nvec=nvec,
+                     size=stat.st_size, mtime=stat.st_mtime_ns)
+        os.replace(tmpname, indexname)
+    except OSError:
+        # Read-only directory or similar.  Just don't store the index.
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
+
+
+def read_frame_index(filename):
+    """Read frame index written by :func:`build_frame_index`.
+
+    Returns None if there is no index or if it is out of date."""
+    indexname = frame_index_filename(filename)
+    try:
+        stat = os.stat(filename)
+        with np.load(indexname) as data:
+            if (data['size'] != stat.st_size or
+                data['mtime'] != stat.st_mtime_ns):
+                return None
+            return data['offsets'], data['natoms'], data['nvec']
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def count_extxyz(filename):
+    """Number of frames in extxyz file.
+
+    The frame index is built and stored if needed, so that the frames
+    can afterwards be read independently of each other."""
+    from ase.io.formats import get_compression, open_with_compression
+    if get_compression(filename)[1] is not None:
+        nframes = 0
+        with open_with_compression(filename) as fd:
+            for line in fd:
+                line = line.strip()
+                if not line:
+                    break
+                if line.startswith('VEC'):
+                    continue
+                for _ in range(int(line) + 1):
+                    next(fd)
+                nframes += 1
+        return nframes
+    frame_index = read_frame_index(filename)
+    if frame_index is None:
+        frame_index = build_frame_index(filename)
+    return len(frame_index[0])
+
+
+def _plain_filename(fileobj):
+    """Name of uncompressed file on disk behind fileobj or None."""
+    if isinstance(fileobj, str):
+        return fileobj
+    buffer = getattr(fileobj, 'buffer', fileobj)
+    if not isinstance(getattr(buffer, 'raw', None), io.FileIO):
+        return None
+    name = getattr(fileobj, 'name', None)
+    if not isinstance(name, str) or not os.path.isfile(name):
+        return None
+    return name
+
+
+def read_xyz(fileobj, index=-1, properties_parser=key_val_str_to_dict,
+             frame_index=None, workers=None):
     r"""
     Read from a file in Extended XYZ format
 
@@ -610,6 +857,12 @@ def read_xyz(fileobj, index=-1, properties_parser=key_val_str_to_dict):
     deal with most use cases, ``extxyz.key_val_str_to_dict_regex`` is slightly
     faster but has fewer features.
 
+    Frames are found with the index stored next to the file by
+    :func:`build_frame_index`, if it exists and is up to date, so that only
+    the frames requested are read.  Use frame_index=True to build and store
+    the index if needed (with workers processes) and frame_index=False to
+    ignore it and scan the file.
+
     Extended XYZ format is an enhanced version of the `basic XYZ format
     <http://en.wikipedia.org/wiki/XYZ_file_format>`_ that allows extra
     columns to be present in the file for additonal per-atom properties as
@@ -719,12 +972,42 @@ def read_xyz(fileobj, index=-1, properties_parser=key_val_str_to_dict):
     if not isinstance(index, int) and not isinstance(index, slice):
         raise TypeError('Index argument is neither slice nor integer!')
 
+    frames = None
+    filename = None
+    if frame_index is not False:
+        filename = _plain_filename(fileobj)
+    if filename is not None:
+        frames = read_frame_index(filename)
+        if frames is None and frame_index:
+            frames = build_frame_index(filename, workers)
+
+    if frames is not None:
+        offsets, natoms, nvec = frames
+        for index in index2range(index, len(offsets)):
+            fileobj.seek(int(offsets[index]))
+            # check for consistency with frame index table
+            line = fileobj.readline()
+            if line.strip() != str(natoms[index]):
+                # The file was changed without changing size and mtime
+                os.remove(frame_index_filename(filename))
+                raise XYZError('ase.io.extxyz: Frame index {} is out of '
+                               'date and has been removed; please read '
+                               'the file again'
+                               .format(frame_index_filename(filename)))
+            yield _read_xyz_frame(fileobj, int(natoms[index]),
+                                  properties_parser, int(nvec[index]))
+        return
+
     # If possible, build a partial index up to the last frame required
     last_frame = None
     if isinstance(index, int) and index >= 0:
         last_frame = index
     elif isinstance(index, slice):
-        if index.stop is not None and index.stop >= 0:
+        if (index.step or 1) < 0:
+            # Reversed slice: the first frame read is the last one needed
+            if index.start is not None and index.start >= 0:
+                last_frame = index.start
+        elif index.stop is not None and index.stop >= 0:
             last_frame = index.stop
 
     # scan through file to find where the frames start
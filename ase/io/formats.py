@@ -110,6 +110,14 @@ class IOFormat:
     def _writefunc(self):
         return getattr(self.module, 'write_' + self._formatname, None)
 
+    def _countfunc(self):
+        return getattr(self.module, 'count_' + self._formatname, None)
+
+    @property
+    def can_count(self) -> bool:
+        """Whether the number of images in a file can be found quickly."""
+        return self._countfunc() is not None
+
     @property
     def read(self):
         if not self.can_read:
@@ -684,12 +692,20 @@ def iread(
         format: str = None,
         parallel: bool = True,
         do_not_split_by_at_sign: bool = False,
+        workers: int = None,
         **kwargs
 ) -> Iterable[Atoms]:
     """Iterator for reading Atoms objects from file.
 
     Works as the `read` function, but yields one Atoms object at a time
-    instead of all at once."""
+    instead of all at once.
+
+    For formats where the number of images can be found without parsing
+    them (extxyz, traj, db, json and vasp-xdatcar), the images can be
+    parsed by a pool of *workers* processes.  The file is split into
+    chunks of consecutive images that are read independently, and the
+    images are still yielded in order.  This requires a filename and
+    can not be combined with MPI parallelization."""
 
     if isinstance(filename, PurePath):
         filename = str(filename)
@@ -708,11 +724,61 @@ def iread(
     format = format or filetype(filename, read=isinstance(filename, str))
     io = get_ioformat(format)
 
+    if workers is not None:
+        yield from _iread_workers(filename, index, format, io, workers,
+                                  **kwargs)
+        return
+
     for atoms in _iread(filename, index, format, io, parallel=parallel,
                         **kwargs):
         yield atoms
 
 
+def _iread_workers(filename, index, format, io, workers, **kwargs):
+    from concurrent.futures import ProcessPoolExecutor
+    from ase.parallel import world
+
+    if world.size > 1:
+        raise RuntimeError('Process pools can not be used in MPI runs')
+    if not isinstance(filename, str):
+        raise ValueError('Reading with workers requires a filename')
+    if not isinstance(index, slice):
+        raise ValueError('Reading with workers requires a slice, not {!r}'
+                         .format(index))
+    if not io.can_count:
+        raise ValueError('Can not read {}-format with workers'
+                         .format(format))
+
+    indices = range(io._countfunc()(filename))[index]
+    # A few chunks per worker to balance the load:
+    chunk_size = max(1, -(-len(indices) // (4 * workers)))
+    chunks = [indices[i:i + chunk_size]
+              for i in range(0, len(indices), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Submit a limited number of chunks ahead of the one being
+        # yielded so that memory use does not grow with the file size:
+        futures = []
+        try:
+            for chunk in chunks:
+                futures.append(executor.submit(_read_chunk, filename, chunk,
+                                               format, kwargs))
+                if len(futures) > 2 * workers:
+                    yield from futures.pop(0).result()
+            while futures:
+                yield from futures.pop(0).result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _read_chunk(filename, chunk, format, kwargs):
+    stop = chunk.stop if chunk.stop >= 0 else None
+    return list(iread(filename, slice(chunk.start, stop, chunk.step),
+                      format, parallel=False, do_not_split_by_at_sign=True,
+                      **kwargs))
+
+
 @parallel_generator
 def _iread(filename, index, format, io, parallel=None, full_output=False,
            **kwargs):
@@ -1,3 +1,4 @@
+import time
 import warnings
 from typing import Tuple
 
@@ -8,6 +9,7 @@ from ase.calculators.singlepoint import SinglePointCalculator, all_properties
 from ase.constraints import dict2constraint
 from ase.calculators.calculator import PropertyNotImplementedError
 from ase.atoms import Atoms
+from ase.io import ulm
 from ase.io.jsonio import encode, decode
 from ase.io.pickletrajectory import PickleTrajectory
 from ase.parallel import world
@@ -15,7 +17,9 @@ from ase.parallel import world
 __all__ = ['Trajectory', 'PickleTrajectory']
 
 
-def Trajectory(filename, mode='r', atoms=None, properties=None, master=None):
+def Trajectory(filename, mode='r', atoms=None, properties=None, master=None,
+               memmap=False, buffer_size=1, flush_interval=None,
+               double=True, compression=None, keyframe_interval=10):
     """A Trajectory can be created in read, write or append mode.
 
     Parameters:
@@ -41,18 +45,40 @@ def Trajectory(filename, mode='r', atoms=None, properties=None, master=None):
         Controls which process does the actual writing. The
         default is that process number 0 does this.  If this
         argument is given, processes where it is True will write.
-
-    The atoms, properties and master arguments are ignores in read mode.
+    memmap: bool
+        Memory-map the file in read mode.  Arrays like positions and
+        forces are then read from the shared map without system calls.
+    buffer_size: int
+        Number of images to keep in memory before writing them to the
+        file in one go in write and append mode.
+    flush_interval: float
+        Also write buffered images if the oldest is more than this
+        number of seconds old.
+    double: bool
+        Store floating point arrays in double precision.  Use False
+        to store them in single precision.
+    compression: str
+        Compress arrays with 'zlib' or 'lzma'.
+    keyframe_interval: int
+        With compression, positions are stored as the difference to
+        those of a keyframe written every keyframe_interval images.
+
+    Only the memmap argument is used in read mode.
     """
     if mode == 'r':
-        return TrajectoryReader(filename)
-    return TrajectoryWriter(filename, mode, atoms, properties, master=master)
+        return TrajectoryReader(filename, memmap=memmap)
+    return TrajectoryWriter(filename, mode, atoms, properties, master=master,
+                            buffer_size=buffer_size,
+                            flush_interval=flush_interval,
+                            double=double, compression=compression,
+                            keyframe_interval=keyframe_interval)
 
 
 class TrajectoryWriter:
     """Writes Atoms objects to a .traj file."""
     def __init__(self, filename, mode='w', atoms=None, properties=None,
-                 extra=[], master=None):
+                 extra=[], master=None, buffer_size=1, flush_interval=None,
+                 double=True, compression=None, keyframe_interval=10):
         """A Trajectory writer, in write or append mode.
 
         Parameters:
@@ -78,12 +104,46 @@ class TrajectoryWriter:
             Controls which process does the actual writing. The
             default is that process number 0 does this.  If this
             argument is given, processes where it is True will write.
+        buffer_size: int
+            Number of images to keep in memory.  When the buffer is
+            full, the images are written to the file with one write
+            and one update of the index of the file.  The default is to
+            write every image immediately.  Buffered images are written
+            by :meth:`flush` and when the trajectory is closed, and
+            readers only see images that have been written.
+        flush_interval: float
+            Write buffered images once the oldest of them is more than
+            this number of seconds old, even if the buffer is not full.
+            The time is checked when an image is written.
+        double: bool
+            Store positions, momenta, forces and other floating point
+            arrays in double precision (default).  Use False to store
+            them in single precision.  They are converted back to double
+            precision when read.
+        compression: str
+            Compress arrays with 'zlib' or 'lzma'.  Compressed files
+            can not be read by older versions of ASE.
+        keyframe_interval: int
+            With compression, the positions of every keyframe_interval'th
+            image are stored as they are and the positions of the
+            images in between as the difference to those, which
+            compresses better.  Reading an image needs at most two
+            arrays to be decompressed.
         """
         if master is None:
             master = (world.rank == 0)
         self.master = master
         self.atoms = atoms
         self.properties = properties
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.nbuffered = 0
+        self.buffer_time = None
+        self.double = double
+        self.compression = compression
+        self.keyframe_interval = keyframe_interval
+        self.keyframe = None  # (entry, positions) of last keyframe
+        self.nframes_since_keyframe = 0
 
         self.description = {}
         self.header_data = None
@@ -105,7 +165,8 @@ class TrajectoryWriter:
         if mode not in 'aw':
             raise ValueError('mode must be "w" or "a".')
         if self.master:
-            self.backend = ulm.open(filename, mode, tag='ASE-Trajectory')
+            self.backend = ulm.open(filename, mode, tag='ASE-Trajectory',
+                                    buffered=self.buffer_size > 1)
             if len(self.backend) > 0 and mode == 'a':
                 with Trajectory(filename) as traj:
                     atoms = traj[0]
@@ -151,7 +212,20 @@ class TrajectoryWriter:
                                                           header_data)
             write_header = self.multiple_headers
 
-        write_atoms(b, atoms, write_header=write_header)
+        delta = None
+        if (self.keyframe is not None and not write_header and
+            self.nframes_since_keyframe < self.keyframe_interval and
+            len(self.keyframe[1]) == len(atoms)):
+            delta = self.keyframe
+            self.nframes_since_keyframe += 1
+
+        positions = write_atoms(b, atoms, write_header=write_header,
+                                double=self.double,
+                                compression=self.compression, delta=delta)
+
+        if self.compression is not None and delta is None and self.master:
+            self.keyframe = (b.data['positions.'], positions)
+            self.nframes_since_keyframe = 1
 
         calc = atoms.calc
 
@@ -184,8 +258,10 @@ class TrajectoryWriter:
                             x = None
                 if x is not None:
                     if prop in ['stress', 'dipole']:
-                        x = x.tolist()
-                    c.write(prop, x)
+                        c.write(prop, x.tolist())
+                    else:
+                        write_array(c, prop, x, self.double,
+                                    self.compression)
 
         info = {}
         for key, value in atoms.info.items():
@@ -200,6 +276,19 @@ class TrajectoryWriter:
 
         b.sync()
 
+        if self.nbuffered == 0:
+            self.buffer_time = time.time()
+        self.nbuffered += 1
+        if (self.nbuffered >= self.buffer_size or
+            (self.flush_interval is not None and
+             time.time() - self.buffer_time > self.flush_interval)):
+            self.flush()
+
+    def flush(self):
+        """Write buffered images to the file."""
+        self.backend.flush()
+        self.nbuffered = 0
+
     def close(self):
         """Close the trajectory file."""
         self.backend.close()
@@ -210,17 +299,18 @@ class TrajectoryWriter:
 
 class TrajectoryReader:
     """Reads Atoms objects from a .traj file."""
-    def __init__(self, filename):
+    def __init__(self, filename, memmap=False):
         """A Trajectory in read mode.
 
-        The filename traditionally ends in .traj.
+        The filename traditionally ends in .traj.  With memmap=True the
+        file is memory-mapped (see :class:`ase.io.ulm.Reader`).
         """
 
         self.numbers = None
         self.pbc = None
         self.masses = None
 
-        self._open(filename)
+        self._open(filename, memmap)
 
     def __enter__(self):
         return self
@@ -228,9 +318,9 @@ class TrajectoryReader:
     def __exit__(self, exc_type, exc_value, tb):
         self.close()
 
-    def _open(self, filename):
+    def _open(self, filename, memmap=False):
         import ase.io.ulm as ulm
-        self.backend = ulm.open(filename, 'r')
+        self.backend = ulm.open(filename, 'r', memmap=memmap)
         self._read_header()
 
     def _read_header(self):
@@ -270,7 +360,7 @@ class TrajectoryReader:
             c = b.calculator
             for prop in all_properties:
                 if prop in c:
-                    results[prop] = c.get(prop)
+                    results[prop] = as_double(c.get(prop))
                     implemented_properties.append(prop)
             calc = SinglePointCalculator(atoms, **results)
             calc.name = b.calculator.name
@@ -289,6 +379,87 @@ class TrajectoryReader:
         for i in range(len(self)):
             yield self[i]
 
+    def read_array(self, name, frames=slice(None), out=None):
+        """Read one quantity from many frames into a single array.
+
+        No Atoms objects are created.  The arrays are copied directly
+        from the file, through a memory map of the file if possible.
+
+        name: str
+            Name of the quantity: 'positions', 'cell', 'momenta', ... or
+            a calculated property like 'energy', 'forces' or 'stress'.
+            Names are first looked up in the frame and then in its
+            calculator; 'calculator.magmoms' selects the calculated
+            magnetic moments explicitly.
+        frames: slice or list of int
+            Frames to read.  Default is all frames.
+        out: ndarray
+            Array of shape (nframes,) + shape of the quantity to store
+            the result in, for example an ``np.memmap``.  A new array is
+            allocated if not given.
+
+        The quantity must have the same shape in all the frames.
+        Arrays stored in single precision are returned as such.
+        Example::
+
+            with Trajectory('md.traj') as traj:
+                positions = traj.read_array('positions', slice(0, None, 10))
+                energies = traj.read_array('energy')
+        """
+        if isinstance(frames, slice):
+            indices = range(len(self))[frames]
+        else:
+            indices = [range(len(self))[i] for i in frames]
+
+        backend = self.backend
+        if backend._memmap is None and ulm.file_has_fileno(backend._fd):
+            backend = ulm.Reader(backend._fd, memmap=True)
+
+        for n, i in enumerate(indices):
+            value = self._find_quantity(backend[i], name)
+
+            if out is None:
+                if isinstance(value, ulm.NDArrayReader):
+                    dtype = value.dtype
+                else:
+                    dtype = np.asarray(value).dtype
+                out = np.empty((len(indices),) + np.shape(value), dtype)
+            if out.shape[1:] != np.shape(value):
+                raise ValueError(
+                    'Shape of {} changes from {} to {} in frame {}'
+                    .format(name, out.shape[1:], np.shape(value), i))
+
+            if isinstance(value, ulm.NDArrayReader):
+                value = value.read()
+            out[n] = value
+
+        if out is None:
+            out = np.empty(0)
+        return out
+
+    def _find_quantity(self, b, name):
+        """Return value or NDArrayReader for name in frame b."""
+        *path, key = name.split('.')
+        for child in path:
+            b = b.get(child)
+            if b is None:
+                raise KeyError(name)
+
+        if key in b:
+            value = b._data[key]
+        elif not path and key in ['numbers', 'pbc', 'masses']:
+            # header info was not written because it is the same:
+            value = {'numbers': self.numbers, 'pbc': self.pbc,
+                     'masses': self.masses}[key]
+        elif not path and 'calculator' in b and key in b.calculator:
+            value = b.calculator._data[key]
+        else:
+            raise KeyError(name)
+
+        if value is None:
+            raise KeyError(name)
+        return value
+
 
 class SlicedTrajectory:
     """Wrapper to return a slice from a trajectory without loading
@@ -311,6 +482,13 @@ class SlicedTrajectory:
         return len(self.map)
 
 
+def as_double(value):
+    """Convert array stored in single precision to double precision."""
+    if isinstance(value, np.ndarray) and value.dtype == np.float32:
+        return value.astype(float)
+    return value
+
+
 def get_header_data(atoms):
     return {'pbc': atoms.pbc.copy(),
             'numbers': atoms.get_atomic_numbers(),
@@ -320,10 +498,10 @@ def get_header_data(atoms):
 
 def headers_equal(headers1, headers2):
     assert len(headers1) == len(headers2)
-    eq = True
     for key in headers1:
-        eq &= np.array_equal(headers1[key], headers2[key])
-    return eq
+        if not np.array_equal(headers1[key], headers2[key]):
+            return False
+    return True
 
 
 class VersionTooOldError(Exception):
@@ -375,7 +553,31 @@ def read_atoms(backend,
     return atoms
 
 
-def write_atoms(backend, atoms, write_header=True):
+def write_array(backend, name, a, double=True, compression=None,
+                delta=None):
+    """Write array, possibly in single precision and compressed.
+
+    See :meth:`ase.io.ulm.Writer.add_array` for compression and delta.
+    Returns the values as written."""
+    a = np.asarray(a)
+    if not double and a.dtype == np.float64:
+        a = a.astype(np.float32)
+    if compression is None or a.ndim == 0:
+        backend.write(name, a)
+    else:
+        backend.add_array(name, a.shape, a.dtype, compression, delta)
+        backend.fill(a)
+    return a
+
+
+def write_atoms(backend, atoms, write_header=True, double=True,
+                compression=None, delta=None):
+    """Write atoms to backend.
+
+    Positions and other arrays are written with :func:`write_array`.
+    The positions are stored as the difference to those of delta, a
+    tuple (entry, positions) of an earlier image, if given.  Returns
+    the positions as written."""
     b = backend
 
     if write_header:
@@ -388,17 +590,21 @@ def write_atoms(backend, atoms, write_header=True):
         if atoms.has('masses'):
             b.write(masses=atoms.get_masses())
 
-    b.write(positions=atoms.get_positions(),
-            cell=atoms.get_cell().tolist())
+    positions = write_array(b, 'positions', atoms.get_positions(), double,
+                            compression, delta)
+    b.write(cell=atoms.get_cell().tolist())
 
     if atoms.has('tags'):
         b.write(tags=atoms.get_tags())
     if atoms.has('momenta'):
-        b.write(momenta=atoms.get_momenta())
+        write_array(b, 'momenta', atoms.get_momenta(), double, compression)
     if atoms.has('initial_magmoms'):
-        b.write(magmoms=atoms.get_initial_magnetic_moments())
+        write_array(b, 'magmoms', atoms.get_initial_magnetic_moments(),
+                    double, compression)
     if atoms.has('initial_charges'):
-        b.write(charges=atoms.get_initial_charges())
+        write_array(b, 'charges', atoms.get_initial_charges(), double,
+                    compression)
+    return positions
 
 
 def read_traj(fd, index):
@@ -407,6 +613,12 @@ def read_traj(fd, index):
         yield trj[i]
 
 
+def count_traj(filename):
+    """Number of images in trajectory file."""
+    with TrajectoryReader(filename) as trj:
+        return len(trj)
+
+
 def write_traj(fd, images):
     """Write image(s) to trajectory."""
     trj = TrajectoryWriter(fd)
@@ -109,6 +109,31 @@ argument:
 >>> r.close()
 
 
+Compressed arrays
+-----------------
+
+Arrays can be compressed with zlib or lzma.  A compressed array is
+stored as ``{'compressed': [shape, dtype, offset, nbytes, compression]}``
+instead of ``{'ndarray': [shape, dtype, offset]}``.  Before compression,
+the bytes are shuffled so that the first bytes of all numbers come
+first, then the second bytes and so on.  Numbers that vary slowly can
+also be stored as the difference to an earlier array, which is done on
+the bit patterns so that no precision is lost.  The item then also has
+a ``'delta'`` entry describing that array:
+
+>>> with ulm.open('y.ulm', 'w') as w:
+...     a = np.linspace(0, 1, 1000)
+...     w.add_array('a', a.shape, compression='zlib')
+...     w.fill(a)
+...     entry = w.data['a.']
+...     w.sync()
+...     w.add_array('a', a.shape, compression='zlib', delta=(entry, a))
+...     w.fill(a + 1e-6)
+>>> with ulm.open('y.ulm', index=1) as r:
+...     print(r.a[-1])
+1.000001
+
+
 Versions
 --------
 
@@ -120,8 +145,10 @@ Versions
 3) Changed magic string from "AFFormat" to "- of Ulm".
 """
 
+import lzma
 import os
 import numbers
+import zlib
 from pathlib import Path
 from typing import Union, Set
 
@@ -134,8 +161,11 @@ from ase.utils import plural
 VERSION = 3
 N1 = 42  # block size - max number of items: 1, N1, N1*N1, N1*N1*N1, ...
 
+compressors = {'zlib': zlib, 'lzma': lzma}
 
-def open(filename, mode='r', index=None, tag=None):
+
+def open(filename, mode='r', index=None, tag=None, memmap=False,
+         buffered=False):
     """Open ulm-file.
 
     filename: str
@@ -147,17 +177,25 @@ def open(filename, mode='r', index=None, tag=None):
         Index of item to read.  Defaults to 0.
     tag: str
         Magic ID string.
+    memmap: bool
+        Memory-map the file in read mode.  Arrays are then returned as
+        read-only views into the map instead of being read into new
+        arrays (see :class:`Reader`).
+    buffered: bool
+        Keep items in memory in write and append mode until
+        :meth:`Writer.flush` or :meth:`Writer.close` is called (see
+        :class:`Writer`).
 
     Returns a :class:`Reader` or a :class:`Writer` object.  May raise
     :class:`InvalidULMFileError`.
     """
     if mode == 'r':
         assert tag is None
-        return Reader(filename, index or 0)
+        return Reader(filename, index or 0, memmap=memmap)
     if mode not in 'wa':
         2 / 0
     assert index is None
-    return Writer(filename, mode, tag or '')
+    return Writer(filename, mode, tag or '', buffered=buffered)
 
 
 ulmopen = open
@@ -183,6 +221,28 @@ def writeint(fd, n, pos=None):
     fd.write(a.tobytes())
 
 
+def bits(a):
+    """View of array as unsigned integers of the same size.
+
+    Differences between these are exact, also for floats."""
+    a = np.ascontiguousarray(a).ravel()
+    if a.dtype.kind == 'c':
+        a = a.view(a.real.dtype)
+    return a.view('u{}'.format(a.itemsize))
+
+
+def shuffle(a):
+    """Bytes of array with the first bytes of all numbers first."""
+    a = bits(a)
+    return a.view(np.uint8).reshape((a.size, a.itemsize)).T.tobytes()
+
+
+def unshuffle(data, itemsize):
+    """Inverse of shuffle().  Returns array of bytes."""
+    a = np.frombuffer(data, np.uint8).reshape((itemsize, -1))
+    return np.ascontiguousarray(a.T).ravel()
+
+
 def readints(fd, n):
     a = np.frombuffer(fd.read(int(n * 8)), dtype=np.int64, count=n)
     if not np.little_endian:
@@ -209,8 +269,35 @@ def file_has_fileno(fd):
     return True
 
 
+class WriteBuffer:
+    """File-like object collecting everything written in memory.
+
+    tell() returns the position in the file *fd* where the data will
+    end up when flush() writes it in one go."""
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.pos = fd.tell()
+        self.chunks = []
+        self.size = 0
+
+    def tell(self):
+        return self.pos + self.size
+
+    def write(self, data):
+        self.chunks.append(data)
+        self.size += len(data)
+
+    def flush(self):
+        self.fd.seek(self.pos)
+        self.fd.write(b''.join(self.chunks))
+        self.pos += self.size
+        self.chunks = []
+        self.size = 0
+
+
 class Writer:
-    def __init__(self, fd, mode='w', tag='', data=None):
+    def __init__(self, fd, mode='w', tag='', data=None, buffered=False):
         """Create writer object.
 
         fd: str
@@ -220,6 +307,11 @@ class Writer:
             existing one) and 'a' for appending to an existing file.
         tag: str
             Magic ID string.
+        buffered: bool
+            Collect items in memory instead of writing them when sync()
+            is called.  flush() writes all collected items with a single
+            write followed by one update of the offsets and the number
+            of items.  close() flushes.  Readers only see flushed items.
         """
 
         assert mode in 'aw'
@@ -266,8 +358,11 @@ class Writer:
                 self.offsets = np.concatenate((offsets, padding))
                 fd.seek(0, 2)
 
-        self.fd = fd
-        self.hasfileno = file_has_fileno(fd)
+        # The real file and the file(-like object) we write data to:
+        self.file = fd
+        self.fd = WriteBuffer(fd) if buffered else fd
+        self.hasfileno = file_has_fileno(self.fd)
+        self.nflushed = getattr(self, 'nitems', 0)
 
         self.data = data
 
@@ -275,6 +370,8 @@ class Writer:
         self.nmissing = 0  # number of missing numbers
         self.shape = None
         self.dtype = None
+        self.chunks = None  # chunks of compressed array
+        self.delta = None
 
     def __enter__(self):
         return self
@@ -282,11 +379,21 @@ class Writer:
     def __exit__(self, exc_type, exc_value, tb):
         self.close()
 
-    def add_array(self, name, shape, dtype=float):
+    def add_array(self, name, shape, dtype=float, compression=None,
+                  delta=None):
         """Add ndarray object.
 
         Set name, shape and dtype for array and fill in the data in chunks
         later with the fill() method.
+
+        compression: str
+            Compress the array with 'zlib' or 'lzma'.  The chunks are
+            kept in memory until the array is complete.
+        delta: tuple
+            Store the difference to an earlier compressed array of the
+            same shape and dtype, given as a tuple of its entry in the
+            data dictionary (``writer.data[name + '.']`` after it was
+            added) and its values.
         """
 
         self._write_header()
@@ -295,14 +402,31 @@ class Writer:
             shape = (shape,)
 
         shape = tuple(int(s) for s in shape)  # Convert np.int64 to int
-
-        i = align(self.fd)
-
-        self.data[name + '.'] = {
-            'ndarray': (shape, np.dtype(dtype).name, i)}
+        dtype = np.dtype(dtype)
 
         assert self.nmissing == 0, 'last array not done'
 
+        if compression is None:
+            assert delta is None
+            i = align(self.fd)
+            entry = {'ndarray': (shape, dtype.name, i)}
+            self.chunks = None
+        else:
+            if compression not in compressors:
+                raise ValueError('Unknown compression: ' + compression)
+            entry = {'compressed': [shape, dtype.name, None, None,
+                                    compression]}
+            if delta is not None:
+                delta_entry, delta_array = delta
+                assert delta_array.shape == shape
+                assert delta_array.dtype == dtype
+                entry['delta'] = delta_entry
+            self.delta = delta
+            self.chunks = []
+
+        self.data[name + '.'] = entry
+        self.entry = entry
+
         self.dtype = dtype
         self.shape = shape
         self.nmissing = np.prod(shape)
@@ -321,11 +445,27 @@ class Writer:
         self.nmissing -= a.size
         assert self.nmissing >= 0
 
-        if self.hasfileno:
+        if self.chunks is not None:
+            self.chunks.append(a.tobytes())
+            if self.nmissing == 0:
+                self._write_compressed()
+        elif self.hasfileno:
             a.tofile(self.fd)
         else:
             self.fd.write(a.tobytes())
 
+    def _write_compressed(self):
+        compressed = self.entry['compressed']
+        a = np.frombuffer(b''.join(self.chunks), self.dtype)
+        if self.delta is not None:
+            a = bits(a) - bits(self.delta[1])
+        data = compressors[compressed[4]].compress(shuffle(a))
+        compressed[2] = self.fd.tell()
+        compressed[3] = len(data)
+        self.fd.write(data)
+        self.chunks = None
+        self.delta = None
+
     def sync(self):
         """Write data dictionary.
 
@@ -352,20 +492,44 @@ class Writer:
                 buf.tofile(self.fd)
             else:
                 self.fd.write(buf.tobytes())
-            writeint(self.fd, self.pos0, 40)
             self.offsets = offsets
 
         self.offsets[self.nitems] = i
-        writeint(self.fd, i, self.pos0 + self.nitems * 8)
         self.nitems += 1
-        writeint(self.fd, self.nitems, 32)
-        self.fd.flush()
-        self.fd.seek(0, 2)  # end of file
+        if self.fd is self.file:
+            self._write_index()
         if np.little_endian:
             self.data = {}
         else:
             self.data = {'_little_endian': False}
 
+    def _write_index(self):
+        """Write offsets of new items, number of items and position of
+        offsets."""
+        offsets = self.offsets[self.nflushed:self.nitems]
+        if not np.little_endian:
+            offsets = offsets.byteswap()
+        self.file.seek(self.pos0 + self.nflushed * 8)
+        self.file.write(offsets.tobytes())
+        a = np.array([self.nitems, self.pos0], np.int64)
+        if not np.little_endian:
+            a.byteswap(True)
+        self.file.seek(32)
+        self.file.write(a.tobytes())
+        self.file.flush()
+        self.file.seek(0, 2)  # end of file
+        self.nflushed = self.nitems
+
+    def flush(self):
+        """Write items collected by a buffered writer to the file."""
+        if self.fd is self.file:
+            return
+        self.fd.flush()
+        if self.nitems > self.nflushed:
+            self._write_index()
+        else:
+            self.file.flush()
+
     def write(self, *args, **kwargs):
         """Write data.
 
@@ -417,14 +581,16 @@ class Writer:
         else:
             # Make sure header has been written (empty ulm-file):
             self._write_header()
-        self.fd.close()
+        self.flush()
+        self.file.close()
 
     def __len__(self):
         return int(self.nitems)
 
 
 class DummyWriter:
-    def add_array(self, name, shape, dtype=float):
+    def add_array(self, name, shape, dtype=float, compression=None,
+                  delta=None):
         pass
 
     def fill(self, a):
@@ -433,6 +599,9 @@ class DummyWriter:
     def sync(self):
         pass
 
+    def flush(self):
+        pass
+
     def write(self, *args, **kwargs):
         pass
 
@@ -462,8 +631,22 @@ class InvalidULMFileError(IOError):
 
 
 class Reader:
-    def __init__(self, fd, index=0, data=None, _little_endian=None):
-        """Create reader."""
+    def __init__(self, fd, index=0, data=None, _little_endian=None,
+                 memmap=False):
+        """Create reader.
+
+        fd: str or file
+            Filename or file object opened in binary mode.
+        index: int
+            Index of item to read.
+        memmap: bool or np.memmap
+            Map the whole file into memory with ``np.memmap``.  Arrays
+            are then returned as read-only views into the map without
+            any system calls, and several processes reading the same
+            file share the memory.  Arrays that must be converted
+            (byte order or scaling) are still copied.  Ignored for files
+            without a fileno, like BytesIO objects.
+        """
 
         self._little_endian = _little_endian
 
@@ -475,6 +658,14 @@ class Reader:
         self._fd = fd
         self._index = index
 
+        if memmap is True:
+            memmap = None
+            if file_has_fileno(fd):
+                memmap = np.memmap(fd, np.uint8, mode='r')
+        elif memmap is False:
+            memmap = None
+        self._memmap = memmap
+
         if data is None:
             (self._tag, self._version, self._nitems, self._pos0,
              self._offsets) = read_header(fd)
@@ -491,6 +682,16 @@ class Reader:
     def __exit__(self, exc_type, exc_value, tb):
         self.close()
 
+    def _compressed_array_reader(self, entry):
+        shape, dtype, offset, nbytes, compression = entry['compressed']
+        delta = entry.get('delta')
+        if delta is not None:
+            delta = self._compressed_array_reader(delta)
+        return CompressedNDArrayReader(self._fd, shape, np.dtype(dtype),
+                                       offset, self._little_endian,
+                                       self._memmap, nbytes, compression,
+                                       delta)
+
     def _parse_data(self, data):
         self._data = {}
         for name, value in data.items():
@@ -502,10 +703,14 @@ class Reader:
                                           shape,
                                           np.dtype(dtype),
                                           offset,
-                                          self._little_endian)
+                                          self._little_endian,
+                                          self._memmap)
+                elif 'compressed' in value:
+                    value = self._compressed_array_reader(value)
                 else:
                     value = Reader(self._fd, data=value,
-                                   _little_endian=self._little_endian)
+                                   _little_endian=self._little_endian,
+                                   memmap=self._memmap)
                 name = name[:-1]
 
             self._data[name] = value
@@ -569,16 +774,26 @@ class Reader:
         return int(self._nitems)
 
     def _read_data(self, index):
-        self._fd.seek(self._offsets[index])
-        size = int(readints(self._fd, 1)[0])
-        data = decode(self._fd.read(size).decode(), False)
+        offset = int(self._offsets[index])
+        if self._memmap is not None:
+            size = np.frombuffer(self._memmap, np.int64, 1, offset)
+            if not np.little_endian:
+                size = size.byteswap()
+            size = int(size[0])
+            text = self._memmap[offset + 8:offset + 8 + size].tobytes()
+        else:
+            self._fd.seek(offset)
+            size = int(readints(self._fd, 1)[0])
+            text = self._fd.read(size)
+        data = decode(text.decode(), False)
         self._little_endian = data.pop('_little_endian', True)
         return data
 
     def __getitem__(self, index):
         """Return Reader for item *index*."""
         data = self._read_data(index)
-        return Reader(self._fd, index, data, self._little_endian)
+        return Reader(self._fd, index, data, self._little_endian,
+                      self._memmap)
 
     def tostr(self, verbose=False, indent='    '):
         keys = sorted(self._data)
@@ -605,9 +820,10 @@ class Reader:
 
 
 class NDArrayReader:
-    def __init__(self, fd, shape, dtype, offset, little_endian):
+    def __init__(self, fd, shape, dtype, offset, little_endian, memmap=None):
         self.fd = fd
-        self.hasfileno = file_has_fileno(fd)
+        self.memmap = memmap
+        self.hasfileno = memmap is not None or file_has_fileno(fd)
         self.shape = tuple(shape)
         self.dtype = dtype
         self.offset = offset
@@ -635,8 +851,10 @@ class NDArrayReader:
         start, stop, step = i.indices(len(self))
         stride = np.prod(self.shape[1:], dtype=int)
         offset = self.offset + start * self.itemsize * stride
-        self.fd.seek(offset)
         count = (stop - start) * stride
+        if self.memmap is not None:
+            return self._view(offset, max(count, 0), start, stop, step)
+        self.fd.seek(offset)
         if self.hasfileno:
             a = np.fromfile(self.fd, self.dtype, count)
         else:
@@ -655,6 +873,20 @@ class NDArrayReader:
             a *= self.scale
         return a
 
+    def _view(self, offset, count, start, stop, step):
+        """Read-only view into the memory map (copy if converted)."""
+        a = np.frombuffer(self.memmap, self.dtype, count, offset)
+        a = a.reshape((max(stop - start, 0),) + self.shape[1:])
+        if step != 1:
+            a = a[::step]
+        if self.little_endian != np.little_endian:
+            a = a.byteswap()
+        if self.length_of_last_dimension is not None:
+            a = a[..., :self.length_of_last_dimension]
+        if self.scale != 1.0:
+            a = a * self.scale
+        return a
+
     def proxy(self, *indices):
         stride = self.size // len(self)
         start = 0
@@ -663,7 +895,7 @@ class NDArrayReader:
             stride //= self.shape[i + 1]
         offset = self.offset + start * self.itemsize
         p = NDArrayReader(self.fd, self.shape[i + 1:], self.dtype,
-                          offset, self.little_endian)
+                          offset, self.little_endian, self.memmap)
         p.scale = self.scale
         return p
 
@@ -681,6 +913,47 @@ def print_ulm_info(filename, index=None, verbose=False):
         print(b[i].tostr(verbose))
 
 
+class CompressedNDArrayReader(NDArrayReader):
+    """Reader for compressed array.
+
+    The whole array is decompressed when read."""
+
+    def __init__(self, fd, shape, dtype, offset, little_endian, memmap,
+                 compressed_nbytes, compression, delta=None):
+        NDArrayReader.__init__(self, fd, shape, dtype, offset, little_endian,
+                               memmap)
+        self.compressed_nbytes = compressed_nbytes
+        self.compression = compression
+        self.delta = delta
+
+    def __getitem__(self, i):
+        a = self._decompress()[i]
+        if self.length_of_last_dimension is not None:
+            a = a[..., :self.length_of_last_dimension]
+        if self.scale != 1.0:
+            a = a * self.scale
+        return a
+
+    def _decompress(self):
+        if self.memmap is not None:
+            data = self.memmap[self.offset:
+                               self.offset + self.compressed_nbytes]
+        else:
+            self.fd.seek(self.offset)
+            data = self.fd.read(self.compressed_nbytes)
+        data = compressors[self.compression].decompress(data)
+        itemsize = self.itemsize // (2 if self.dtype.kind == 'c' else 1)
+        a = unshuffle(data, itemsize).view('u{}'.format(itemsize))
+        if self.little_endian != np.little_endian:
+            a.byteswap(True)
+        if self.delta is not None:
+            a += bits(self.delta.read())
+        return a.view(self.dtype).reshape(self.shape)
+
+    def proxy(self, *indices):
+        return self.read()[indices]
+
+
 def copy(reader: Union[str, Path, Reader],
          writer: Union[str, Path, Writer],
          exclude: Set[str] = set(),
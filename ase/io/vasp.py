@@ -6,6 +6,7 @@ Atoms object in VASP POSCAR format.
 
 import os
 import re
+import sys
 
 import numpy as np
 
@@ -17,6 +18,7 @@ from .vasp_parsers import vasp_outcar_parsers as vop
 
 __all__ = [
     'read_vasp', 'read_vasp_out', 'iread_vasp_out', 'read_vasp_xdatcar',
+    'count_vasp_xdatcar',
     'read_vasp_xml', 'write_vasp', 'write_vasp_xdatcar'
 ]
 
@@ -286,7 +288,17 @@ def read_vasp_xdatcar(filename='XDATCAR', index=-1):
     cell = np.eye(3)
     atomic_formula = str()
 
-    while True:
+    # For slices without negative numbers, only the positions of the
+    # requested images are parsed and reading stops after the last one:
+    wanted = None
+    if (isinstance(index, slice) and (index.step or 1) > 0 and
+        (index.start or 0) >= 0 and (index.stop or 0) >= 0):
+        wanted = range(index.start or 0,
+                       sys.maxsize if index.stop is None else index.stop,
+                       index.step or 1)
+
+    nimages = 0
+    while wanted is None or nimages < wanted.stop:
         comment_line = fd.readline()
         if "Direct configuration=" not in comment_line:
             try:
@@ -309,6 +321,12 @@ def read_vasp_xdatcar(filename='XDATCAR', index=-1):
 
             fd.readline()
 
+        if wanted is not None and nimages not in wanted:
+            for ii in range(total):
+                fd.readline()
+            nimages += 1
+            continue
+
         coords = [
             np.array(fd.readline().split(), np.float) for ii in range(total)
         ]
@@ -316,13 +334,23 @@ def read_vasp_xdatcar(filename='XDATCAR', index=-1):
         image = Atoms(atomic_formula, cell=cell, pbc=True)
         image.set_scaled_positions(np.array(coords))
         images.append(image)
+        nimages += 1
 
+    if wanted is not None:
+        return images
     if not index:
         return images
     else:
         return images[index]
 
 
+def count_vasp_xdatcar(filename):
+    """Number of images in XDATCAR file."""
+    with open(filename, 'rb') as fd:
+        return sum(line.startswith(b'Direct configuration=')
+                   for line in fd)
+
+
 def __get_xml_parameter(par):
     """An auxiliary function that enables convenient extraction of
     parameter values from a vasprun.xml file with proper type
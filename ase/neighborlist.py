@@ -1,5 +1,8 @@
+import os
 import numpy as np
 import itertools
+import weakref
+from collections import OrderedDict
 from scipy import sparse as sp
 from scipy.spatial import cKDTree
 import scipy.sparse.csgraph as csgraph
@@ -141,7 +144,8 @@ def mic(dr, cell, pbc=True):
 
 def primitive_neighbor_list(quantities, pbc, cell, positions, cutoff,
                             numbers=None, self_interaction=False,
-                            use_scaled_positions=False, max_nbins=1e6):
+                            use_scaled_positions=False, max_nbins=1e6,
+                            workers=None):
     """Compute a neighbor list for an atomic configuration.
 
     Atoms outside periodic boundaries are mapped into the box. Atoms
@@ -194,6 +198,10 @@ def primitive_neighbor_list(quantities, pbc, cell, positions, cutoff,
     max_nbins: int
         Maximum number of bins used in neighbor search. This is used to limit
         the maximum amount of memory required by the neighbor list.
+    workers: int
+        If given, split the cell into domains that are searched by this
+        many threads.  See
+        :func:`~ase.neighborlist.parallel_primitive_neighbor_list`.
 
     Returns:
 
@@ -216,6 +224,13 @@ def primitive_neighbor_list(quantities, pbc, cell, positions, cutoff,
     #     p: Pair index, can have value 0 or 1
     #     n: (Linear) neighbor index
 
+    if workers is not None:
+        return parallel_primitive_neighbor_list(
+            quantities, pbc, cell, positions, cutoff,
+            self_interaction=self_interaction,
+            use_scaled_positions=use_scaled_positions,
+            max_nbins=max_nbins, workers=workers)
+
     # Return empty neighbor list if no atoms are passed here
     if len(positions) == 0:
         empty_types = dict(i=(np.int, (0, )),
@@ -511,7 +526,7 @@ def primitive_neighbor_list(quantities, pbc, cell, positions, cutoff,
 
 
 def neighbor_list(quantities, a, cutoff, self_interaction=False,
-                  max_nbins=1e6):
+                  max_nbins=1e6, workers=None):
     """Compute a neighbor list for an atomic configuration.
 
     Atoms outside periodic boundaries are mapped into the box. Atoms
@@ -556,6 +571,9 @@ def neighbor_list(quantities, a, cutoff, self_interaction=False,
     max_nbins: int
         Maximum number of bins used in neighbor search. This is used to limit
         the maximum amount of memory required by the neighbor list.
+    workers: int
+        Number of threads searching different domains of the cell in
+        parallel.  Default: None (serial search).
 
     Returns:
 
@@ -621,7 +639,7 @@ def neighbor_list(quantities, a, cutoff, self_interaction=False,
                                    a.get_cell(complete=True),
                                    a.positions, cutoff, numbers=a.numbers,
                                    self_interaction=self_interaction,
-                                   max_nbins=max_nbins)
+                                   max_nbins=max_nbins, workers=workers)
 
 
 def first_neighbors(natoms, first_atom):
@@ -727,6 +745,171 @@ def get_connectivity_matrix(nl, sparse=True):
     return matrix
 
 
+class CSRNeighborList:
+    """Full neighbor list for a global cutoff in compressed sparse row format.
+
+    The list is stored as flat arrays: the neighbors of atom ``a`` are
+    ``j[first_neigh[a]:first_neigh[a + 1]]`` with shift vectors
+    ``S[first_neigh[a]:first_neigh[a + 1]]`` (see
+    :func:`~ase.neighborlist.first_neighbors`).  Distance vectors ``D``
+    and distances ``d`` for the current positions are cached, so that
+    several consumers can get all pairs of the system from
+    :meth:`get_pairs` without recomputing them.
+
+    cutoff: float
+        Distance below which two atoms are neighbors.
+    skin: float
+        The list contains all pairs within ``cutoff + skin`` and is only
+        rebuilt once an atom has moved more than half the skin.
+    self_interaction: bool
+        Should an atom return itself as a neighbor?
+    cache_distances: bool
+        Keep the distance vectors between calls to :meth:`get_pairs`.
+
+    Example::
+
+      nl = CSRNeighborList(5.0)
+      nl.update(atoms)
+      i, j, D, d = nl.get_pairs()
+    """
+
+    def __init__(self, cutoff, skin=0.0, self_interaction=False,
+                 cache_distances=True):
+        self.cutoff = cutoff
+        self.skin = skin
+        self.self_interaction = self_interaction
+        self.cache_distances = cache_distances
+        self.nupdates = 0
+        self.positions = None
+        self.current_positions = None
+        self.D = None
+        self.d = None
+
+    def update(self, atoms):
+        """Make sure the list is up to date."""
+        positions = atoms.positions
+        cell = atoms.get_cell(complete=True)
+
+        if (self.nupdates == 0 or len(positions) != len(self.positions) or
+            (self.pbc != atoms.pbc).any() or (self.cell != cell).any() or
+            (self.numbers != atoms.numbers).any()):
+            self.build(atoms)
+            return True
+
+        if (len(positions) > 0 and
+            4 * ((self.positions - positions)**2).sum(1).max() >
+            self.skin**2):
+            self.build(atoms)
+            return True
+
+        if (self.current_positions != positions).any():
+            self.current_positions = positions.copy()
+            self.D = None
+            self.d = None
+
+        return False
+
+    def build(self, atoms):
+        """Build the list."""
+        self.pbc = atoms.pbc.copy()
+        self.cell = np.array(atoms.get_cell(complete=True))
+        self.numbers = atoms.numbers.copy()
+        self.positions = atoms.positions.copy()
+        self.current_positions = self.positions.copy()
+
+        i, self.j, self.S = primitive_neighbor_list(
+            'ijS', self.pbc, self.cell, self.positions,
+            self.cutoff + self.skin, self_interaction=self.self_interaction)
+        self.first_neigh = first_neighbors(len(self.positions), i)
+        self.i = i
+        self.D = None
+        self.d = None
+        self.nupdates += 1
+
+    def get_distances(self):
+        """Return distance vectors and distances of all pairs."""
+        if self.D is not None:
+            return self.D, self.d
+
+        positions = self.current_positions
+        D = positions[self.j] - positions[self.i] + np.dot(self.S, self.cell)
+        d = np.sqrt((D**2).sum(1))
+        if self.cache_distances:
+            self.D = D
+            self.d = d
+        return D, d
+
+    def get_pairs(self, cutoff=None):
+        """Return i, j, D and d arrays for all pairs of the system.
+
+        Since the list includes the skin, pairs beyond the cutoff are
+        returned unless *cutoff* is given, in which case only pairs
+        closer than *cutoff* are kept."""
+        if self.nupdates <= 0:
+            raise RuntimeError('Must call update(atoms) on your neighborlist '
+                               'first!')
+
+        D, d = self.get_distances()
+        if cutoff is None:
+            return self.i, self.j, D, d
+
+        mask = d < cutoff
+        return self.i[mask], self.j[mask], D[mask], d[mask]
+
+    def get_neighbors(self, a):
+        """Return neighbors of atom number a.
+
+        Indices and shift vectors of the neighbors are returned as
+        views into the flat arrays of the list."""
+        start, end = self.first_neigh[a], self.first_neigh[a + 1]
+        return self.j[start:end], self.S[start:end]
+
+
+# Neighbor lists shared by all users of an Atoms object:
+shared_neighbor_lists = {}
+
+
+def get_shared_neighbor_list(atoms, cutoff, skin=0.0, self_interaction=False,
+                             maxlists=8):
+    """Return an updated CSRNeighborList shared between users of *atoms*.
+
+    Calculators and analysis tools working on the same Atoms object
+    with the same cutoff, skin and self_interaction get the same
+    :class:`~ase.neighborlist.CSRNeighborList`, so the list is only
+    built once.  The lists live as long as the Atoms object and at most
+    *maxlists* lists (the most recently used) are kept for each object.
+    """
+    lists = _get_shared_lists(atoms)
+    nlkey = (cutoff, skin, self_interaction)
+    nl = lists.pop(nlkey, None)
+    if nl is None:
+        nl = CSRNeighborList(cutoff, skin, self_interaction)
+    lists[nlkey] = nl
+    while len(lists) > maxlists:
+        lists.popitem(last=False)
+
+    nl.update(atoms)
+    return nl
+
+
+def share_neighbor_lists(atoms, other):
+    """Let *other* use the shared neighbor lists of *atoms*.
+
+    Useful for slightly displaced copies of *atoms*: as long as no atom
+    has moved more than half the skin, the lists are not rebuilt."""
+    shared_neighbor_lists[id(other)] = _get_shared_lists(atoms)
+    weakref.finalize(other, shared_neighbor_lists.pop, id(other), None)
+
+
+def _get_shared_lists(atoms):
+    key = id(atoms)
+    lists = shared_neighbor_lists.get(key)
+    if lists is None:
+        lists = shared_neighbor_lists[key] = OrderedDict()
+        weakref.finalize(atoms, shared_neighbor_lists.pop, key, None)
+    return lists
+
+
 class NewPrimitiveNeighborList:
     """Neighbor list object. Wrapper around neighbor_list and first_neighbors.
 
@@ -794,7 +977,17 @@ class NewPrimitiveNeighborList:
                 self_interaction=self.self_interaction,
                 use_scaled_positions=self.use_scaled_positions)
 
-        if len(positions) > 0 and not self.bothways:
+        self.select_pairs(len(positions), pair_first, pair_second, offset_vec)
+
+        self.nupdates += 1
+
+    def select_pairs(self, natoms, pair_first, pair_second, offset_vec):
+        """Store pairs from a full neighbor list sorted by first atom.
+
+        Reduces the list to half of the neighbors unless bothways=True,
+        sorts it if requested and computes the index of the first
+        neighbor of each atom."""
+        if natoms > 0 and not self.bothways:
             offset_x, offset_y, offset_z = offset_vec.T
 
             mask = offset_z > 0
@@ -808,7 +1001,7 @@ class NewPrimitiveNeighborList:
             pair_second = pair_second[mask]
             offset_vec = offset_vec[mask]
 
-        if len(positions) > 0 and self.sorted:
+        if natoms > 0 and self.sorted:
             mask = np.argsort(pair_first * len(pair_first) +
                               pair_second)
             pair_first = pair_first[mask]
@@ -820,9 +1013,7 @@ class NewPrimitiveNeighborList:
         self.offset_vec = offset_vec
 
         # Compute the index array point to the first neighbor
-        self.first_neigh = first_neighbors(len(positions), pair_first)
-
-        self.nupdates += 1
+        self.first_neigh = first_neighbors(natoms, pair_first)
 
     def get_neighbors(self, a):
         """Return neighbors of atom number a.
@@ -843,6 +1034,401 @@ class NewPrimitiveNeighborList:
                 self.offset_vec[self.first_neigh[a]:self.first_neigh[a+1]])
 
 
+class CellList:
+    """Atoms sorted into bins at least as large as the largest pair cutoff.
+
+    Finds the neighbors of any subset of the atoms by only looking at the
+    atoms in neighboring bins.  Two atoms are neighbors if their distance
+    is smaller than the sum of their *radii*.
+
+    pbc: array_like
+        Periodic boundary conditions.
+    cell: 3x3 matrix
+        Complete unit cell.
+    positions: ndarray
+        Cartesian positions.  The array is used directly, so that owners
+        can move atoms and call :meth:`bin_atoms` for the moved atoms.
+    radii: ndarray
+        Radius of each atom.
+    max_nbins: int
+        Maximum number of bins.
+    """
+
+    def __init__(self, pbc, cell, positions, radii, max_nbins=1e6):
+        self.pbc = np.array(pbc, dtype=bool)
+        self.cell = np.array(cell, dtype=float)
+        self.positions = positions
+        self.radii = np.asarray(radii, dtype=float)
+
+        self.icell = np.linalg.inv(self.cell)
+        face_dist_c = 1 / np.linalg.norm(self.icell, axis=0)
+
+        if len(self.radii) > 0:
+            max_cutoff = 2 * self.radii.max()
+        else:
+            max_cutoff = 0.0
+
+        bin_size = max(max_cutoff, 3)
+        nbins_c = np.maximum((face_dist_c / bin_size).astype(int), [1, 1, 1])
+        while np.prod(nbins_c) > max_nbins:
+            nbins_c = np.maximum(nbins_c // 2, [1, 1, 1])
+
+        nsearch_c = np.ceil(bin_size * nbins_c / face_dist_c).astype(int)
+        nsearch_c[(nbins_c == 1) & ~self.pbc] = 0
+
+        self.nbins_c = nbins_c
+        self.nsearch_c = nsearch_c
+
+        natoms = len(positions)
+        self.bin_index_ic = np.zeros((natoms, 3), int)
+        self.cell_shift_ic = np.zeros((natoms, 3), int)
+        self.bin_index_i = np.zeros(natoms, int)
+        self.atoms_in_bins = None
+        self.bin_atoms(np.arange(natoms))
+
+    def bin_atoms(self, indices):
+        """Put the atoms with the given indices into bins.
+
+        The atoms are only re-sorted if some atom changed its bin."""
+        nbins_c = self.nbins_c
+        scaled_ic = np.dot(self.positions[indices], self.icell)
+        bin_index_ic = np.floor(scaled_ic * nbins_c).astype(int)
+        cell_shift_ic = np.zeros_like(bin_index_ic)
+        for c in range(3):
+            if self.pbc[c]:
+                cell_shift_ic[:, c], bin_index_ic[:, c] = \
+                    divmod(bin_index_ic[:, c], nbins_c[c])
+            else:
+                bin_index_ic[:, c] = np.clip(bin_index_ic[:, c],
+                                             0, nbins_c[c] - 1)
+
+        bin_index_i = (bin_index_ic[:, 0] +
+                       nbins_c[0] * (bin_index_ic[:, 1] +
+                                     nbins_c[1] * bin_index_ic[:, 2]))
+
+        self.bin_index_ic[indices] = bin_index_ic
+        self.cell_shift_ic[indices] = cell_shift_ic
+        changed = (self.bin_index_i[indices] != bin_index_i).any()
+        self.bin_index_i[indices] = bin_index_i
+
+        if changed or self.atoms_in_bins is None:
+            self.atoms_in_bins = np.argsort(self.bin_index_i, kind='mergesort')
+            self.bin_start = np.searchsorted(
+                self.bin_index_i[self.atoms_in_bins],
+                np.arange(np.prod(nbins_c) + 1))
+
+    def find_pairs(self, indices):
+        """Find all neighbors of the given atoms.
+
+        Returns first atom, second atom, shift vector and distance vector
+        of all pairs (excluding self-pairs), sorted by first atom."""
+        nbins_c = self.nbins_c
+        nsx, nsy, nsz = self.nsearch_c
+        bin_index_ic = self.bin_index_ic[indices]
+
+        pairs_i = [np.zeros(0, int)]
+        pairs_j = [np.zeros(0, int)]
+        pairs_S = [np.zeros((0, 3), int)]
+        pairs_D = [np.zeros((0, 3))]
+        for dz in range(-nsz, nsz + 1):
+            for dy in range(-nsy, nsy + 1):
+                for dx in range(-nsx, nsx + 1):
+                    neighbin_ic = bin_index_ic + (dx, dy, dz)
+                    shift_ic = np.zeros_like(neighbin_ic)
+                    valid = np.ones(len(indices), bool)
+                    for c in range(3):
+                        if self.pbc[c]:
+                            shift_ic[:, c], neighbin_ic[:, c] = \
+                                divmod(neighbin_ic[:, c], nbins_c[c])
+                        else:
+                            valid &= ((neighbin_ic[:, c] >= 0) &
+                                      (neighbin_ic[:, c] < nbins_c[c]))
+                    neighbin_i = (
+                        neighbin_ic[:, 0] +
+                        nbins_c[0] * (neighbin_ic[:, 1] +
+                                      nbins_c[1] * neighbin_ic[:, 2]))
+                    neighbin_i[~valid] = 0
+
+                    start = self.bin_start[neighbin_i]
+                    count = self.bin_start[neighbin_i + 1] - start
+                    count[~valid] = 0
+                    n = count.sum()
+                    if n == 0:
+                        continue
+
+                    # Expand into all candidate pairs:
+                    owner = np.repeat(np.arange(len(indices)), count)
+                    local = np.arange(n) - np.repeat(np.cumsum(count) - count,
+                                                     count)
+                    i = indices[owner]
+                    j = self.atoms_in_bins[np.repeat(start, count) + local]
+                    S = (shift_ic[owner] + self.cell_shift_ic[i] -
+                         self.cell_shift_ic[j])
+
+                    D = (self.positions[j] - self.positions[i] +
+                         np.dot(S, self.cell))
+                    mask = ((D**2).sum(1) <
+                            (self.radii[i] + self.radii[j])**2)
+                    mask &= (i != j) | S.any(1)
+                    pairs_i.append(i[mask])
+                    pairs_j.append(j[mask])
+                    pairs_S.append(S[mask])
+                    pairs_D.append(D[mask])
+
+        i = np.concatenate(pairs_i)
+        order = np.argsort(i, kind='mergesort')
+        return (i[order], np.concatenate(pairs_j)[order],
+                np.concatenate(pairs_S)[order],
+                np.concatenate(pairs_D)[order])
+
+
+def parallel_primitive_neighbor_list(quantities, pbc, cell, positions, cutoff,
+                                     self_interaction=False,
+                                     use_scaled_positions=False,
+                                     max_nbins=1e6, workers=None,
+                                     nchunks=None):
+    """Compute a neighbor list with a pool of threads.
+
+    Same arguments and return values as
+    :func:`~ase.neighborlist.primitive_neighbor_list`, except that
+    *cutoff* must be a float or a list of per-atom radii.
+
+    The atoms are sorted into bins, and the bins are split into
+    *nchunks* (default: four per worker) domains of neighboring bins.
+    The neighbors of the atoms of each domain are found by a pool of
+    *workers* threads (default: number of CPUs) that share the
+    positions and bins.  NumPy releases the GIL in the array operations
+    doing the work, so the search scales with the number of cores.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if isinstance(cutoff, dict):
+        raise NotImplementedError('Per element pair cutoffs are not '
+                                  'supported by the parallel neighbor list')
+
+    cell = complete_cell(cell)
+    if use_scaled_positions:
+        positions = np.dot(positions, cell)
+    positions = np.asarray(positions, dtype=float)
+    natoms = len(positions)
+
+    if np.isscalar(cutoff):
+        radii = np.full(natoms, 0.5 * cutoff)
+    else:
+        radii = np.asarray(cutoff, dtype=float)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if nchunks is None:
+        nchunks = 4 * workers
+
+    celllist = CellList(pbc, cell, positions, radii, max_nbins)
+    chunks = [chunk for chunk in np.array_split(celllist.atoms_in_bins,
+                                                nchunks) if len(chunk)]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(celllist.find_pairs, chunks))
+
+    if not results:
+        results = [celllist.find_pairs(np.zeros(0, int))]
+    i, j, S, D = [np.concatenate(arrays) for arrays in zip(*results)]
+
+    if self_interaction:
+        a = np.arange(natoms)
+        i = np.concatenate((i, a))
+        j = np.concatenate((j, a))
+        S = np.concatenate((S, np.zeros((natoms, 3), int)))
+        D = np.concatenate((D, np.zeros((natoms, 3))))
+
+    order = np.argsort(i, kind='mergesort')
+    return select_quantities(quantities,
+                             i[order], j[order], S[order], D[order])
+
+
+def iter_neighbor_list(quantities, a, cutoff, self_interaction=False,
+                       chunk_size=10000, max_nbins=1e6):
+    """Compute a neighbor list in chunks of bounded size.
+
+    Same as :func:`~ase.neighborlist.neighbor_list`, but instead of
+    returning the pairs of the whole system at once, this generator
+    yields the quantities for the neighbors of *chunk_size* consecutive
+    atoms at a time.  Only the current chunk of pairs is kept in memory,
+    so that very large systems or long cutoffs can be analysed with
+    bounded memory.  *cutoff* must be a float or a list of per-atom radii.
+
+    Concatenating all the chunks gives a list sorted by first atom.
+
+    Example: coordination numbers::
+
+        coord = np.zeros(len(a), int)
+        for i in iter_neighbor_list('i', a, 3.0):
+            coord += np.bincount(i, minlength=len(a))
+    """
+    if isinstance(cutoff, dict):
+        raise NotImplementedError('Per element pair cutoffs are not '
+                                  'supported by the chunked neighbor list')
+
+    natoms = len(a)
+    positions = a.positions
+    if np.isscalar(cutoff):
+        radii = np.full(natoms, 0.5 * cutoff)
+    else:
+        radii = np.asarray(cutoff, dtype=float)
+
+    celllist = CellList(a.pbc, a.get_cell(complete=True), positions, radii,
+                        max_nbins)
+
+    for start in range(0, natoms, chunk_size):
+        indices = np.arange(start, min(start + chunk_size, natoms))
+        i, j, S, D = celllist.find_pairs(indices)
+        if self_interaction:
+            i = np.concatenate((i, indices))
+            j = np.concatenate((j, indices))
+            S = np.concatenate((S, np.zeros((len(indices), 3), int)))
+            D = np.concatenate((D, np.zeros((len(indices), 3))))
+            order = np.argsort(i, kind='mergesort')
+            i, j, S, D = i[order], j[order], S[order], D[order]
+        yield select_quantities(quantities, i, j, S, D)
+
+
+def select_quantities(quantities, i, j, S, D):
+    """Return the requested quantities of a neighbor list."""
+    retvals = []
+    for q in quantities:
+        if q == 'i':
+            retvals.append(i)
+        elif q == 'j':
+            retvals.append(j)
+        elif q == 'D':
+            retvals.append(D)
+        elif q == 'd':
+            retvals.append(np.sqrt((D**2).sum(1)))
+        elif q == 'S':
+            retvals.append(S)
+        else:
+            raise ValueError('Unsupported quantity specified.')
+    if len(retvals) == 1:
+        return retvals[0]
+    else:
+        return tuple(retvals)
+
+
+class IncrementalPrimitiveNeighborList(NewPrimitiveNeighborList):
+    """Neighbor list that is updated incrementally.
+
+    Same interface as :class:`~ase.neighborlist.NewPrimitiveNeighborList`,
+    but instead of rebuilding everything when any atom has moved more
+    than the skin distance, the displacement of every atom since it was
+    last put into a bin is tracked.  Only the atoms that moved more than
+    the skin are re-binned, and only the rows of the list involving
+    those atoms are recomputed.  All other pairs are kept.
+
+    A full rebuild is done if the cell, the periodic boundary conditions
+    or the number of atoms change, or if more than *partial_fraction*
+    of the atoms have moved too far.
+
+    The number of full and partial updates is available as
+    ``nfullupdates`` and ``npartialupdates`` (``nupdates`` is the sum).
+
+    Example::
+
+      nl = NeighborList(cutoffs, primitive=IncrementalPrimitiveNeighborList)
+      nl.update(atoms)
+    """
+
+    def __init__(self, cutoffs, skin=0.3, sorted=False, self_interaction=True,
+                 bothways=False, use_scaled_positions=False,
+                 partial_fraction=0.25, max_nbins=1e6):
+        NewPrimitiveNeighborList.__init__(
+            self, cutoffs, skin, sorted, self_interaction=self_interaction,
+            bothways=bothways, use_scaled_positions=use_scaled_positions)
+        self.partial_fraction = partial_fraction
+        self.max_nbins = max_nbins
+        self.nfullupdates = 0
+        self.npartialupdates = 0
+
+    def update(self, pbc, cell, positions, numbers=None):
+        """Make sure the list is up to date."""
+        cell = complete_cell(cell)
+        if self.use_scaled_positions:
+            positions = np.dot(positions, cell)
+        positions = np.asarray(positions, float)
+
+        if (self.nupdates == 0 or len(positions) != len(self.positions) or
+            (self.pbc != pbc).any() or (self.cell != cell).any()):
+            self.build_full(pbc, cell, positions)
+            return True
+
+        moved = np.flatnonzero(
+            ((self.positions - positions)**2).sum(1) > self.skin**2)
+
+        if len(moved) == 0:
+            return False
+
+        if len(moved) > self.partial_fraction * len(positions):
+            self.build_full(pbc, cell, positions)
+        else:
+            self.build_partial(positions, moved)
+
+        return True
+
+    def build(self, pbc, cell, positions, numbers=None):
+        """Build the list from scratch."""
+        cell = complete_cell(cell)
+        if self.use_scaled_positions:
+            positions = np.dot(positions, cell)
+        self.build_full(pbc, cell, np.asarray(positions, float))
+
+    def build_full(self, pbc, cell, positions):
+        self.pbc = np.array(pbc, dtype=bool)
+        self.cell = np.array(cell, copy=True)
+        self.positions = np.array(positions, copy=True)
+
+        self.celllist = CellList(self.pbc, self.cell, self.positions,
+                                 self.cutoffs, self.max_nbins)
+        self.pairs = self.celllist.find_pairs(
+            np.arange(len(positions)))[:3]
+        self.store_pairs()
+        self.nfullupdates += 1
+
+    def build_partial(self, positions, moved):
+        """Recompute the rows of the list involving the *moved* atoms."""
+        self.positions[moved] = positions[moved]
+        self.celllist.bin_atoms(moved)
+
+        is_moved = np.zeros(len(positions), bool)
+        is_moved[moved] = True
+
+        i, j, S = self.pairs
+        keep = ~(is_moved[i] | is_moved[j])
+        i_n, j_n, S_n = self.celllist.find_pairs(moved)[:3]
+        # Pairs between two moved atoms are found from both sides:
+        reverse = ~is_moved[j_n]
+
+        i = np.concatenate((i[keep], i_n, j_n[reverse]))
+        j = np.concatenate((j[keep], j_n, i_n[reverse]))
+        S = np.concatenate((S[keep], S_n, -S_n[reverse]))
+
+        order = np.argsort(i, kind='mergesort')
+        self.pairs = (i[order], j[order], S[order])
+        self.store_pairs()
+        self.npartialupdates += 1
+
+    def store_pairs(self):
+        natoms = len(self.positions)
+        i, j, S = self.pairs
+        if self.self_interaction and natoms > 0:
+            a = np.arange(natoms)
+            i = np.concatenate((i, a))
+            j = np.concatenate((j, a))
+            S = np.concatenate((S, np.zeros((natoms, 3), int)))
+            order = np.argsort(i, kind='mergesort')
+            i, j, S = i[order], j[order], S[order]
+
+        self.select_pairs(natoms, i, j, S)
+        self.nupdates += 1
+
+
 class PrimitiveNeighborList:
     """Neighbor list that works without Atoms objects.
 
@@ -1027,6 +1613,8 @@ class NeighborList:
         Define which implementation to use. Older and quadratically-scaling
         :class:`~ase.neighborlist.PrimitiveNeighborList` or newer and
         linearly-scaling :class:`~ase.neighborlist.NewPrimitiveNeighborList`.
+        :class:`~ase.neighborlist.IncrementalPrimitiveNeighborList` only
+        recomputes the neighbors of atoms that moved more than the skin.
 
     Example::
 
@@ -1071,6 +1659,19 @@ class NeighborList:
         """Get number of updates."""
         return self.nl.nupdates
 
+    @property
+    def nfullupdates(self):
+        """Get number of updates rebuilding the whole list."""
+        return getattr(self.nl, 'nfullupdates', self.nl.nupdates)
+
+    @property
+    def npartialupdates(self):
+        """Get number of updates only recomputing some rows of the list.
+
+        Only :class:`~ase.neighborlist.IncrementalPrimitiveNeighborList`
+        does partial updates."""
+        return getattr(self.nl, 'npartialupdates', 0)
+
     @property
     def nneighbors(self):
         """Get number of neighbors."""
@@ -4,12 +4,13 @@ import numpy as np
 
 from ase.constraints import Filter, FixAtoms
 from ase.geometry.cell import cell_to_cellpar
-from ase.neighborlist import neighbor_list
+from ase.neighborlist import get_shared_neighbor_list
 
 def get_neighbours(atoms, r_cut, self_interaction=False):
     """Return a list of pairs of atoms within a given distance of each other.
 
-    Uses ase.neighborlist.neighbour_list to compute neighbors.
+    Uses ase.neighborlist.get_shared_neighbor_list to compute neighbors,
+    so that the list is reused as long as the atoms do not move too much.
 
     Args:
         atoms: ase.atoms object to calculate neighbours for
@@ -26,7 +27,8 @@ def get_neighbours(atoms, r_cut, self_interaction=False):
     if isinstance(atoms, Filter):
         atoms = atoms.atoms
 
-    i_list, j_list, d_list = neighbor_list('ijd', atoms, r_cut)
+    nl = get_shared_neighbor_list(atoms, r_cut, skin=0.3 * r_cut)
+    i_list, j_list, D_list, d_list = nl.get_pairs(r_cut)
 
     # filter out self-interactions (across PBC)
     if not self_interaction:
@@ -339,6 +339,46 @@ def distribute_cpus(size, comm):
     return mycomm, comm.size // size, tasks_rank
 
 
+# Function and calculator of a worker process of process_map():
+_process_map_worker = None
+
+
+def _init_process_map_worker(function, calc):
+    global _process_map_worker
+    _process_map_worker = (function, calc)
+
+
+def _run_process_map_task(atoms):
+    function, calc = _process_map_worker
+    calc.reset()
+    atoms.calc = calc
+    return function(atoms)
+
+
+def process_map(function, calc, images, workers):
+    """Calculate function(atoms) for images in a pool of processes.
+
+    Every worker process gets its own copy of the calculator *calc*,
+    which is reset and attached to the images before *function* is
+    called.  *function* must be picklable.  Results are yielded in the
+    order of *images* and, since no state is carried over from one image
+    to the next, do not depend on which process did which calculation.
+
+    This is meant for serial runs of calculators that are cheap to copy
+    and can not use MPI; it can not be combined with MPI parallelization.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if world.size > 1:
+        raise RuntimeError('Process pools can not be used in MPI runs')
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_process_map_worker,
+                             initargs=(function, calc)) as executor:
+        for result in executor.map(_run_process_map_task, images):
+            yield result
+
+
 class ParallelModuleWrapper:
     def __getattr__(self, name):
         if name == 'rank' or name == 'size':
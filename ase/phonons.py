@@ -5,6 +5,7 @@ import pickle
 from math import pi, sqrt
 from os import remove
 from os.path import isfile
+from time import time
 import warnings
 
 import numpy as np
@@ -13,7 +14,7 @@ import numpy.fft as fft
 
 import ase
 import ase.units as units
-from ase.parallel import world
+from ase.parallel import world, process_map
 from ase.dft import monkhorst_pack
 from ase.io.trajectory import Trajectory
 from ase.utils import opencew, pickleload
@@ -148,7 +149,7 @@ class Displacement:
 
         self.indices = indices
 
-    def run(self):
+    def run(self, workers=None):
         """Run the calculations for the required displacements.
 
         This will do a calculation for 6 displacements per atom, +-x, +-y, and
@@ -157,6 +158,11 @@ class Displacement:
         file (ending with .pckl), which must be deleted before restarting the
         job. Otherwise the calculation for that displacement will not be done.
 
+        With *workers*, the calculations are done by a pool of that many
+        local processes, each with its own copy of the calculator (see
+        :func:`ase.parallel.process_map`).  The files are written in the
+        usual order by this process.
+
         """
 
         # Atoms in the supercell -- repeated in the lattice vector directions
@@ -165,6 +171,11 @@ class Displacement:
 
         # Set calculator if provided
         assert self.calc is not None, "Provide calculator in __init__ method"
+
+        if workers is not None:
+            self.run_process_pool(atoms_N, workers)
+            return
+
         atoms_N.calc = self.calc
 
         # Do calculation on equilibrium structure
@@ -210,6 +221,58 @@ class Displacement:
                     # Return to initial positions
                     atoms_N.positions[offset + a, i] = pos[a, i]
 
+    def run_process_pool(self, atoms_N, workers):
+        """Calculate the missing displacements in a pool of processes."""
+        natoms = len(self.atoms)
+        offset = natoms * self.offset
+
+        # Reserve the files, but only keep them open while writing:
+        tasks = []
+        filename = self.name + '.eq.pckl'
+        fd = opencew(filename)
+        if fd is not None:
+            fd.close()
+            tasks.append((filename, atoms_N.copy()))
+
+        for a in self.indices:
+            for i in range(3):
+                for sign in [-1, 1]:
+                    filename = '%s.%d%s%s.pckl' % (self.name, a, 'xyz'[i],
+                                                   ' +-'[sign])
+                    fd = opencew(filename)
+                    if fd is None:
+                        # Skip if already done
+                        continue
+                    fd.close()
+                    atoms = atoms_N.copy()
+                    atoms.positions[offset + a, i] += sign * self.delta
+                    tasks.append((filename, atoms))
+
+        t0 = time()
+        ndone = 0
+        try:
+            outputs = process_map(self, self.calc,
+                                  [atoms for filename, atoms in tasks],
+                                  workers)
+            for (filename, atoms), output in zip(tasks, outputs):
+                with open(filename, 'wb') as fd:
+                    pickle.dump(output, fd, protocol=2)
+                sys.stdout.write('Writing %s\n' % filename)
+                sys.stdout.flush()
+                ndone += 1
+        finally:
+            # Empty files would be taken as done by the next run:
+            if world.rank == 0:
+                for filename, atoms in tasks[ndone:]:
+                    remove(filename)
+
+        if tasks:
+            t = time() - t0
+            sys.stdout.write('Calculated %d displacements in %.3f s '
+                             '(%.3f per second) with %d processes\n' %
+                             (len(tasks), t, len(tasks) / t, workers))
+            sys.stdout.flush()
+
     def clean(self):
         """Delete generated pickle files."""
 
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from ase.build import bulk, molecule
+from ase.calculators.calculator import (Calculator,
+                                        PropertyNotImplementedError)
+from ase.calculators.emt import EMT
+from ase.calculators.lj import LennardJones
+from ase.calculators.morse import MorsePotential
+from ase.neighborlist import CSRNeighborList
+
+
+def images():
+    alloy = bulk('Cu', 'fcc', a=3.6, cubic=True) * (2, 2, 2)
+    alloy.numbers[::3] = 79
+    slab = bulk('Al', 'fcc', a=4.05, cubic=True) * (2, 2, 1)
+    slab.pbc = (True, True, False)
+    images = [alloy, slab, bulk('Ni', 'fcc', a=3.52)]
+    for n, atoms in enumerate(images):
+        atoms.rattle(0.05, seed=n)
+    return images
+
+
+calculators = [
+    lambda: EMT(),
+    lambda: LennardJones(sigma=2.3, epsilon=0.2, rc=5.5),
+    lambda: LennardJones(sigma=2.3, epsilon=0.2, rc=5.5, smooth=True),
+    lambda: MorsePotential(epsilon=0.3, r0=2.6, rho0=4.0, rc=6.0),
+    lambda: MorsePotential(epsilon=0.3, r0=2.6, rho0=4.0)]
+
+
+@pytest.mark.parametrize('factory', calculators)
+def test_batch_matches_serial(factory):
+    calc = factory()
+    properties = ['energy', 'forces']
+    if 'energies' in calc.implemented_properties:
+        properties.append('energies')
+    results = calc.calculate_batch(images(), properties)
+
+    for atoms, batch in zip(images(), results):
+        serial = factory()
+        assert set(batch) == set(properties)
+        for name in properties:
+            ref = serial.get_property(name, atoms)
+            assert batch[name] == pytest.approx(ref, abs=1e-10)
+
+
+@pytest.mark.parametrize('factory', calculators[:4])
+def test_batch_stress(factory):
+    bulks = [atoms for atoms in images() if atoms.pbc.all()]
+    results = factory().calculate_batch(bulks, ['stress'])
+    for atoms, batch in zip(bulks, results):
+        ref = factory().get_stress(atoms)
+        assert batch['stress'] == pytest.approx(ref, abs=1e-10)
+
+
+def test_default_is_serial():
+    calc = EMT()
+    batch = Calculator.calculate_batch(calc, images(), ['energy'])
+    vectorized = calc.calculate_batch(images(), ['energy'])
+    energies = [results['energy'] for results in batch]
+    assert energies == pytest.approx([results['energy']
+                                      for results in vectorized])
+
+
+def test_batch_errors():
+    calc = LennardJones()
+    with pytest.raises(PropertyNotImplementedError):
+        calc.calculate_batch(images(), ['magmom'])
+    with pytest.raises(PropertyNotImplementedError):
+        calc.calculate_batch([molecule('H2O')], ['stress'])
+    assert calc.calculate_batch([], ['energy']) == []
+
+
+def test_batch_resets_calculator():
+    atoms = bulk('Cu') * (2, 2, 2)
+    atoms.calc = EMT()
+    e0 = atoms.get_potential_energy()
+    results = atoms.calc.calculate_batch(images(), ['energy'])
+    assert len(results) == 3
+    assert atoms.calc.atoms is None
+    assert atoms.get_potential_energy() == pytest.approx(e0)
+    assert np.allclose(atoms.get_forces(), 0.0)
+
+
+class SerialEMT(EMT):
+    calculate_batch = Calculator.calculate_batch
+
+
+def test_numerical_forces():
+    atoms = images()[0]
+    atoms.calc = EMT()
+    forces = atoms.get_forces()
+    batched = atoms.calc.calculate_numerical_forces(atoms, d=1e-5)
+    assert batched == pytest.approx(forces, abs=1e-6)
+    # without a calculate_batch() of its own, atoms.calc is used:
+    serial = SerialEMT().calculate_numerical_forces(atoms, d=1e-5)
+    assert serial == pytest.approx(batched, abs=1e-6)
+
+
+@pytest.mark.parametrize('factory', calculators[:4])
+def test_numerical_forces_reuse_neighbor_list(factory, monkeypatch):
+    atoms = bulk('Cu', cubic=True).repeat(2)
+    atoms.rattle(0.02, seed=3)
+    atoms.calc = factory()
+    builds = []
+    build = CSRNeighborList.build
+    monkeypatch.setattr(CSRNeighborList, 'build',
+                        lambda nl, atoms: builds.append(build(nl, atoms)))
+    atoms.calc.calculate_numerical_forces(atoms)
+    # one list for all displaced images:
+    assert len(builds) == 1
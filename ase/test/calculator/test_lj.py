@@ -101,3 +101,41 @@ def test_bulk_stress(atoms_bulk):
     pressure = sum(stress[:3]) / 3
 
     assert pressure == reference_pressure
+
+
+def test_bulk_rattled_forces_stress():
+    # the pair-array implementation must agree with finite differences
+    # also when neighbours are shared between many atoms
+    atoms = bulk("Ar", "fcc", a=5.2) * (2, 2, 2)
+    atoms.rattle(0.1, seed=42)
+    atoms.calc = LennardJones(sigma=3.4, epsilon=0.01, rc=8.0)
+
+    forces = atoms.get_forces()
+    numerical = atoms.calc.calculate_numerical_forces(atoms, d=1e-5)
+    np.testing.assert_allclose(forces, numerical, atol=1e-8)
+
+    stress = atoms.get_stress()
+    numerical = atoms.calc.calculate_numerical_stress(atoms, d=1e-5)
+    np.testing.assert_allclose(stress, numerical, atol=1e-8)
+    np.testing.assert_allclose(atoms.get_stresses().sum(axis=0), stress)
+
+
+def test_smooth_cutoff():
+    calc = LennardJones(rc=3.0, ro=2.0, smooth=True)
+
+    # energy and force go to zero at the cutoff
+    atoms = Atoms('H2', positions=[[0, 0, 0], [0, 0, 3.0 - 1e-8]])
+    atoms.calc = calc
+    assert atoms.get_potential_energy() == pytest.approx(0.0, abs=1e-12)
+    np.testing.assert_allclose(atoms.get_forces(), 0, atol=1e-6)
+
+    # below the onset the smooth potential equals the plain one
+    atoms.positions[1, 2] = 1.5
+    energy = atoms.get_potential_energy()
+    assert energy == pytest.approx(4 * (1.5 ** -12 - 1.5 ** -6))
+
+    # in the switching region forces are consistent with the energy
+    atoms.positions[1, 2] = 2.5
+    forces = atoms.get_forces()
+    numerical = calc.calculate_numerical_forces(atoms, d=1e-6)
+    np.testing.assert_allclose(forces, numerical, atol=1e-8)
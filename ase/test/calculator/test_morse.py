@@ -1,6 +1,13 @@
+import numpy as np
+import pytest
+
 from ase import Atoms
+from ase.build import bulk
+from ase.cluster import Icosahedron
 from ase.vibrations import Vibrations
+from ase.calculators.calculator import PropertyNotImplementedError
 from ase.calculators.morse import MorsePotential
+from ase.neighborlist import get_shared_neighbor_list
 
 De = 5.
 Re = 3.
@@ -19,3 +26,97 @@ def test_gs_vibrations():
     atoms.calc = MorsePotential(epsilon=De, r0=Re, rho0=rho0)
     vib = Vibrations(atoms)
     vib.run()
+
+
+def reference_energy_and_forces(atoms, epsilon, rho0, r0):
+    """Pair-by-pair Morse energy and forces without cutoff."""
+    from math import exp, sqrt
+    positions = atoms.get_positions()
+    energy = 0.0
+    forces = np.zeros((len(atoms), 3))
+    preF = 2 * epsilon * rho0 / r0
+    for i1, p1 in enumerate(positions):
+        for i2, p2 in enumerate(positions[:i1]):
+            diff = p2 - p1
+            r = sqrt(np.dot(diff, diff))
+            expf = exp(rho0 * (1.0 - r / r0))
+            energy += epsilon * expf * (expf - 2)
+            F = preF * expf * (expf - 1) * diff / r
+            forces[i1] -= F
+            forces[i2] += F
+    return energy, forces
+
+
+def test_cluster_matches_pair_loop():
+    atoms = Icosahedron('Cu', 3, latticeconstant=3.6)
+    atoms.rattle(0.05, seed=1)
+    atoms.calc = MorsePotential(epsilon=De, r0=2.5, rho0=rho0)
+    energy, forces = reference_energy_and_forces(atoms, De, rho0, 2.5)
+    assert atoms.get_potential_energy() == pytest.approx(energy, rel=1e-12)
+    assert atoms.get_forces() == pytest.approx(forces, abs=1e-10)
+    assert atoms.get_potential_energies().sum() == pytest.approx(energy)
+
+
+@pytest.mark.parametrize('smooth', [False, True])
+def test_bulk_cutoff_forces_stress(smooth):
+    atoms = bulk('Cu', 'fcc', a=3.6, cubic=True) * (2, 2, 2)
+    atoms.rattle(0.05, seed=2)
+    atoms.set_cell(atoms.cell * [1.0, 1.02, 0.98], scale_atoms=True)
+    atoms.calc = MorsePotential(epsilon=0.4, r0=2.5, rho0=4.0, rc=5.0,
+                                smooth=smooth)
+
+    forces = atoms.get_forces()
+    numerical = atoms.calc.calculate_numerical_forces(atoms, d=1e-5)
+    np.testing.assert_allclose(forces, numerical, atol=1e-7)
+
+    stress = atoms.get_stress()
+    numerical = atoms.calc.calculate_numerical_stress(atoms, d=1e-5)
+    np.testing.assert_allclose(stress, numerical, atol=1e-7)
+
+    stresses = atoms.get_stresses()
+    assert stresses.sum(axis=0) == pytest.approx(stress)
+
+
+def test_no_stress_without_cutoff():
+    atoms = bulk('Cu', 'fcc', a=3.6, cubic=True)
+    atoms.calc = MorsePotential(epsilon=0.4, r0=2.5, rho0=4.0)
+    atoms.get_potential_energy()
+    with pytest.raises(PropertyNotImplementedError):
+        atoms.get_stress()
+    with pytest.raises(PropertyNotImplementedError):
+        atoms.calc.calculate_batch([atoms], ['stress'])
+
+
+@pytest.mark.parametrize('rc', [None, 5.0])
+def test_chunks(rc):
+    atoms = bulk('Cu', 'fcc', a=3.6, cubic=True) * (2, 2, 2)
+    atoms.rattle(0.05, seed=4)
+    if rc is None:
+        atoms.pbc = False
+    atoms.calc = MorsePotential(epsilon=0.4, r0=2.5, rho0=4.0, rc=rc)
+    energies = atoms.get_potential_energies()
+    forces = atoms.get_forces()
+    stresses = atoms.get_stresses()
+    calc = MorsePotential(epsilon=0.4, r0=2.5, rho0=4.0, rc=rc)
+    calc.chunk_size = 7
+    assert calc.get_potential_energies(atoms) == pytest.approx(energies)
+    assert calc.get_forces(atoms) == pytest.approx(forces, abs=1e-12)
+    assert calc.get_stresses(atoms) == pytest.approx(stresses, abs=1e-12)
+
+
+def test_neighbor_list_reused():
+    atoms = bulk('Cu', 'fcc', a=3.6) * (3, 3, 3)
+    calc = MorsePotential(epsilon=0.4, r0=2.5, rho0=4.0, rc=5.0, skin=0.5)
+    atoms.calc = calc
+    e0 = atoms.get_potential_energy()
+    nl = get_shared_neighbor_list(atoms, 5.0, skin=0.5)
+    assert nl.nupdates == 1
+    for seed in range(3):
+        atoms.rattle(0.02, seed=seed)
+        atoms.get_potential_energy()
+    assert nl.nupdates == 1
+
+    # an infinite crystal has the same energy per atom as the unit cell
+    prim = bulk('Cu', 'fcc', a=3.6)
+    prim.calc = MorsePotential(epsilon=0.4, r0=2.5, rho0=4.0, rc=5.0)
+    assert e0 / len(atoms) == pytest.approx(prim.get_potential_energy())
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from ase.build import bulk
+from ase.calculators.singlepoint import SinglePointCalculator
+from ase.cli.convert import write_images
+from ase.io import read, write
+
+
+@pytest.fixture
+def images():
+    images = []
+    for n in range(5):
+        atoms = bulk('Cu') * (1, 1, n + 1)
+        atoms.calc = SinglePointCalculator(atoms, energy=-n)
+        images.append(atoms)
+    return images
+
+
+@pytest.mark.parametrize('output', ['out.traj', 'out.xyz', 'out.db',
+                                    'out.json', 'out.cif'])
+def test_convert(cli, images, output):
+    write('in.traj', images)
+    cli.ase('convert', '-v', '-e', 'atoms.info["_output"] = len(atoms) != 2',
+            'in.traj', output)
+    assert [len(atoms) for atoms in read(output, ':')] == [1, 3, 4, 5]
+
+
+def test_convert_exists(cli, images):
+    write('in.traj', images)
+    write('out.xyz', images[0])
+    cli.ase('convert', 'in.traj', 'out.xyz', expect_fail=True)
+    cli.ase('convert', '-f', '-n', '1:3', 'in.traj', 'out.xyz')
+    assert len(read('out.xyz', ':')) == 2
+
+
+@pytest.mark.parametrize('name', ['x.traj', 'x.xyz'])
+def test_convert_in_place(cli, name):
+    images = [bulk('Cu') * (1, 1, 1 + n % 3) for n in range(250)]
+    write(name, images)
+    cli.ase('convert', '-f', '-e', 'atoms.info["n"] = len(atoms)',
+            name, name)
+    images = read(name, ':')
+    assert len(images) == 250
+    assert images[-1].info['n'] == 1 + 249 % 3
+    assert sorted(os.listdir()) == [name]
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 100])
+def test_write_images_batches(images, batch_size):
+    write_images('out.xyz', iter(images), batch_size=batch_size)
+    assert [len(atoms) for atoms in read('out.xyz', ':')] == [1, 2, 3, 4, 5]
+
+
+def test_write_images_empty():
+    write_images('out.xyz', iter([]))
+    assert os.path.getsize('out.xyz') == 0
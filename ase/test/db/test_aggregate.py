@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from ase import Atoms
+from ase.calculators.singlepoint import SinglePointCalculator
+from ase.db import connect
+
+
+@pytest.fixture
+def images():
+    images = []
+    for n in range(20):
+        atoms = Atoms(['H', 'O', 'HO', 'OHH'][n % 4])
+        if n % 3:
+            atoms.calc = SinglePointCalculator(atoms, energy=0.1 * n - 1)
+        images.append(atoms)
+    return images
+
+
+@pytest.fixture
+def kvps():
+    kvps = []
+    for n in range(20):
+        kvp = {'group': n % 3, 'kind': 'ab'[n % 2]}
+        if n % 5:
+            kvp['x'] = n**2
+        kvps.append(kvp)
+    return kvps
+
+
+def reference(images, kvps, group_by, key, ids=range(20)):
+    groups = {}
+    for n in ids:
+        kvp = dict(kvps[n], formula=images[n].get_chemical_formula('metal'))
+        if images[n].calc is not None:
+            kvp['energy'] = images[n].get_potential_energy()
+        group = tuple(kvp.get(name) for name in group_by)
+        groups.setdefault(group, [0, []])
+        groups[group][0] += 1
+        if key in kvp:
+            groups[group][1].append(kvp[key])
+    return groups
+
+
+@pytest.mark.parametrize('name', ['x.db', 'x.json'])
+@pytest.mark.parametrize('group_by', [[], ['formula'], ['group', 'kind']])
+@pytest.mark.parametrize('key', ['energy', 'x'])
+def test_aggregate(name, group_by, key, images, kvps):
+    db = connect(name)
+    db.write_many(images, kvps)
+    stats = ['{}({})'.format(function, key)
+             for function in ['count', 'sum', 'mean', 'std', 'min', 'max']]
+    results = db.aggregate(group_by=group_by, stats=stats)
+    groups = reference(images, kvps, group_by, key)
+    assert [tuple(result[name] for name in group_by)
+            for result in results] == sorted(groups)
+    for result in results:
+        n, values = groups[tuple(result[name] for name in group_by)]
+        assert result['count'] == n
+        assert result['count({})'.format(key)] == len(values)
+        if values:
+            assert result['sum({})'.format(key)] == pytest.approx(sum(values))
+            assert result['mean({})'.format(key)] == pytest.approx(
+                np.mean(values))
+            assert result['std({})'.format(key)] == pytest.approx(
+                np.std(values), abs=1e-6)
+            assert result['min({})'.format(key)] == min(values)
+            assert result['max({})'.format(key)] == max(values)
+        else:
+            assert result['mean({})'.format(key)] is None
+
+
+@pytest.mark.parametrize('name', ['x.db', 'x.json'])
+def test_aggregate_selection(name, images, kvps):
+    db = connect(name)
+    db.write_many(images, kvps)
+    results = db.aggregate('H>0,group>0', group_by='formula',
+                           stats='min(energy)')
+    ids = [n for n in range(20)
+           if 'H' in images[n].symbols and kvps[n]['group'] > 0]
+    groups = reference(images, kvps, ['formula'], 'energy', ids)
+    assert [result['formula'] for result in results] == sorted(
+        group[0] for group in groups)
+    for result in results:
+        assert result['min(energy)'] == pytest.approx(
+            min(groups[(result['formula'],)][1]))
+    assert db.aggregate('group=7', stats='max(x)') == [
+        {'count': 0, 'max(x)': None}]
+    assert db.aggregate('group=7', group_by='kind') == []
+    with pytest.raises(ValueError):
+        db.aggregate(stats='median(energy)')
+
+
+@pytest.mark.parametrize('name', ['x.db', 'x.json'])
+def test_aggregate_empty_string(name):
+    db = connect(name)
+    db.write(Atoms('H'), tag='', e=1.0)
+    db.write(Atoms('H'), tag='a')
+    db.write(Atoms('H'), tag='a', e=3.0)
+    results = db.aggregate(group_by='tag', stats='max(e)')
+    assert results == [{'tag': '', 'count': 1, 'max(e)': 1.0},
+                       {'tag': 'a', 'count': 2, 'max(e)': 3.0}]
+
+
+@pytest.mark.parametrize('name', ['x.db', 'x.json'])
+def test_aggregate_std_with_offset(name):
+    rng = np.random.RandomState(42)
+    values = -123456.789 + rng.normal(scale=1e-3, size=200)
+    db = connect(name)
+    db.write_many([None] * 400,
+                  [{'e': e, 'kind': 'a'} for e in values] +
+                  [{'e': e + 1e6, 'kind': 'b'} for e in values])
+    for result in db.aggregate(group_by='kind', stats='std(e)'):
+        assert result['std(e)'] == pytest.approx(np.std(values), rel=1e-5)
+    result, = db.aggregate(stats=['mean(e)', 'std(e)'])
+    assert result['mean(e)'] == pytest.approx(np.mean(values) + 5e5)
+    assert result['std(e)'] == pytest.approx(5e5, rel=1e-9)
+
+
+def test_aggregate_without_window_functions(images, kvps, monkeypatch):
+    from ase.db.sqlite import SQLite3Database
+    monkeypatch.setattr(SQLite3Database, 'window_functions', False)
+    test_aggregate('x.db', ['group', 'kind'], 'x', images, kvps)
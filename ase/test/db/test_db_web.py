@@ -74,3 +74,34 @@ def test_db_web(client):
         atoms = read(io.StringIO(resp.data.decode()), format=type)
         print(atoms.numbers)
         assert (atoms.numbers == [1, 1, 8]).all()
+
+
+@pytest.mark.parametrize('sort', ['', '-id', 'g', '-g', 'age'])
+def test_keyset_pagination(tmp_path, sort):
+    pytest.importorskip('flask')
+    from ase.db.web import Session
+    from ase.db.app import handle_query
+    db = connect(tmp_path / 'x.db')
+    db.write_many([Atoms('H')] * 23,
+                  [{'g': n % 3} if n % 5 else {} for n in range(23)])
+    project = {'default_columns': ['id', 'g', 'age'],
+               'handle_query_function': handle_query}
+    session = Session('name')
+    session.update('query', '', {'query': ''}, project)
+    session.sort = sort
+    session.limit = 4
+    ids = []
+    for page in range(7):
+        session.page = page
+        table = session.create_table(db, 'id', [])
+        ids += [row.dct.id for row in table.rows]
+    assert session.nrows == 23
+    assert ids == [row.id for row in db.select(sort=sort or None)]
+
+    # Cached table is thrown away when the database changes:
+    session.page = 0
+    assert len(session.create_table(db, 'id', []).rows) == 4
+    db.delete(ids[:3])
+    assert [row.dct.id for row in session.create_table(db, 'id', []).rows
+            ] == ids[3:7]
+    assert session.nrows == 20
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from ase import Atoms
+from ase.db import connect
+
+
+@pytest.fixture
+def db():
+    db = connect('x.db')
+    db.write_many([Atoms('H{}'.format(n + 1)) for n in range(10)])
+    return db
+
+
+def test_write_and_read_external_table(db):
+    ids = [1, 2, 3]
+    db.write_external_table('tab', ids, [{'a': 1.0, 'b': 2.0}] * 3)
+    db.write_external_table('tab', [2, 4], [[5.0, 6.0], [7.0, 8.0]],
+                            keys=['b', 'c'])
+    assert db.read_external_table('tab') == {
+        1: {'a': 1.0, 'b': 2.0},
+        2: {'a': 1.0, 'b': 5.0, 'c': 6.0},
+        3: {'a': 1.0, 'b': 2.0},
+        4: {'b': 7.0, 'c': 8.0}}
+    assert db.read_external_table('tab', [4, 5]) == {4: {'b': 7.0, 'c': 8.0}}
+    assert db.get(2).tab == {'a': 1.0, 'b': 5.0, 'c': 6.0}
+    assert db.get(5).tab == {}
+
+    with pytest.raises(ValueError):
+        db.write_external_table('tab', [1], [{'a': 1}])
+    with pytest.raises(ValueError):
+        db.write_external_table('tab', [1, 2], [[1.0]], keys=['a'])
+    with pytest.raises(KeyError):
+        db.read_external_table('nothing')
+
+
+def test_vectors(db):
+    rng = np.random.RandomState(17)
+    vectors = rng.rand(10, 5)
+    ids = list(range(1, 11))
+    db.write_vectors('features', ids, vectors)
+    assert (db.read_vectors('features', ids[::-1]) == vectors[::-1]).all()
+    assert (db.get(3).features == vectors[2]).all()
+
+    # Overwrite some vectors and use another dtype:
+    fingerprints = rng.randint(2, size=(3, 8)).astype(np.uint8)
+    db.write_vectors('fingerprints', [1, 2, 3], fingerprints)
+    db.write_vectors('features', [1, 2], np.zeros((2, 5)))
+    assert (db.read_vectors('features', [1, 2]) == 0.0).all()
+    fp = db.read_vectors('fingerprints', [1, 2, 3])
+    assert fp.dtype == np.uint8
+    assert (fp == fingerprints).all()
+    with pytest.raises(KeyError):
+        db.read_vectors('fingerprints', [3, 4])
+
+    rows = list(db.select('id<=3'))
+    assert [(row.fingerprints == fingerprints[i]).all()
+            for i, row in enumerate(rows)] == [True] * 3
+    assert (rows[2].features == vectors[2]).all()
+
+    with pytest.raises(ValueError):
+        db.write_vectors('features', [1], [np.zeros((2, 2))])
+    with pytest.raises(ValueError):
+        db.write_external_table('features', [1], [{'a': 1.0}])
+
+    db.delete([2, 3])
+    assert sorted(db.read_external_table('features')) == [1] + ids[3:]
+    assert sorted(db.read_external_table('fingerprints')) == [1]
+
+
+def test_write_many_with_external_tables(db):
+    images = [Atoms('H')] * 4
+    kvps = [{'external_tables': {'tab': {'x': float(n)},
+                                 'vec': np.arange(n + 1.0)}}
+            for n in range(4)]
+    ids = db.write_many(images, kvps)
+    assert db.read_external_table('tab', ids) == {
+        id: {'x': float(n)} for n, id in enumerate(ids)}
+    assert (db.get(ids[2]).vec == [0.0, 1.0, 2.0]).all()
+    db.update(ids[0], external_tables={'tab': {'x': 7.0, 'y': 1.0}})
+    assert db.get(ids[0]).tab == {'x': 7.0, 'y': 1.0}
+    with pytest.raises(ValueError):
+        db.write(Atoms('H'), external_tables={'tab': {'x': 1}})
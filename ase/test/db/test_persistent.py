@@ -0,0 +1,108 @@
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from ase import Atoms
+from ase.db import connect
+
+
+def work(filename, n):
+    db = connect(filename, persistent=True)
+    ids = []
+    for i in range(10):
+        ids.append(db.write(Atoms('H'), worker=n, i=i))
+        db.count(worker=n)
+    db.update(ids[0], done=True)
+    ids += db.write_many([Atoms('He')] * 3, {'worker': n})
+    db.close()
+    return ids
+
+
+def test_persistent(tmp_path):
+    filename = str(tmp_path / 'x.db')
+    db = connect(filename, persistent=True)
+    id = db.write(Atoms('H2'), a=1)
+    assert db.get(id).a == 1
+    assert not os.path.exists(filename + '.lock')
+    con = db._connect()
+    assert con is db._connect()
+    assert con.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    with db:
+        db.write(Atoms('H'), a=2)
+        db.update(id, b=3)
+    assert db.count() == 2
+    assert db.get(id).b == 3
+
+    with pytest.raises(RuntimeError):
+        with db:
+            db.write(Atoms('H'), a=3)
+            raise RuntimeError
+    assert db.count() == 2
+    assert db.connection is None
+
+    assert db.reserve(name='x') is not None
+    assert db.reserve(name='x') is None
+
+    db2 = pickle.loads(pickle.dumps(db))
+    assert db2.count(a=2) == 1
+    assert db2.count(name='x') == 1
+    db.close()
+    db2.close()
+
+
+def test_concurrent_writers(tmp_path):
+    filename = str(tmp_path / 'x.db')
+    connect(filename, persistent=True).count()
+    with ProcessPoolExecutor(4) as pool:
+        results = list(pool.map(work, [filename] * 4, range(4)))
+    ids = [id for worker_ids in results for id in worker_ids]
+    assert sorted(ids) == list(range(1, 53))
+    db = connect(filename)
+    assert db.count() == 52
+    assert db.count(done=True) == 4
+    assert db.count('He,worker=2') == 3
+
+
+def test_threads(tmp_path):
+    db = connect(str(tmp_path / 'x.db'), persistent=True)
+    started = threading.Event()
+
+    def rollback():
+        with pytest.raises(RuntimeError):
+            with db:
+                db.write(Atoms('H'), a=1)
+                started.set()
+                time.sleep(0.2)
+                raise RuntimeError
+
+    def write():
+        started.wait()
+        # Must wait for the other thread's transaction and not join it:
+        with db:
+            assert db.connection is not None
+            return db.write(Atoms('H'), b=1)
+
+    def write_many(n):
+        ids = []
+        for i in range(10):
+            with db:
+                ids.append(db.write(Atoms('H'), n=n, i=i))
+        return ids
+
+    with ThreadPoolExecutor(2) as pool:
+        results = [pool.submit(rollback), pool.submit(write)]
+        id = results[1].result()
+        results[0].result()
+    assert db.count(a=1) == 0
+    assert db.get(b=1).id == id
+
+    with ThreadPoolExecutor(4) as pool:
+        ids = [id for ids in pool.map(write_many, range(4)) for id in ids]
+    assert len(set(ids)) == 40
+    assert db.count('n') == 40
+    db.close()
@@ -0,0 +1,88 @@
+import pytest
+
+from ase import Atoms
+from ase.db import connect
+from ase.db.sqlite import covering_index_statements, selectivity
+
+queries = ['a=1', 'a>3,b=x', 'b=y,a<5,c', 'H>1,a>=2', 'H=0', 'O<1,b!=x',
+           'c,b=x,a!=2', 'b>w,d', '-c', 'a=3,-d']
+
+
+@pytest.fixture
+def db():
+    db = connect('x.db')
+    images = [Atoms('H{}O{}'.format(n % 3, n % 2)) for n in range(20)]
+    kvps = []
+    for n in range(20):
+        kvp = {'a': n % 7, 'b': 'xyz'[n % 3]}
+        if n % 4 == 0:
+            kvp['c'] = True
+        if n % 5 == 0:
+            kvp['d'] = 1.5 * n
+        kvps.append(kvp)
+    db.write_many(images, kvps)
+    return db
+
+
+def ids(db, query, **kwargs):
+    return [row.id for row in db.select(query, include_data=False, **kwargs)]
+
+
+def test_same_results(db):
+    before = {query: ids(db, query) for query in queries}
+    sorted_before = ids(db, 'a>1', sort='-b')
+    db.analyse()
+    assert db._get_statistics()['keys']['c'] == 5
+    for query in queries:
+        assert ids(db, query) == before[query], query
+        assert db.count(query) == len(before[query])
+    assert ids(db, 'a>1', sort='-b') == sorted_before
+
+
+def test_explain(db):
+    db.analyse()
+    plan = [row['explain'][3] for row in db.select('a<5,d,b=x',
+                                                   explain=True)
+            if row['explain'][3].startswith('PLAN')]
+    assert plan[0].startswith("PLAN JOIN keys WHERE key='d'")
+    assert 'b' in plan[1] and 'a' in plan[2]
+    assert all('EXISTS' in step for step in plan[1:])
+
+
+def test_analyse_creates_indices(db):
+    names = [statement.split()[2] for statement in covering_index_statements]
+    with db.managed_connection() as con:
+        for name in names:
+            con.execute('DROP INDEX {}'.format(name))
+    before = ids(db, 'a>3,b=x')
+    db.analyse()
+    with db.managed_connection() as con:
+        found = [name for name, in con.execute(
+            'SELECT name FROM sqlite_master WHERE type="index"')]
+    assert set(names) <= set(found)
+    assert ids(db, 'a>3,b=x') == before
+
+
+def test_keys_written_after_analyse(db):
+    db.analyse()
+    db.write(Atoms('H'), e=1, a=3)
+    statistics = db._get_statistics()
+    assert 'e' not in statistics['keys']
+    guess = selectivity(None, 'keys', 'e')
+    assert selectivity(statistics, 'keys', 'e') == guess
+    assert ids(db, 'a=3,e=1') == [21]
+    plan = [row['explain'][3] for row in db.select('b=x,e', explain=True)
+            if row['explain'][3].startswith('PLAN')]
+    assert "key='b'" in plan[0]
+
+
+@pytest.mark.parametrize('sort', ['d', '-d'])
+def test_sort_with_missing_values(db, sort):
+    json = connect('x.json')
+    for row in db.select():
+        json.write(row, **row.key_value_pairs)
+    assert ids(db, None, sort=sort) == ids(json, None, sort=sort)
+    # rows without a value come last, in id order:
+    rows = list(db.select(sort=sort))
+    missing = [row.id for row in rows if row.get(sort.lstrip('-')) is None]
+    assert [row.id for row in rows[-len(missing):]] == sorted(missing)
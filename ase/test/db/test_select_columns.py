@@ -0,0 +1,69 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from ase.build import bulk, molecule
+from ase.calculators.singlepoint import SinglePointCalculator
+from ase.constraints import FixAtoms
+from ase.db import connect
+
+
+@pytest.fixture
+def db():
+    db = connect('x.db')
+    atoms = molecule('H2O', vacuum=2.0)
+    forces = [[0, 0, 3], [0, 4, 0], [1, 1, 1]]
+    atoms.calc = SinglePointCalculator(atoms, energy=-1.0, forces=forces)
+    atoms.constraints = FixAtoms(indices=[0])
+    db.write(atoms, name='water', external_tables={'tab': {'x': 1.0}})
+    db.write(bulk('Cu'), name='copper')
+    return db
+
+
+def test_lazy_arrays(db):
+    row = db.get(name='water')
+    assert 'positions' in row
+    assert 'forces' in row
+    assert 'stress' not in row
+    assert set(row.__dict__['_lazy']) >= {'numbers', 'positions', 'forces'}
+    assert 'positions' not in row.__dict__
+    assert row.positions.shape == (3, 3)
+    assert 'positions' in row.__dict__
+    assert 'positions' in list(row)
+    assert row.fmax == pytest.approx(4.0)
+    atoms = row.toatoms()
+    assert (atoms.get_forces(apply_constraint=False)[0] == [0, 0, 3]).all()
+    row2 = pickle.loads(pickle.dumps(row))
+    assert (row2.forces == row.forces).all()
+
+
+def test_columns(db):
+    rows = list(db.select(columns=['energy', 'fmax', 'natoms', 'mass'],
+                          include_data=False))
+    assert [row.id for row in rows] == [1, 2]
+    water, copper = rows
+    assert 'positions' not in water
+    assert 'forces' not in water
+    assert 'tab' not in water
+    assert water.energy == -1.0
+    assert water.natoms == 3
+    assert water.fmax == pytest.approx(4.0)
+    assert water.mass == pytest.approx(db.get(1).toatoms().get_masses().sum())
+    assert water.get('name') is None
+    assert copper.get('energy') is None
+    assert copper.get('fmax') is None
+
+    row = next(db.select(name='water',
+                         columns=['numbers', 'key_value_pairs', 'tab']))
+    assert row.formula == 'H2O'
+    assert row.name == 'water'
+    assert row.tab == {'x': 1.0}
+    assert row.get('positions') is None
+
+
+def test_json_copy_of_lazy_row(db):
+    row = db.get(name='water')
+    json = connect('x.json')
+    json.write(row)
+    assert np.allclose(json.get(1).positions, db.get(1).positions)
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from ase.build import bulk
+from ase.calculators.singlepoint import SinglePointCalculator
+from ase.db import connect
+
+
+@pytest.fixture
+def images():
+    images = []
+    for n in range(7):
+        atoms = bulk('Cu') * (1, 1, n + 1)
+        atoms[0].symbol = 'Ag'
+        atoms.calc = SinglePointCalculator(atoms, energy=-n,
+                                           forces=np.ones((n + 1, 3)))
+        images.append(atoms)
+    return images
+
+
+@pytest.mark.parametrize('name', ['x.db', 'x.json'])
+def test_write_many(name, images):
+    db = connect(name)
+    db.write(images[0], a=1)
+    kvps = [{'n': n, 'even': n % 2 == 0, 'name': 'cu' * n}
+            for n in range(len(images))]
+    ids = db.write_many(images, kvps, data={'x': [1, 2]}, commit_size=3)
+    assert ids == list(range(2, 9))
+    assert db.count() == 8
+    assert db.count('even=True') == 4
+    assert db.count('Ag=1,n>2') == 4
+    for id, atoms, kvp in zip(ids, images, kvps):
+        row = db.get(id)
+        assert row.key_value_pairs == kvp
+        assert row.data.x == [1, 2]
+        assert row.energy == atoms.get_potential_energy()
+        assert (row.positions == atoms.positions).all()
+    assert db.write(None) == 9
+
+
+def test_write_many_same_key_value_pairs(images):
+    db = connect('x.db')
+    assert db.write_many(images, {'a': 'b'}) == list(range(1, 8))
+    assert db.count(a='b') == 7
+
+
+def test_deferred_indices(images):
+    db = connect('x.db')
+    with db.managed_connection() as con:
+        indices = con.execute('SELECT name FROM sqlite_master '
+                              'WHERE type="index"').fetchall()
+    db.write_many(images * 3, commit_size=5)
+    assert db.count() == 21
+    with db.managed_connection() as con:
+        assert con.execute('SELECT name FROM sqlite_master '
+                           'WHERE type="index"').fetchall() == indices
+    # Non-empty databases keep their indices:
+    db.write_many(images)
+    assert db.count() == 28
+
+
+def test_write_many_external_tables(images):
+    db = connect('x.db')
+    kvps = [{'external_tables': {'tab': {'a': n}}} for n in range(3)]
+    ids = db.write_many(images[:3], kvps)
+    assert [db.get(id=id)['tab']['a'] for id in ids] == [0, 1, 2]
+
+
+def test_write_many_lengths(images):
+    db = connect('x.db')
+    with pytest.raises(ValueError):
+        db.write_many(images, [{'a': 1}] * 3)
+    with pytest.raises(ValueError):
+        db.write_many(images[:2], {}, [{'x': 1}] * 3)
+    with pytest.raises(ValueError):
+        db.write_many(iter(images), iter([{'a': 1}] * 3))
+    with pytest.raises(ValueError):
+        db.write_many(iter(images[:2]), iter([{'a': 1}] * 3))
+    assert db.count() == 0
+
+
+def failing(images, n):
+    for atoms in images[:n]:
+        yield atoms
+    raise RuntimeError
+
+
+def indices(db):
+    with db.managed_connection() as con:
+        return con.execute('SELECT name FROM sqlite_master '
+                           'WHERE type="index"').fetchall()
+
+
+@pytest.mark.parametrize('persistent', [False, True])
+def test_write_many_failing(images, persistent):
+    db = connect('x.db', persistent=persistent)
+    names = indices(db)
+    # An empty database is filled in one transaction:
+    with pytest.raises(RuntimeError):
+        db.write_many(failing(images, 5), commit_size=2)
+    assert db.count() == 0
+    assert indices(db) == names
+
+    # Otherwise, commit_size rows are committed at a time:
+    db.write(None)
+    with pytest.raises(RuntimeError):
+        db.write_many(failing(images, 5), commit_size=2)
+    assert db.count() == 5
+
+    with pytest.raises(RuntimeError):
+        with db:
+            db.write_many(failing(images, 5), commit_size=2)
+    assert db.count() == 9
+    assert indices(db) == names
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from ase.build import bulk, molecule
+from ase.calculators.emt import EMT
+
+
+def alloy():
+    atoms = bulk('Cu', 'fcc', a=3.6) * (3, 3, 3)
+    atoms.numbers[::5] = 79
+    atoms.numbers[1::7] = 28
+    atoms.rattle(0.1, seed=42)
+    return atoms
+
+
+def benzene():
+    atoms = molecule('C6H6')
+    atoms.rattle(0.05, seed=42)
+    return atoms
+
+
+def calculate(atoms, vectorized):
+    atoms = atoms.copy()
+    atoms.calc = EMT(vectorized=vectorized)
+    results = {'energy': atoms.get_potential_energy(),
+               'energies': atoms.get_potential_energies(),
+               'forces': atoms.get_forces()}
+    if atoms.pbc.all():
+        results['stress'] = atoms.get_stress()
+    return results
+
+
+@pytest.mark.parametrize('factory', [alloy, benzene])
+def test_vectorized_matches_loop(factory):
+    atoms = factory()
+    ref = calculate(atoms, vectorized=False)
+    new = calculate(atoms, vectorized=True)
+    assert ref.keys() == new.keys()
+    for name in ref:
+        np.testing.assert_allclose(new[name], ref[name],
+                                   rtol=1e-10, atol=1e-10)
+
+
+def test_vectorized_stress():
+    atoms = alloy()
+    atoms.calc = EMT(vectorized=True)
+    s_analytical = atoms.get_stress()
+    s_numerical = atoms.calc.calculate_numerical_stress(atoms, 1e-5)
+    np.testing.assert_allclose(s_analytical, s_numerical, atol=1e-7)
+
+
+def test_vectorized_isolated_atom():
+    atoms = molecule('H2')
+    atoms.positions[1] += (0, 0, 20)
+    atoms.calc = EMT(vectorized=True)
+    ref = atoms.copy()
+    ref.calc = EMT()
+    assert atoms.get_potential_energy() == pytest.approx(
+        ref.get_potential_energy())
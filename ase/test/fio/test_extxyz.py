@@ -322,3 +322,61 @@ def test_json_scalars():
     assert abs(b.info['val_1'] - 42.0) < 1e-6
     assert abs(b.info['val_2'] - 42.0) < 1e-6
     assert abs(b.info['val_3'] - 42)  == 0
+
+
+@pytest.mark.parametrize('fast', [True, False])
+def test_column_types(monkeypatch, fast):
+    if not fast:
+        monkeypatch.setattr(extxyz, '_parse_atom_lines', lambda *args: None)
+    Path('types.xyz').write_text("""3
+Properties=species:S:1:pos:R:3:tag:I:1:flag:L:1:label:S:2:move_mask:L:3
+cu 0.0 0.0 0.0 1 T a b T T T
+O 1.0 0.0 0.0 -2 False c d F T F
+CU 0.0 1.5 0.0 3 F e f T T T
+""")
+    atoms = ase.io.read('types.xyz')
+    assert atoms.get_chemical_symbols() == ['Cu', 'O', 'Cu']
+    assert atoms.positions[2, 1] == 1.5
+    assert atoms.arrays['tag'].tolist() == [1, -2, 3]
+    assert atoms.arrays['tag'].dtype == np.dtype('i')
+    assert atoms.arrays['flag'].tolist() == [True, False, False]
+    assert atoms.arrays['label'].tolist() == [['a', 'b'], ['c', 'd'],
+                                              ['e', 'f']]
+    assert atoms.constraints[1].mask.tolist() == [True, False, True]
+
+
+def test_misaligned_columns():
+    # right number of values in total, but not on each line:
+    Path('bad.xyz').write_text("""2
+Properties=species:S:1:pos:R:3
+H 0.0 0.0 0.0 1.0
+H 1.0 0.0
+""")
+    with pytest.raises(ValueError):
+        ase.io.read('bad.xyz')
+
+
+def test_fast_parser_fallback():
+    # Extra column and 'Y' which is not a logical value:
+    Path('odd.xyz').write_text("""2
+Properties=species:S:1:pos:R:3:flag:L:1
+H 0.0 0.0 0.0 T extra
+H 0.0 0.0 0.7 T
+""")
+    atoms = ase.io.read('odd.xyz')
+    assert atoms.positions[1, 2] == 0.7
+    assert atoms.arrays['flag'].tolist() == [True, True]
+
+    Path('odd.xyz').write_text("""1
+Properties=species:S:1:pos:R:3:flag:L:1
+H 0.0 0.0 0.0 Y
+""")
+    assert ase.io.read('odd.xyz').arrays['flag'].tolist() == [False]
+
+    Path('bad.xyz').write_text("""2
+Properties=species:S:1:pos:R:3
+H 0.0 0.0 0.0
+H 0.0 0.0 x
+""")
+    with pytest.raises(ValueError):
+        ase.io.read('bad.xyz')
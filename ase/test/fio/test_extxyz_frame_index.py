@@ -0,0 +1,117 @@
+import gzip
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import ase.io
+from ase.build import bulk, molecule
+from ase.io.extxyz import (build_frame_index, frame_index_filename,
+                           read_frame_index, XYZError, _write_frame_index)
+
+
+@pytest.fixture
+def images():
+    images = []
+    for n in range(20):
+        if n % 3:
+            atoms = bulk('Cu', cubic=True)
+        else:
+            atoms = molecule('CH3CH2OH')
+        atoms.rattle(0.01, seed=n)
+        atoms.info['n'] = n
+        images.append(atoms)
+    return images
+
+
+def same(atoms1, atoms2):
+    return (atoms1.info['n'] == atoms2.info['n'] and
+            np.allclose(atoms1.positions, atoms2.positions))
+
+
+@pytest.fixture
+def filename(images):
+    ase.io.write('frames.xyz', images)
+    return 'frames.xyz'
+
+
+def test_frame_index(filename, images):
+    offsets, natoms, nvec = build_frame_index(filename)
+    assert Path(frame_index_filename(filename)).is_file()
+    assert (natoms == [len(atoms) for atoms in images]).all()
+    assert not nvec.any()
+    with open(filename, 'rb') as fd:
+        fd.seek(offsets[5])
+        assert int(fd.readline()) == len(images[5])
+
+    for index in [7, -1, -20]:
+        assert same(ase.io.read(filename, index), images[index])
+    for index in ['3:11:2', '::-3', '-4:']:
+        ref = images[ase.io.formats.string2index(index)]
+        assert all(map(same, ase.io.read(filename, index), ref))
+    assert [atoms.info['n'] for atoms in ase.io.iread(filename, '15:')] == [
+        15, 16, 17, 18, 19]
+
+
+def test_parallel(filename):
+    serial = build_frame_index(filename, save=False)
+    parallel = build_frame_index(filename, workers=2, chunk_size=1000,
+                                 save=False)
+    for a, b in zip(serial, parallel):
+        assert (a == b).all()
+    assert len(serial[0]) == 20
+
+
+def test_out_of_date(filename, images):
+    ase.io.read(filename, 0, frame_index=True)
+    assert read_frame_index(filename) is not None
+
+    ase.io.write(filename, images[:4])
+    assert read_frame_index(filename) is None
+    assert len(ase.io.read(filename, ':')) == 4
+
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert read_frame_index(filename) is None
+
+
+def test_vec_and_blank_lines():
+    Path('vec.xyz').write_text("""1
+Coordinates
+C         -7.28250        4.71303       -3.82016
+  VEC1 1.0 0.1 1.1
+    1
+
+    C         -7.28250        4.71303       -3.82016
+    VEC1 1.0 0.1 1.1
+
+""")
+    offsets, natoms, nvec = build_frame_index('vec.xyz')
+    assert list(natoms) == [1, 1]
+    assert list(nvec) == [1, 1]
+    a, b = ase.io.read('vec.xyz', ':')
+    assert a == b
+    assert (a.cell[0] == [1.0, 0.1, 1.1]).all()
+
+    Path('bad.xyz').write_text('1\n\nH 0 0 0\nH 0 0 0\n')
+    with pytest.raises(XYZError):
+        build_frame_index('bad.xyz')
+
+
+def test_compressed(images):
+    with gzip.open('frames.xyz.gz', 'wt') as fd:
+        ase.io.write(fd, images, format='extxyz')
+    assert same(ase.io.read('frames.xyz.gz', 5, frame_index=True), images[5])
+    assert not Path(frame_index_filename('frames.xyz.gz')).exists()
+
+
+def test_stale_index(filename, images):
+    # An index that matches size and modification time but not the frames:
+    offsets, natoms, nvec = build_frame_index(filename)
+    _write_frame_index(filename, os.stat(filename),
+                       offsets[::-1].copy(), natoms, nvec)
+    with pytest.raises(XYZError):
+        ase.io.read(filename, 1)
+    assert not Path(frame_index_filename(filename)).is_file()
+    assert same(ase.io.read(filename, 1), images[1])
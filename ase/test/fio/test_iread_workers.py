@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import ase.io
+from ase.build import bulk
+from ase.calculators.singlepoint import SinglePointCalculator
+
+
+@pytest.fixture
+def images():
+    images = []
+    for n in range(13):
+        atoms = bulk('Cu', cubic=True) * (1, 1, 1 + n % 2)
+        atoms.rattle(0.01, seed=n)
+        atoms.calc = SinglePointCalculator(atoms, energy=-n)
+        images.append(atoms)
+    return images
+
+
+def check(images1, images2):
+    assert len(images1) == len(images2)
+    for atoms1, atoms2 in zip(images1, images2):
+        assert atoms1.get_chemical_formula() == atoms2.get_chemical_formula()
+        assert atoms1.get_potential_energy() == atoms2.get_potential_energy()
+        assert np.allclose(atoms1.positions, atoms2.positions)
+
+
+@pytest.mark.parametrize('filename',
+                         ['x.traj', 'x.xyz', 'x.xyz.gz', 'x.db', 'x.json'])
+@pytest.mark.parametrize('index', [':', '2:11', '-5:', '::3', '::-2'])
+def test_iread_workers(filename, index, images):
+    if filename.endswith(('.db', '.json')) and index.startswith('::'):
+        pytest.skip('Databases can only read consecutive rows')
+    ase.io.write(filename, images)
+    serial = list(ase.io.iread(filename, index))
+    check(serial, list(ase.io.iread(filename, index, workers=2)))
+    check(serial, images[ase.io.formats.string2index(index)])
+
+
+def test_xdatcar_workers(images):
+    images = images[::2]
+    for atoms in images:
+        atoms.calc = None
+    ase.io.write('XDATCAR', images, format='vasp-xdatcar')
+    for index in [':', '1:5:2', '-2:', '::-1']:
+        serial = ase.io.read('XDATCAR', index, format='vasp-xdatcar')
+        parallel = list(ase.io.iread('XDATCAR', index, workers=2,
+                                     format='vasp-xdatcar'))
+        assert len(serial) == len(parallel)
+        for atoms1, atoms2 in zip(serial, parallel):
+            assert np.allclose(atoms1.positions, atoms2.positions)
+
+
+def test_iread_workers_unsupported(images):
+    ase.io.write('x.cfg', images[0])
+    with pytest.raises(ValueError):
+        next(ase.io.iread('x.cfg', workers=2))
@@ -0,0 +1,49 @@
+import pytest
+
+from ase.build import bulk, molecule
+from ase.calculators.emt import EMT
+from ase.io import Trajectory, read
+
+
+@pytest.fixture
+def images():
+    images = []
+    for n in range(6):
+        atoms = bulk('Cu', cubic=True)
+        atoms.rattle(0.1, seed=n)
+        atoms.calc = EMT()
+        atoms.get_forces()
+        images.append(atoms)
+    # New header:
+    images.append(molecule('H2O'))
+    return images
+
+
+def test_buffered(images):
+    with Trajectory('buffered.traj', 'w', buffer_size=3) as traj:
+        for atoms in images[:4]:
+            traj.write(atoms)
+        assert len(read('buffered.traj', ':')) == 3
+        traj.write(images[4])
+    assert len(read('buffered.traj', ':')) == 5
+
+    with Trajectory('buffered.traj', 'a', buffer_size=100,
+                    flush_interval=0.0) as traj:
+        traj.write(images[5])
+        assert len(read('buffered.traj', ':')) == 6
+        traj.write(images[6])
+
+    for a, b in zip(read('buffered.traj', ':'), images):
+        assert a == b
+    assert read('buffered.traj', 2).get_forces() == pytest.approx(
+        images[2].get_forces())
+
+
+def test_flush(images):
+    with Trajectory('flush.traj', 'w', buffer_size=100) as traj:
+        for atoms in images:
+            traj.write(atoms)
+        traj.flush()
+        with Trajectory('flush.traj') as reader:
+            assert len(reader) == 7
+            assert reader[-1] == images[-1]
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from ase.build import bulk, molecule
+from ase.calculators.emt import EMT
+from ase.io import Trajectory, read
+
+
+@pytest.fixture
+def images():
+    images = []
+    atoms = bulk('Cu', cubic=True) * (2, 2, 2)
+    atoms.set_momenta(np.ones((len(atoms), 3)))
+    for n in range(12):
+        atoms = atoms.copy()
+        atoms.rattle(0.01, seed=n)
+        atoms.calc = EMT()
+        atoms.get_forces()
+        images.append(atoms)
+    # New header and number of atoms:
+    images.append(molecule('H2O'))
+    return images
+
+
+@pytest.mark.parametrize('compression', ['zlib', 'lzma'])
+def test_compression(images, compression):
+    with Trajectory('c.traj', 'w', compression=compression,
+                    keyframe_interval=5) as traj:
+        for atoms in images:
+            traj.write(atoms)
+
+    with Trajectory('c.traj') as traj:
+        assert len(traj) == len(images)
+        for n in [3, 0, 12, 7, 5]:
+            atoms = traj[n]
+            assert atoms == images[n]
+            assert (atoms.get_momenta() == images[n].get_momenta()).all()
+            if n < 12:
+                assert (atoms.get_forces() == images[n].get_forces()).all()
+        assert (traj.read_array('positions', slice(0, 12)) ==
+                [atoms.positions for atoms in images[:12]]).all()
+
+        # Positions of image 6 are stored relative to those of image 5:
+        assert traj.backend[6]._data['positions'].delta is not None
+        assert traj.backend[5]._data['positions'].delta is None
+
+
+def test_single_precision(images):
+    with Trajectory('single.traj', 'w', double=False) as traj:
+        for atoms in images:
+            traj.write(atoms)
+    with Trajectory('double.traj', 'w', compression='zlib') as traj:
+        for atoms in images:
+            traj.write(atoms)
+
+    for atoms, ref in zip(read('single.traj', ':12'), images):
+        assert atoms.positions.dtype == float
+        assert atoms.positions == pytest.approx(ref.positions, abs=1e-6)
+        assert atoms.get_forces().dtype == float
+        assert atoms.get_forces() == pytest.approx(ref.get_forces(),
+                                                   abs=1e-6)
+    positions = Trajectory('single.traj').read_array('positions',
+                                                     slice(0, 12))
+    assert positions.dtype == np.float32
+
+    for atoms, ref in zip(read('double.traj', ':'), images):
+        assert (atoms.positions == ref.positions).all()
+
+
+def test_append(images):
+    with Trajectory('a.traj', 'w', compression='zlib',
+                    buffer_size=4) as traj:
+        for atoms in images[:6]:
+            traj.write(atoms)
+    with Trajectory('a.traj', 'a', compression='lzma', double=False) as traj:
+        for atoms in images[6:]:
+            traj.write(atoms)
+    for atoms, ref in zip(read('a.traj', ':'), images):
+        assert atoms.positions == pytest.approx(ref.positions, abs=1e-6)
@@ -0,0 +1,108 @@
+import io
+
+import numpy as np
+import pytest
+
+from ase.build import bulk, molecule
+from ase.calculators.emt import EMT
+from ase.io import Trajectory, write
+
+
+@pytest.fixture
+def images():
+    images = []
+    for n in range(7):
+        atoms = bulk('Cu', cubic=True) * (2, 1, 1)
+        atoms.rattle(0.1, seed=n)
+        atoms.set_momenta(np.ones((len(atoms), 3)) * n)
+        atoms.calc = EMT()
+        atoms.get_forces()
+        atoms.get_stress()
+        images.append(atoms)
+    return images
+
+
+@pytest.fixture
+def traj(images):
+    with Trajectory('md.traj', 'w') as t:
+        for atoms in images:
+            t.write(atoms)
+    with Trajectory('md.traj') as t:
+        yield t
+
+
+def test_read_array(traj, images):
+    positions = traj.read_array('positions')
+    assert positions.shape == (7, 8, 3)
+    assert (positions == [atoms.positions for atoms in images]).all()
+
+    assert (traj.read_array('momenta') ==
+            [atoms.get_momenta() for atoms in images]).all()
+    assert (traj.read_array('cell') == images[0].cell).all()
+    assert (traj.read_array('numbers') == 29).all()
+
+    energies = traj.read_array('energy')
+    assert energies.shape == (7,)
+    assert energies == pytest.approx([atoms.get_potential_energy()
+                                      for atoms in images])
+    assert traj.read_array('forces') == pytest.approx(
+        np.array([atoms.get_forces() for atoms in images]))
+    assert traj.read_array('stress') == pytest.approx(
+        np.array([atoms.get_stress() for atoms in images]))
+
+
+def test_frames(traj, images):
+    forces = traj.read_array('calculator.forces', slice(1, None, 3))
+    assert forces.shape == (2, 8, 3)
+    assert (forces[1] == traj[4].get_forces()).all()
+
+    positions = traj.read_array('positions', [-1, 0])
+    assert (positions[0] == images[-1].positions).all()
+    assert (positions[1] == images[0].positions).all()
+
+    assert len(traj.read_array('positions', slice(3, 3))) == 0
+
+
+def test_out(traj):
+    out = np.lib.format.open_memmap('positions.npy', mode='w+',
+                                    shape=(7, 8, 3))
+    assert traj.read_array('positions', out=out) is out
+    out.flush()
+    assert (np.load('positions.npy')[-1] == traj[-1].positions).all()
+
+    with pytest.raises(ValueError):
+        traj.read_array('positions', out=np.empty((7, 3, 3)))
+
+
+def test_errors(traj):
+    with pytest.raises(KeyError):
+        traj.read_array('magmoms')
+
+    with Trajectory('mixed.traj', 'w') as t:
+        t.write(molecule('H2O'))
+        t.write(molecule('CH4'))
+    with Trajectory('mixed.traj') as t:
+        with pytest.raises(ValueError):
+            t.read_array('positions')
+        assert (t.read_array('numbers', [1]) == [6, 1, 1, 1, 1]).all()
+
+
+def test_without_fileno(images):
+    buf = io.BytesIO()
+    write(buf, images, format='traj')
+    buf.seek(0)
+    with Trajectory(buf) as t:
+        assert (t.read_array('positions') ==
+                [atoms.positions for atoms in images]).all()
+
+
+def test_memmap(images):
+    with Trajectory('md.traj', 'w') as t:
+        for atoms in images:
+            t.write(atoms)
+    with Trajectory('md.traj', memmap=True) as t:
+        assert t.backend._memmap is not None
+        assert (t[3].positions == images[3].positions).all()
+        assert t[3].get_forces() == pytest.approx(images[3].get_forces())
+        assert t[-1].positions.flags.writeable
+        assert (t.read_array('positions')[2] == images[2].positions).all()
@@ -1,4 +1,6 @@
 """Test ase.io.ulm file stuff."""
+import io
+
 import pytest
 import numpy as np
 
@@ -69,3 +71,61 @@ def test_ulm_copy(ulmfile):
     with ulm.open(path) as r:
         assert 'a' not in r
         assert 'y' in r
+
+
+def test_memmap(ulmfile):
+    path = ulmfile.with_name('d.ulm')
+    with ulm.open(path, 'w') as w:
+        w.write(x=np.arange(12.0).reshape((4, 3)))
+        w.add_array('psi', (3, 2, 5), np.complex64)
+        for n in range(3):
+            w.fill(np.ones((2, 5), np.complex64) * n)
+        w.sync()
+        w.write(x=-np.arange(12.0).reshape((4, 3)))
+
+    with ulm.open(path) as r, ulm.open(path, memmap=True) as m:
+        x = m.x
+        assert isinstance(m._memmap, np.memmap)
+        assert not x.flags.writeable
+        assert np.shares_memory(x, m._memmap)
+        assert (x == r.x).all()
+        assert (m.proxy('x')[1::2] == r.x[1::2]).all()
+        assert (m.proxy('psi', 2)[:] == 2).all()
+        assert m.psi.dtype == np.complex64
+        assert (m[1].x == r[1].x).all()
+        assert np.shares_memory(m[1].x, m._memmap)
+
+        with pytest.raises(ValueError):
+            x[0, 0] = 1.0
+
+    # No fileno - fall back to normal reads:
+    with ulm.Reader(io.BytesIO(path.read_bytes()), memmap=True) as r:
+        assert r._memmap is None
+        assert r[1].x[3, 2] == -11
+
+
+def test_buffered(ulmfile):
+    path = ulmfile.with_name('e.ulm')
+    path.write_bytes(ulmfile.read_bytes())
+    with ulm.open(path, 'a', buffered=True) as w:
+        size = path.stat().st_size
+        for n in range(50):
+            w.write(n=n, x=np.arange(n))
+            w.child('c').write(y=np.ones(3) * n)
+            w.sync()
+        assert path.stat().st_size == size
+        w.flush()
+        with ulm.open(path, index=52) as r:
+            assert r.n == 49
+        w.write(s='last')
+
+    with ulm.open(path) as r:
+        assert len(r) == 54
+        assert r[0].y == 9
+        assert (r[2].z == np.ones(7)).all()
+        for n in range(50):
+            item = r[n + 3]
+            assert item.n == n
+            assert (item.x == np.arange(n)).all()
+            assert (item.c.y == n).all()
+        assert r[53].s == 'last'
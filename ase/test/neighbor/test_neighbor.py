@@ -3,7 +3,8 @@ import numpy as np
 import pytest
 from ase import Atoms
 from ase.neighborlist import (NeighborList, PrimitiveNeighborList,
-                              NewPrimitiveNeighborList)
+                              NewPrimitiveNeighborList,
+                              IncrementalPrimitiveNeighborList)
 from ase.build import bulk
 
 
@@ -103,7 +104,8 @@ def test_fcc():
     assert not np.any(nl.get_neighbors(13)[1])
 
     c = 0.0058
-    for NeighborListClass in [PrimitiveNeighborList, NewPrimitiveNeighborList]:
+    for NeighborListClass in [PrimitiveNeighborList, NewPrimitiveNeighborList,
+                              IncrementalPrimitiveNeighborList]:
         nl = NeighborListClass([c, c],
                                skin=0.0,
                                sorted=True,
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from ase.build import bulk, molecule
+from ase.neighborlist import iter_neighbor_list, neighbor_list
+
+
+@pytest.mark.parametrize('self_interaction', [False, True])
+@pytest.mark.parametrize('chunk_size', [1, 7, 1000])
+@pytest.mark.parametrize('system, cutoff', [
+    (bulk('Cu', 'fcc', a=3.6) * (4, 4, 4), 5.0),
+    (bulk('Cu', 'fcc', a=3.6), 7.0),
+    (molecule('C60'), 3.0)])
+def test_chunks_match_full_list(system, cutoff, chunk_size,
+                                self_interaction):
+    atoms = system.copy()
+    atoms.rattle(0.1, seed=42)
+    ref = neighbor_list('ijSd', atoms, cutoff,
+                        self_interaction=self_interaction)
+
+    chunks = list(iter_neighbor_list('ijSd', atoms, cutoff,
+                                     self_interaction=self_interaction,
+                                     chunk_size=chunk_size))
+    assert len(chunks) == -(-len(atoms) // chunk_size)
+    for n, (i, j, S, d) in enumerate(chunks):
+        assert ((i >= n * chunk_size) & (i < (n + 1) * chunk_size)).all()
+
+    res = [np.concatenate(arrays) for arrays in zip(*chunks)]
+    assert (np.diff(res[0]) >= 0).all()
+
+    def sort(i, j, S, d):
+        order = np.lexsort((S[:, 2], S[:, 1], S[:, 0], j, i))
+        return i[order], j[order], S[order], d[order]
+
+    for x, y in zip(sort(*ref), sort(*res)):
+        assert np.allclose(x, y)
+
+
+def test_coordination_numbers():
+    atoms = bulk('Cu', 'fcc', a=3.6) * (3, 3, 3)
+    coord = np.zeros(len(atoms), int)
+    for i in iter_neighbor_list('i', atoms, 3.0, chunk_size=5):
+        coord += np.bincount(i, minlength=len(atoms))
+    assert (coord == 12).all()
+
+
+def test_dict_cutoff_not_supported():
+    with pytest.raises(NotImplementedError):
+        next(iter_neighbor_list('ij', bulk('Cu'), {('Cu', 'Cu'): 3.0}))
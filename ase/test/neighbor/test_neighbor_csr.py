@@ -0,0 +1,61 @@
+import numpy as np
+
+from ase.build import bulk
+from ase.calculators.emt import EMT
+from ase.neighborlist import (CSRNeighborList, get_shared_neighbor_list,
+                              neighbor_list)
+
+
+def sorted_pairs(i, j, d):
+    order = np.lexsort((d, j, i))
+    return i[order], j[order], d[order]
+
+
+def test_csr_pairs_match_neighbor_list():
+    atoms = bulk('Cu', 'fcc', a=3.6) * (3, 3, 2)
+    atoms.rattle(0.05, seed=42)
+    nl = CSRNeighborList(4.0, skin=0.5)
+    assert nl.update(atoms)
+
+    i, j, D, d = nl.get_pairs(4.0)
+    ref = neighbor_list('ijd', atoms, 4.0)
+    for x, y in zip(sorted_pairs(i, j, d), sorted_pairs(*ref)):
+        assert np.allclose(x, y)
+    assert np.allclose(np.linalg.norm(D, axis=1), d)
+
+    # per-atom access gives views of the flat arrays
+    for a in range(len(atoms)):
+        indices, offsets = nl.get_neighbors(a)
+        assert np.shares_memory(indices, nl.j)
+        assert (indices == nl.j[nl.i == a]).all()
+        assert (offsets == nl.S[nl.i == a]).all()
+
+    # small displacements only update the distances
+    atoms.positions[0] += (0.1, 0, 0)
+    assert not nl.update(atoms)
+    i, j, D, d = nl.get_pairs(4.0)
+    ref = neighbor_list('ijd', atoms, 4.0)
+    for x, y in zip(sorted_pairs(i, j, d), sorted_pairs(*ref)):
+        assert np.allclose(x, y)
+
+    atoms.positions[0] += (0.2, 0, 0)
+    assert nl.update(atoms)
+    assert nl.nupdates == 2
+
+
+def test_shared_neighbor_list():
+    atoms = bulk('Cu', 'fcc', a=3.6) * (2, 2, 2)
+    nl1 = get_shared_neighbor_list(atoms, 3.0, skin=0.3)
+    nl2 = get_shared_neighbor_list(atoms, 3.0, skin=0.3)
+    assert nl1 is nl2
+    assert get_shared_neighbor_list(atoms, 4.0) is not nl1
+    assert get_shared_neighbor_list(atoms.copy(), 3.0, skin=0.3) is not nl1
+
+    # calculators working on the same atoms share the list
+    atoms.calc = EMT(vectorized=True)
+    atoms.get_potential_energy()
+    nl = get_shared_neighbor_list(atoms, atoms.calc.rc_list, skin=0.3)
+    nupdates = nl.nupdates
+    other = EMT(vectorized=True)
+    other.calculate(atoms)
+    assert nl.nupdates == nupdates
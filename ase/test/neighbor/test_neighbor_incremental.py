@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from ase.build import bulk, molecule
+from ase.neighborlist import (NeighborList, NewPrimitiveNeighborList,
+                              IncrementalPrimitiveNeighborList)
+
+
+def pairs_within(nl, atoms, cutoff):
+    """Set of (i, j, offset) pairs that are really within cutoff."""
+    pairs = set()
+    for a in range(len(atoms)):
+        indices, offsets = nl.get_neighbors(a)
+        D = (atoms.positions[indices] + offsets @ atoms.cell -
+             atoms.positions[a])
+        for b, offset, d in zip(indices, offsets, np.linalg.norm(D, axis=1)):
+            if d < cutoff:
+                pairs.add((a, b, tuple(offset)))
+    return pairs
+
+
+@pytest.mark.parametrize('bothways', [False, True])
+@pytest.mark.parametrize('atoms', [
+    bulk('Cu', 'fcc', a=3.6, cubic=True) * (3, 3, 3),
+    bulk('Cu', 'fcc', a=3.6) * (2, 2, 3),
+    molecule('C60')])
+def test_incremental_matches_rebuild(atoms, bothways):
+    rng = np.random.RandomState(42)
+    rc = 2.0
+    nl = NeighborList([rc] * len(atoms), skin=0.3, bothways=bothways,
+                      primitive=IncrementalPrimitiveNeighborList)
+
+    for step in range(30):
+        # move a random subset of the atoms
+        moving = rng.rand(len(atoms), 1) < 0.2
+        atoms.positions += rng.normal(scale=0.05,
+                                      size=(len(atoms), 3)) * moving
+        nl.update(atoms)
+
+        ref = NeighborList([rc] * len(atoms), skin=0.0, bothways=bothways,
+                           primitive=NewPrimitiveNeighborList)
+        ref.update(atoms)
+        assert (pairs_within(nl, atoms, 2 * rc) ==
+                pairs_within(ref, atoms, 2 * rc))
+
+    assert nl.nupdates == nl.nfullupdates + nl.npartialupdates
+    assert nl.nfullupdates == 1
+    assert nl.npartialupdates > 0
+
+
+def test_incremental_counters():
+    atoms = bulk('Cu', 'fcc', a=3.6, cubic=True) * (3, 3, 3)
+    nl = NeighborList([1.5] * len(atoms), skin=0.3,
+                      primitive=IncrementalPrimitiveNeighborList)
+    assert nl.update(atoms)
+    assert not nl.update(atoms)
+
+    # one atom moved beyond the skin: partial update
+    atoms.positions[0] += (0.4, 0, 0)
+    assert nl.update(atoms)
+    assert (nl.nfullupdates, nl.npartialupdates) == (1, 1)
+
+    # many atoms moved: full rebuild
+    atoms.positions += (0.4, 0, 0)
+    assert nl.update(atoms)
+    assert (nl.nfullupdates, nl.npartialupdates) == (2, 1)
+
+    # cell changed: full rebuild
+    atoms.set_cell(atoms.cell * 1.01, scale_atoms=True)
+    assert nl.update(atoms)
+    assert (nl.nfullupdates, nl.npartialupdates) == (3, 1)
+    assert nl.nupdates == 4
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from ase.build import bulk, molecule
+from ase.neighborlist import neighbor_list, primitive_neighbor_list
+
+
+def sorted_list(i, j, S, d):
+    order = np.lexsort((S[:, 2], S[:, 1], S[:, 0], j, i))
+    return i[order], j[order], S[order], d[order]
+
+
+def slab():
+    atoms = bulk('Cu', 'fcc', a=3.6, cubic=True) * (4, 4, 1)
+    atoms.pbc = (True, True, False)
+    return atoms
+
+
+@pytest.mark.parametrize('self_interaction', [False, True])
+@pytest.mark.parametrize('system, cutoff', [
+    (bulk('Cu', 'fcc', a=3.6) * (6, 6, 6), 5.0),
+    (bulk('Cu', 'fcc', a=3.6), 7.0),
+    (molecule('C60'), 3.0),
+    (slab(), 4.0)])
+def test_parallel_matches_serial(system, cutoff, self_interaction):
+    atoms = system.copy()
+    atoms.rattle(0.1, seed=42)
+    ref = neighbor_list('ijSd', atoms, cutoff,
+                        self_interaction=self_interaction)
+    par = neighbor_list('ijSd', atoms, cutoff,
+                        self_interaction=self_interaction, workers=3)
+
+    # sorted by first atom like the serial version
+    assert (np.diff(par[0]) >= 0).all()
+    for x, y in zip(sorted_list(*ref), sorted_list(*par)):
+        assert np.allclose(x, y)
+
+
+def test_parallel_per_atom_radii():
+    atoms = bulk('NaCl', 'rocksalt', a=5.64) * (3, 3, 3)
+    radii = np.where(atoms.numbers == 11, 1.5, 2.5)
+    args = (atoms.pbc, atoms.cell, atoms.positions, radii)
+    ref = primitive_neighbor_list('ijSd', *args)
+    par = primitive_neighbor_list('ijSd', *args, workers=2)
+    for x, y in zip(sorted_list(*ref), sorted_list(*par)):
+        assert np.allclose(x, y)
+
+
+def test_parallel_empty():
+    i, D = primitive_neighbor_list('iD', [True] * 3, np.eye(3) * 5,
+                                   np.zeros((0, 3)), 2.0, workers=2)
+    assert i.shape == (0,)
+    assert D.shape == (0, 3)
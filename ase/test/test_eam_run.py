@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 from ase.calculators.eam import EAM
 
@@ -14,3 +15,15 @@ def test_eam_run(pt_eam_potential_file):
 
     assert( abs(-164.277599313 - slab.get_potential_energy()) < 1E-8 )
     assert( abs(6.36379627645 - np.linalg.norm(slab.get_forces()))  < 1E-8 )
+
+
+@pytest.mark.parametrize('tabulate', [None, 10000])
+def test_eam_run_vectorized(pt_eam_potential_file, tabulate):
+    eam = EAM(potential=StringIO(pt_eam_potential_file.read_text()),
+              form='eam', elements=['Pt'], vectorized=True, tabulate=tabulate)
+    slab = fcc111('Pt', size=(4, 4, 2), vacuum=10.0)
+    slab.calc = eam
+
+    tol = 1e-8 if tabulate is None else 1e-4
+    assert abs(-164.277599313 - slab.get_potential_energy()) < tol
+    assert abs(6.36379627645 - np.linalg.norm(slab.get_forces())) < tol
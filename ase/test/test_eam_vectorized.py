@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from scipy.interpolate import InterpolatedUnivariateSpline as spline
+
+from ase.build import bulk
+from ase.calculators.eam import EAM
+
+cutoff = 5.5
+r = np.linspace(0, cutoff, 200)
+rho = np.linspace(0, 20, 200)
+
+
+def derivatives(functions):
+    return np.vectorize(lambda f: f.derivative(), otypes=[object])(functions)
+
+
+def model_potential(form):
+    """Simple two-element potential given as spline functions."""
+    envelope = (cutoff - r) ** 2
+    emb = np.array([spline(rho, -a * np.sqrt(rho)) for a in (1.0, 1.3)])
+    if form == 'fs':
+        dens = np.empty((2, 2), object)
+        for a in range(2):
+            for b in range(2):
+                dens[a, b] = spline(r, (1 + 0.2 * a + 0.1 * b) *
+                                    np.exp(-r) * envelope)
+    else:
+        dens = np.array([spline(r, (1 + 0.3 * a) * np.exp(-r) * envelope)
+                         for a in range(2)])
+    phi = np.empty((2, 2), object)
+    for a in range(2):
+        for b in range(2):
+            phi[a, b] = spline(r, (1 + 0.1 * (a + b)) *
+                               (np.exp(-2 * (r - 2.5)) -
+                                2 * np.exp(-(r - 2.5))) * envelope / 10)
+
+    kwargs = dict(elements=['Cu', 'Ag'], cutoff=cutoff, form=form,
+                  embedded_energy=emb, electron_density=dens, phi=phi,
+                  d_embedded_energy=derivatives(emb),
+                  d_electron_density=derivatives(dens),
+                  d_phi=derivatives(phi))
+
+    if form == 'adp':
+        d = np.empty((2, 2), object)
+        q = np.empty((2, 2), object)
+        for a in range(2):
+            for b in range(2):
+                d[a, b] = spline(r, 0.05 * (1 + a + b) * np.exp(-r) * envelope)
+                q[a, b] = spline(r, 0.02 * (1 + a * b) * np.exp(-r) * envelope)
+        kwargs.update(d=d, q=q, d_d=derivatives(d), d_q=derivatives(q))
+
+    return kwargs
+
+
+@pytest.fixture
+def atoms():
+    atoms = bulk('Cu', 'fcc', a=3.7) * (2, 2, 2)
+    atoms.numbers[::3] = 47
+    atoms.rattle(0.1, seed=3)
+    return atoms
+
+
+@pytest.mark.parametrize('form', ['alloy', 'fs', 'adp'])
+def test_vectorized_matches_loop(atoms, form):
+    atoms.calc = EAM(**model_potential(form))
+    energy = atoms.get_potential_energy()
+    forces = atoms.get_forces()
+
+    atoms.calc = EAM(vectorized=True, **model_potential(form))
+    assert atoms.get_potential_energy() == pytest.approx(energy, abs=1e-10)
+    np.testing.assert_allclose(atoms.get_forces(), forces, atol=1e-10)
+
+    numerical = atoms.calc.calculate_numerical_forces(atoms, d=1e-5)
+    np.testing.assert_allclose(atoms.get_forces(), numerical, atol=1e-6)
+
+    atoms.calc = EAM(vectorized=True, tabulate=5000, **model_potential(form))
+    assert atoms.get_potential_energy() == pytest.approx(energy, abs=1e-4)
+    np.testing.assert_allclose(atoms.get_forces(), forces, atol=1e-4)
+
+
+@pytest.mark.parametrize('form', ['alloy', 'fs', 'adp'])
+def test_calculate_batch(atoms, form):
+    images = [atoms, bulk('Ag', 'fcc', a=4.1) * (2, 1, 1), bulk('Cu')]
+    images[1].rattle(0.05, seed=4)
+    results = EAM(**model_potential(form)).calculate_batch(
+        images, ['energy', 'forces'])
+    for image, batch in zip(images, results):
+        calc = EAM(**model_potential(form))
+        assert batch['energy'] == pytest.approx(
+            calc.get_potential_energy(image), abs=1e-10)
+        assert batch['forces'] == pytest.approx(
+            calc.get_forces(image), abs=1e-10)
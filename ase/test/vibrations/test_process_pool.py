@@ -0,0 +1,112 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from ase import Atoms
+from ase.build import bulk
+from ase.calculators.emt import EMT
+from ase.phonons import Phonons
+from ase.utils import workdir
+from ase.vibrations import Vibrations
+
+
+def read_pickles(directory):
+    data = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), 'rb') as fd:
+            data[name] = pickle.load(fd)
+    return data
+
+
+class FailingEMT(EMT):
+    """EMT calculator that fails for stretched molecules."""
+    def calculate(self, atoms, *args, **kwargs):
+        if atoms.get_distance(0, 1) > 1.1:
+            raise RuntimeError('stretched')
+        EMT.calculate(self, atoms, *args, **kwargs)
+
+
+def n2():
+    return Atoms('N2', positions=[(0, 0, 0), (0, 0, 1.1)], calculator=EMT())
+
+
+def test_vibrations(capsys):
+    with workdir('serial', mkdir=True):
+        vib = Vibrations(n2())
+        vib.run()
+        freqs = vib.get_frequencies()
+
+    with workdir('pool', mkdir=True):
+        vib = Vibrations(n2())
+        vib.run(workers=2)
+        assert (vib.get_frequencies() == freqs).all()
+
+    out = capsys.readouterr().out
+    assert 'Calculated 13 displacements' in out
+
+    serial = read_pickles('serial')
+    pool = read_pickles('pool')
+    assert serial.keys() == pool.keys()
+    for name in serial:
+        assert (serial[name] == pool[name]).all()
+
+
+def test_vibrations_restart(capsys):
+    vib = Vibrations(n2(), indices=[0])
+    vib.run()
+    os.remove('vib.0y+.pckl')
+    vib = Vibrations(n2())
+    vib.run(workers=2)
+    out = capsys.readouterr().out
+    assert 'Calculated 7 displacements' in out
+    assert len(vib.get_frequencies()) == 6
+
+
+def test_failing_worker():
+    vib = Vibrations(n2())
+    vib.calc = FailingEMT()
+    with pytest.raises(RuntimeError):
+        vib.run(workers=2)
+    # no empty files are left behind:
+    data = read_pickles('.')
+    assert 'vib.eq.pckl' in data
+    assert 'vib.0z-.pckl' not in data
+    assert all(os.path.getsize(name) > 0 for name in data)
+
+    # a new run does the missing displacements:
+    vib = Vibrations(n2())
+    vib.run(workers=2)
+    assert len(read_pickles('.')) == 13
+    assert len(vib.get_frequencies()) == 6
+
+
+def test_phonons():
+    atoms = bulk('Al', 'fcc', a=4.05)
+    with workdir('serial', mkdir=True):
+        Phonons(atoms, EMT(), supercell=(2, 2, 2)).run()
+
+    for workers in [1, 3]:
+        with workdir('pool%d' % workers, mkdir=True):
+            ph = Phonons(atoms, EMT(), supercell=(2, 2, 2))
+            ph.run(workers=workers)
+            ph.read(acoustic=True)
+            assert np.isfinite(ph.get_force_constant()).all()
+
+    serial = read_pickles('serial')
+    pool1 = read_pickles('pool1')
+    pool3 = read_pickles('pool3')
+    assert serial.keys() == pool1.keys() == pool3.keys()
+    for name, forces in pool1.items():
+        # independent of the distribution of the displacements:
+        assert (forces == pool3[name]).all()
+        # the serial run reuses the neighbor list of the calculator:
+        assert forces == pytest.approx(serial[name], abs=1e-12)
+
+
+def test_raman_not_supported():
+    vib = Vibrations(n2())
+    vib.ram = True
+    with pytest.raises(NotImplementedError):
+        vib.run(workers=2)
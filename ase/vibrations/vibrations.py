@@ -4,18 +4,28 @@ import os
 import os.path as op
 import pickle
 import sys
+from functools import partial
 from math import sin, pi, sqrt, log
+from time import time
 
 import numpy as np
 
 import ase.units as units
 from ase.io.trajectory import Trajectory
-from ase.parallel import world, paropen
+from ase.parallel import world, paropen, process_map
 
 from ase.utils import opencew, pickleload
 from ase.calculators.singlepoint import SinglePointCalculator
 
 
+def get_forces_and_dipole(atoms, dipole=False):
+    """Worker function of Vibrations.run_process_pool()."""
+    forces = atoms.get_forces()
+    if dipole:
+        return forces, atoms.get_dipole_moment()
+    return forces, None
+
+
 class Vibrations:
     """Class for calculating vibrational modes using finite difference.
 
@@ -102,7 +112,7 @@ class Vibrations:
         self.ir = None
         self.ram = None
 
-    def run(self):
+    def run(self, workers=None):
         """Run the vibration calculations.
 
         This will calculate the forces for 6 displacements per atom +/-x,
@@ -117,6 +127,11 @@ class Vibrations:
         on the existence of files and the subsequent creation of the file in
         case it is not found.
 
+        With *workers*, the displacements are instead calculated by a pool
+        of that many local processes, each with its own copy of the
+        calculator (see :func:`ase.parallel.process_map`).  The files are
+        written in the usual order by this process.
+
         If the program you want to use does not have a calculator in ASE, use
         ``iterdisplace`` to get all displaced structures and calculate the forces
         on your own.
@@ -127,12 +142,56 @@ class Vibrations:
                 'Cannot run calculation. ' +
                 self.name + '.all.pckl must be removed or split in order ' +
                 'to have only one sort of data structure at a time.')
+
+        if workers is not None:
+            self.run_process_pool(workers)
+            return
+
         for dispName, atoms in self.iterdisplace(inplace=True):
             filename = dispName + '.pckl'
             fd = opencew(filename)
             if fd is not None:
                 self.calculate(atoms, filename, fd)
 
+    def run_process_pool(self, workers):
+        """Calculate the missing displacements in a pool of processes."""
+        if self.ram or type(self).calculate is not Vibrations.calculate:
+            raise NotImplementedError('{} can not be run in a process pool'
+                                      .format(type(self).__name__))
+
+        # Reserve the files, but only keep them open while writing:
+        tasks = []
+        for dispName, atoms in self.iterdisplace():
+            filename = dispName + '.pckl'
+            fd = opencew(filename)
+            if fd is not None:
+                fd.close()
+                tasks.append((filename, atoms))
+
+        t0 = time()
+        function = partial(get_forces_and_dipole, dipole=bool(self.ir))
+        ndone = 0
+        try:
+            outputs = process_map(function, self.calc,
+                                  [atoms for filename, atoms in tasks],
+                                  workers)
+            for (filename, atoms), (forces, dipole) in zip(tasks, outputs):
+                with open(filename, 'wb') as fd:
+                    self.write_displacement(filename, fd, forces, dipole)
+                ndone += 1
+        finally:
+            # Empty files would be taken as done by the next run:
+            if world.rank == 0:
+                for filename, atoms in tasks[ndone:]:
+                    os.remove(filename)
+
+        if tasks:
+            t = time() - t0
+            sys.stdout.write('Calculated %d displacements in %.3f s '
+                             '(%.3f per second) with %d processes\n' %
+                             (len(tasks), t, len(tasks) / t, workers))
+            sys.stdout.flush()
+
     def iterdisplace(self, inplace=False):
         """Yield name and atoms object for initial and displaced structures.
 
@@ -169,12 +228,19 @@ class Vibrations:
 
     def calculate(self, atoms, filename, fd):
         forces = self.calc.get_forces(atoms)
+        dipole = None
+        polarizability = None
         if self.ir:
             dipole = self.calc.get_dipole_moment(atoms)
         if self.ram:
-            freq, noninPol, pol = self.get_polarizability()
+            polarizability = self.get_polarizability()
+        self.write_displacement(filename, fd, forces, dipole, polarizability)
+
+    def write_displacement(self, filename, fd, forces, dipole=None,
+                           polarizability=None):
         if world.rank == 0:
             if self.ir and self.ram:
+                freq, noninPol, pol = polarizability
                 pickle.dump([forces, dipole, freq, noninPol, pol], fd, protocol=2)
                 sys.stdout.write(
                     'Writing %s, dipole moment = (%.6f %.6f %.6f)\n' %
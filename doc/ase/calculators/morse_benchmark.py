@@ -0,0 +1,43 @@
+"""Compare a pair-by-pair Morse loop with the vectorized MorsePotential."""
+from math import exp, sqrt
+from time import perf_counter
+
+import numpy as np
+
+from ase.calculators.morse import MorsePotential
+from ase.cluster import Icosahedron
+
+epsilon = 5.0
+rho0 = 2.0
+r0 = 2.5
+
+
+def pair_loop(atoms):
+    positions = atoms.get_positions()
+    energy = 0.0
+    forces = np.zeros((len(atoms), 3))
+    preF = 2 * epsilon * rho0 / r0
+    for i1, p1 in enumerate(positions):
+        for i2, p2 in enumerate(positions[:i1]):
+            diff = p2 - p1
+            r = sqrt(np.dot(diff, diff))
+            expf = exp(rho0 * (1.0 - r / r0))
+            energy += epsilon * expf * (expf - 2)
+            F = preF * expf * (expf - 1) * diff / r
+            forces[i1] -= F
+            forces[i2] += F
+    return energy, forces
+
+
+atoms = Icosahedron('Cu', 5, latticeconstant=3.6)
+atoms.rattle(0.05, seed=3)
+
+t0 = perf_counter()
+energy, forces = pair_loop(atoms)
+print('pair loop:  {:.3f} s'.format(perf_counter() - t0))
+
+atoms.calc = MorsePotential(epsilon=epsilon, r0=r0, rho0=rho0)
+t0 = perf_counter()
+assert abs(atoms.get_potential_energy() - energy) < 1e-9 * abs(energy)
+print('vectorized: {:.3f} s'.format(perf_counter() - t0))
+assert abs(atoms.get_forces() - forces).max() < 1e-10
@@ -0,0 +1,58 @@
+"""Create a database with many rows and time selections on key-value pairs.
+
+Usage: python3 db_benchmark.py [filename] [rows]
+
+The rows are small molecules with five keys: an integer "n", a float
+"x", a uniformly distributed "group" (0-99), a text "kind" with ten
+different values and a boolean "relaxed" that is True for most rows.
+"""
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from ase.build import molecule
+from ase.db import connect
+
+filename = sys.argv[1] if len(sys.argv) > 1 else 'benchmark.db'
+nrows = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+
+
+def create(filename, nrows, seed=42):
+    rng = np.random.RandomState(seed)
+    names = ['H2O', 'CH4', 'NH3', 'CO2', 'C2H6']
+    images = (molecule(names[n % len(names)]) for n in range(nrows))
+    kvps = ({'n': n,
+             'x': rng.rand(),
+             'group': rng.randint(100),
+             'kind': 'kind{}'.format(rng.randint(10)),
+             'relaxed': bool(rng.rand() < 0.9)}
+            for n in range(nrows))
+    db = connect(filename)
+    db.write_many(images, kvps, commit_size=10000)
+    return db
+
+
+if not os.path.isfile(filename):
+    t0 = perf_counter()
+    create(filename, nrows)
+    print('Wrote {} rows in {:.1f} s'.format(nrows, perf_counter() - t0))
+
+db = connect(filename)
+t0 = perf_counter()
+db.analyse()
+print('analyse: {:.2f} s'.format(perf_counter() - t0))
+
+queries = ['group=7',
+           'relaxed=True,group=7',
+           'relaxed=True,kind=kind3,group=7',
+           'relaxed=True,kind=kind3,x<0.5,group=7',
+           'relaxed=True,kind=kind3,x<0.5,group=7,n>1000',
+           'relaxed=True,x<0.01,C>0']
+
+for query in queries:
+    t0 = perf_counter()
+    n = sum(1 for row in db.select(query, columns=['energy'],
+                                   include_data=False))
+    print('{:46} {:6} rows {:8.3f} s'.format(query, n, perf_counter() - t0))
@@ -0,0 +1,56 @@
+"""Compare size and write/read speed of trajectory storage options.
+
+Usage: python3 trajectory_benchmark.py [nimages] [repeat]
+"""
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from ase import units
+from ase.build import bulk
+from ase.calculators.emt import EMT
+from ase.calculators.singlepoint import SinglePointCalculator
+from ase.io import Trajectory
+from ase.md.velocitydistribution import MaxwellBoltzmannDistribution
+from ase.md.verlet import VelocityVerlet
+
+nimages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+atoms = bulk('Cu', cubic=True) * repeat
+MaxwellBoltzmannDistribution(atoms, temperature_K=300,
+                             rng=np.random.RandomState(42))
+atoms.calc = EMT()
+dyn = VelocityVerlet(atoms, 2 * units.fs)
+images = []
+for n in range(nimages):
+    dyn.run(1)
+    image = atoms.copy()
+    image.calc = SinglePointCalculator(image, **atoms.calc.results)
+    images.append(image)
+print('{} images of {} atoms'.format(nimages, len(atoms)))
+
+reference = None
+for double in [True, False]:
+    for compression in [None, 'zlib', 'lzma']:
+        t0 = perf_counter()
+        with Trajectory('bench.traj', 'w', double=double,
+                        compression=compression) as traj:
+            for image in images:
+                traj.write(image)
+        write = perf_counter() - t0
+        size = os.path.getsize('bench.traj')
+        t0 = perf_counter()
+        with Trajectory('bench.traj') as traj:
+            for image in traj:
+                pass
+        read = perf_counter() - t0
+        reference = reference or size
+        print('{:6} {:5}: {:8.1f} kB ({:4.2f}x smaller), '
+              'write {:7.1f} images/s, read {:7.1f} images/s'
+              .format('double' if double else 'single', str(compression),
+                      size / 1e3, reference / size,
+                      nimages / write, nimages / read))
+os.remove('bench.traj')
@@ -0,0 +1,28 @@
+"""Time the parallel neighbor list search for different numbers of threads.
+
+Usage: python3 neighborlist_benchmark.py [repeat] [cutoff]
+"""
+import sys
+from time import perf_counter
+
+from ase.build import bulk
+from ase.neighborlist import neighbor_list
+
+repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+cutoff = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+
+atoms = bulk('Cu', 'fcc', a=3.6, cubic=True) * repeat
+atoms.rattle(0.05, seed=42)
+print('{} atoms, cutoff {} Å'.format(len(atoms), cutoff))
+
+t0 = perf_counter()
+i = neighbor_list('i', atoms, cutoff)
+serial = perf_counter() - t0
+print('serial:      {:8.3f} s, {} pairs'.format(serial, len(i)))
+
+for workers in [1, 2, 4, 8, 16]:
+    t0 = perf_counter()
+    neighbor_list('i', atoms, cutoff, workers=workers)
+    t = perf_counter() - t0
+    print('{:2d} workers: {:8.3f} s, speedup {:5.2f}'
+          .format(workers, t, serial / t))